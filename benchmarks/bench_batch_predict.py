@@ -0,0 +1,59 @@
+"""
+Benchmark: /predict/batch vs looping over /predict (in-process, no network).
+
+Usage:
+    python benchmarks/bench_batch_predict.py --rows 2000 --batch-size 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import src.api.app as api_module
+from src.api.model_manager import ModelBundle
+from src.api.schemas.prediction import FEATURE_COLUMNS
+from src.utils.common import load_object
+
+
+def make_records(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    base = np.array([59.0, 2.0, 32.1, 101.0, 157.0, 93.2, 38.0, 4.0, 4.85, 87.0])
+    data = base * rng.uniform(0.8, 1.2, size=(n_rows, len(FEATURE_COLUMNS)))
+    return [dict(zip(FEATURE_COLUMNS, row.tolist())) for row in data]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    # Local artifacts only (no MLflow round trip)
+    model = load_object(os.path.join("models", "model.joblib"))
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    api_module.model_manager.install(ModelBundle.build(model, scaler, "bench", "bench", "local_joblib"))
+    client = TestClient(api_module.app)
+    records = make_records(args.rows)
+
+    start = time.perf_counter()
+    for record in records:
+        client.post("/predict", json=record)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(records), args.batch_size):
+        client.post("/predict/batch", json={"records": records[i:i + args.batch_size]})
+    batch_time = time.perf_counter() - start
+
+    print(f"/predict loop : {args.rows / single_time:,.0f} rows/sec")
+    print(f"/predict/batch: {args.rows / batch_time:,.0f} rows/sec (batch size {args.batch_size})")
+    print(f"Speed-up      : {single_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: time and Python heap peak of the chunked data validation
+(src/components/data_validation.py) on synthetic CSV files of increasing size.
+
+Memory should stay flat: the exit code is 1 when the peak of the largest file is
+more than --max-growth times the peak of the smallest one.
+
+Usage:
+    python benchmarks/bench_data_validation.py
+    python benchmarks/bench_data_validation.py --sizes 100000 1000000 --chunk-size 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.components.data_validation import DataValidation
+
+COLUMNS = ["age", "sex", "bmi", "bp", "s1", "s2", "s3", "s4", "s5", "s6", "target"]
+
+
+def synthetic_data(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # Values inside the schema ranges (configs/schema.yaml -> RANGES)
+    data = rng.uniform([20, 1, 20, 70, 120, 60, 30, 2, 3.5, 60, 25],
+                       [79, 2, 42, 130, 300, 240, 99, 9, 6.1, 124, 346], size=(n_rows, len(COLUMNS)))
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def validate(workdir: Path, n_rows: int, chunk_size: int):
+    """
+    Validates an n_rows CSV. Returns (seconds, Python heap peak in MB).
+    """
+    synthetic_data(n_rows).to_csv(workdir / "raw.csv", index=False)
+    config = {
+        "data": {"raw_path": str(workdir / "raw.csv")},
+        "storage": {"format": "csv"},
+        "validation": {"chunk_size": chunk_size, "report_path": str(workdir / "report.json"),
+                       "status_path": str(workdir / "status.txt")},
+    }
+    config_path = workdir / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    validation = DataValidation(config_path, "configs/schema.yaml")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if not validation.validate_all_columns():
+        raise RuntimeError(f"Validation failed on {n_rows} synthetic rows")
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 200_000])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--max-growth", type=float, default=1.5,
+                        help="Allowed peak ratio between the largest and the smallest file")
+    args = parser.parse_args()
+
+    peaks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>12}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}")
+        for n_rows in sorted(args.sizes):
+            seconds, peaks[n_rows] = validate(Path(tmp), n_rows, args.chunk_size)
+            print(f"{n_rows:>12,}{seconds:>10.2f}{n_rows / seconds:>14,.0f}{peaks[n_rows]:>10.1f}")
+
+    smallest, largest = min(peaks), max(peaks)
+    growth = peaks[largest] / peaks[smallest]
+    if growth > args.max_growth:
+        print(f"❌ Memory gate failed: peak grew {growth:.2f}x from {smallest:,} to {largest:,} rows")
+        sys.exit(1)
+    print(f"✅ Memory gate passed (peak grew {growth:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
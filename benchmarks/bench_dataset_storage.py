@@ -0,0 +1,53 @@
+"""
+Benchmark: load time and file size of the dataset storage formats vs CSV.
+
+Usage:
+    python benchmarks/bench_dataset_storage.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+
+from src.utils.common import DATASET_FORMATS, dataset_files, load_dataset, load_dataset_array, save_dataset
+
+COLUMNS = ["age", "sex", "bmi", "bp", "s1", "s2", "s3", "s4", "s5", "s6", "target"]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(rng.normal(size=(args.rows, len(COLUMNS))), columns=COLUMNS)
+
+    print(f"{'format':<10}{'size MB':>10}{'write s':>10}{'load df s':>12}{'load array s':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_path = os.path.join(tmp_dir, "diabetes.csv")
+        for fmt in DATASET_FORMATS:
+            write_time, path = timed(lambda: save_dataset(df, base_path, fmt), repeat=1)
+            size_mb = sum(os.path.getsize(p) for p in dataset_files(base_path, fmt)) / 1e6
+            df_time, _ = timed(lambda: load_dataset(path, fmt))
+            # Training access pattern: features as one float matrix
+            array_time, _ = timed(lambda: np.asarray(load_dataset_array(path, fmt, columns=COLUMNS[:-1])[0]))
+            print(f"{fmt:<10}{size_mb:>10.1f}{write_time:>10.2f}{df_time:>12.3f}{array_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
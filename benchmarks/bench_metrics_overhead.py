@@ -0,0 +1,67 @@
+"""
+Benchmark: instrumentation overhead of one /predict request, i.e. everything the
+metrics middleware and the stage timers record (src/api/metrics.py).
+
+The timing gate lives here rather than in the unit tests (wall-clock gates flake on
+loaded CI runners): the exit code is 1 when the best per-request overhead is above
+--max-us microseconds.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py
+    python benchmarks/bench_metrics_overhead.py --requests 200000 --max-us 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from src.api.metrics import MetricsRegistry
+
+
+def record_requests(n: int) -> float:
+    """
+    Records n requests on a fresh registry. Returns the overhead per request in us.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["endpoint", "status"])
+    latency = registry.histogram("latency_seconds", "Latency", ["endpoint"])
+    in_flight = registry.gauge("in_flight", "In flight", ["endpoint"])
+    stage = registry.histogram("stage_seconds", "Stage", ["endpoint", "stage"])
+    parse, inference = stage.labels("/predict", "parse"), stage.labels("/predict", "inference")
+
+    # Everything one /predict request records (middleware + stage timers)
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        gauge = in_flight.labels("/predict")
+        gauge.inc()
+        parse.observe(time.perf_counter() - t0)
+        inference.observe(time.perf_counter() - t0)
+        gauge.dec()
+        latency.labels("/predict").observe(time.perf_counter() - t0)
+        requests.labels("/predict", "200").inc()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-us", type=float, default=10.0, help="Overhead gate per request (microseconds)")
+    args = parser.parse_args()
+
+    timings = [record_requests(args.requests) for _ in range(args.repeat)]
+    best = min(timings)
+    print(f"Instrumentation overhead: {best:.2f} us/request "
+          f"(best of {args.repeat} x {args.requests:,} requests, worst {max(timings):.2f} us)")
+
+    if best > args.max_us:
+        print(f"❌ Overhead gate failed: {best:.2f} us > {args.max_us} us")
+        sys.exit(1)
+    print("✅ Overhead gate passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: concurrent /predict traffic with and without micro-batching (in-process ASGI).
+
+Usage:
+    python benchmarks/bench_micro_batching.py --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import httpx
+import numpy as np
+
+import src.api.app as api_module
+from src.api.batcher import MicroBatcher
+from src.api.model_manager import ModelBundle
+from src.utils.common import load_object
+
+SAMPLE = {"age": 59.0, "sex": 2.0, "bmi": 32.1, "bp": 101.0, "s1": 157.0,
+          "s2": 93.2, "s3": 38.0, "s4": 4.0, "s5": 4.85, "s6": 87.0}
+
+
+async def run_load(n_requests, concurrency):
+    transport = httpx.ASGITransport(app=api_module.app)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one_call():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/predict", json=SAMPLE)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_call() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return n_requests / elapsed, np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+
+async def main_async(args):
+    model = load_object(os.path.join("models", "model.joblib"))
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    bundle = ModelBundle.build(model, scaler, "bench", "bench", "local_joblib")
+    api_module.model_manager.install(bundle)
+
+    api_module.batcher = None
+    rps, p50, p99 = await run_load(args.requests, args.concurrency)
+    print(f"Direct      : {rps:8,.0f} req/s | p50 {p50:6.2f} ms | p99 {p99:6.2f} ms")
+
+    api_module.batcher = MicroBatcher(
+        predict_fn=bundle.engine.predict_matrix,
+        max_wait_ms=args.max_wait_ms,
+        max_batch_size=args.max_batch_size
+    )
+    api_module.batcher.start()
+    rps, p50, p99 = await run_load(args.requests, args.concurrency)
+    stats = api_module.batcher.stats()
+    await api_module.batcher.stop()
+    print(f"Micro-batch : {rps:8,.0f} req/s | p50 {p50:6.2f} ms | p99 {p99:6.2f} ms "
+          f"(avg batch {stats['avg_batch_size']:.1f} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
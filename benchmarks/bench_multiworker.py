@@ -0,0 +1,192 @@
+"""
+Benchmark: multi-worker serving (python -m src.api.serve) at 1, 2, 4 and 8 workers.
+
+Reports per-worker RSS / PSS (proportional set size: shared pages are split between the
+processes mapping them) and aggregate /predict throughput, with the shared memory-mapped
+engine and with a private model copy per worker (--no-shared-engine).
+
+Runs in a scratch directory (copy of configs/ and models/, registry disabled).
+--model big-forest swaps in a large RandomForest (max_depth=None) so the memory difference
+is visible; the default uses the trained champion from models/.
+
+Usage:
+    python benchmarks/bench_multiworker.py --model big-forest --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+import httpx
+import numpy as np
+import yaml
+
+from src.api.schemas.prediction import FEATURE_COLUMNS
+from src.utils.common import load_object, save_object
+
+REPO = Path(os.getcwd())
+BASE = np.array([59.0, 2.0, 32.1, 101.0, 157.0, 93.2, 38.0, 4.0, 4.85, 87.0])
+
+
+def make_workdir(root: Path, model: str) -> Path:
+    shutil.copytree(REPO / "configs", root / "configs")
+    shutil.copytree(REPO / "models", root / "models", ignore=shutil.ignore_patterns("snapshot", "engine"))
+    os.symlink(REPO / "src", root / "src")
+
+    config_path = root / "configs" / "config.yaml"
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    config["mlflow"]["tracking_uri"] = "http://127.0.0.1:9"
+    config["api"]["reload"]["enabled"] = False
+    config["api"]["prediction_cache"]["enabled"] = False
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+
+    if model == "big-forest":
+        from sklearn.ensemble import RandomForestRegressor
+        scaler = load_object(root / "models" / "scaler.joblib")
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(50000, len(FEATURE_COLUMNS)))
+        y = X @ rng.normal(size=len(FEATURE_COLUMNS)) + rng.normal(size=len(X))
+        forest = RandomForestRegressor(n_estimators=100, max_depth=None, n_jobs=-1, random_state=0).fit(X, y)
+        save_object(root / "models" / "model.joblib", forest)
+        print(f"Big forest: {os.path.getsize(root / 'models' / 'model.joblib') / 1e6:.0f} MB on disk "
+              f"(scaler reused: {type(scaler).__name__})")
+    return root
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def worker_pids(parent_pid: int) -> list:
+    """
+    uvicorn worker processes (children of the serve process, minus multiprocessing helpers).
+    With a single worker uvicorn serves from the parent process itself.
+    """
+    pids = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            ppid = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+            cmdline = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid and "resource_tracker" not in cmdline:
+            pids.append(int(entry.name))
+    return sorted(pids) or [parent_pid]
+
+
+def memory_mb(pid: int) -> dict:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":")
+        fields[key] = int(value.split()[0]) / 1024
+    return {"rss": fields.get("Rss", 0.0), "pss": fields.get("Pss", 0.0)}
+
+
+def wait_ready(port: int, n_workers: int, parent_pid: int, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if (httpx.get(f"http://127.0.0.1:{port}/health/ready", timeout=1).status_code == 200
+                    and len(worker_pids(parent_pid)) >= n_workers):
+                # Let the remaining workers finish their startup
+                time.sleep(2)
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError("API did not become ready")
+
+
+async def load_client(port, duration, concurrency, seed):
+    rng = np.random.default_rng(seed)
+    payloads = [dict(zip(FEATURE_COLUMNS, (BASE * rng.uniform(0.8, 1.2, len(BASE))).tolist())) for _ in range(512)]
+    done = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+        async def user(i):
+            nonlocal done
+            while time.perf_counter() < deadline:
+                response = await client.post("/predict", json=payloads[(done + i) % len(payloads)])
+                response.raise_for_status()
+                done += 1
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return done
+
+
+def run_client(args):
+    return asyncio.run(load_client(*args))
+
+
+def measure(workdir, n_workers, shared, duration, clients, concurrency):
+    port = free_port()
+    command = [sys.executable, "-m", "src.api.serve", "--workers", str(n_workers), "--port", str(port)]
+    if not shared:
+        command.append("--no-shared-engine")
+    env = dict(os.environ, PYTHONPATH=str(workdir))
+    log_path = workdir / f"serve_{n_workers}_{'shared' if shared else 'private'}.log"
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_ready(port, n_workers if n_workers > 1 else 0, server.pid)
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.map(run_client, [(port, duration, concurrency, seed) for seed in range(clients)])
+        memory = [memory_mb(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        "workers": n_workers,
+        "shared_engine": shared,
+        "requests_per_s": sum(counts) / duration,
+        "rss_mb_per_worker": float(np.mean([m["rss"] for m in memory])),
+        "pss_mb_per_worker": float(np.mean([m["pss"] for m in memory])),
+        "pss_mb_total": float(np.sum([m["pss"] for m in memory])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--model", choices=["champion", "big-forest"], default="champion")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent requests per client")
+    parser.add_argument("--output", default=None, help="Optional JSON results file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        workdir = make_workdir(Path(root), args.model)
+        print(f"{'workers':>8}{'engine':>9}{'req/s':>10}{'RSS MB/worker':>15}{'PSS MB/worker':>15}{'PSS MB total':>14}")
+        for n_workers in args.workers:
+            for shared in (True, False):
+                result = measure(workdir, n_workers, shared, args.duration, args.clients, args.concurrency)
+                results.append(result)
+                print(f"{n_workers:>8}{'shared' if shared else 'private':>9}{result['requests_per_s']:>10,.0f}"
+                      f"{result['rss_mb_per_worker']:>15.1f}{result['pss_mb_per_worker']:>15.1f}{result['pss_mb_total']:>14.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"model": args.model, "cpus": os.cpu_count(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: single-row latency and batch throughput of the joblib and ONNX inference
+backends, for each model family (scaler + model, like the served bundle).
+
+The timing gate lives here rather than in the unit tests (wall-clock comparisons flake
+on loaded CI runners): the exit code is 1 when the ONNX single-row latency is not at
+least --min-speedup times lower than joblib's for a family listed in --gate.
+
+Usage:
+    python benchmarks/bench_onnx_backend.py
+    python benchmarks/bench_onnx_backend.py --gate xgboost --min-speedup 2
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_diabetes
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import ElasticNet
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+
+from src.api.inference import InferenceEngine
+from src.api.onnx_engine import OnnxInferenceEngine
+from src.api.schemas.prediction import DiabetesInput, FEATURE_COLUMNS
+
+MODELS = {
+    "elasticnet": lambda: ElasticNet(alpha=0.1, l1_ratio=0.5),
+    "random_forest": lambda: RandomForestRegressor(n_estimators=100, max_depth=10, random_state=0),
+    "xgboost": lambda: XGBRegressor(n_estimators=100, max_depth=5, learning_rate=0.1),
+}
+
+
+def best_of(fn, repeat=5, number=200):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    parser.add_argument("--gate", nargs="*", default=["xgboost"], choices=list(MODELS),
+                        help="Families whose ONNX single-row latency must beat joblib")
+    parser.add_argument("--min-speedup", type=float, default=1.0)
+    args = parser.parse_args()
+
+    diabetes = load_diabetes(scaled=False)
+    X = pd.DataFrame(diabetes.data, columns=FEATURE_COLUMNS)
+    scaler = StandardScaler().fit(X)
+    record = DiabetesInput(**dict(zip(FEATURE_COLUMNS, X.iloc[0].tolist())))
+    batch = X.sample(args.batch_rows, replace=True, random_state=0).to_numpy()
+
+    print(f"{'model':>14}{'backend':>9}{'single row us':>15}{'batch rows/s':>14}")
+    failed = []
+    for name in args.models:
+        model = MODELS[name]().fit(scaler.transform(X), diabetes.target)
+        engines = {"joblib": InferenceEngine(model, scaler), "onnx": OnnxInferenceEngine.from_model(model, scaler)}
+        single = {}
+        for backend, engine in engines.items():
+            single[backend] = best_of(lambda: engine.predict_one(record))
+            rows_per_second = len(batch) / best_of(lambda: engine.predict_matrix(batch), number=5)
+            print(f"{name:>14}{backend:>9}{single[backend] * 1e6:>15.1f}{rows_per_second:>14,.0f}")
+        speedup = single["joblib"] / single["onnx"]
+        print(f"{name:>14}{'speedup':>9}{speedup:>15.2f}x")
+        if name in args.gate and speedup < args.min_speedup:
+            failed.append(f"{name} ({speedup:.2f}x < {args.min_speedup}x)")
+
+    if failed:
+        print(f"❌ ONNX single-row latency gate failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ Latency gate passed")
+
+
+if __name__ == "__main__":
+    main()
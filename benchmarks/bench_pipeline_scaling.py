@@ -0,0 +1,168 @@
+"""
+Benchmark: the main.py pipeline on synthetic datasets of increasing size
+(data.source: synthetic), with wall time and peak memory per stage.
+
+Each size runs `main.py --force all` in its own scratch directory (data, models,
+MLflow file store and manifest stay out of the repository), with configs/config.yaml
+plus these overrides:
+- data.source: synthetic, data.synthetic.rows: <size>
+- storage.format / transformation.mode from the command line
+- MLflow: local file store, no offline sync
+- training: one candidate per family and 2 CV folds, unless --full-search
+
+The scaling exponent of a stage between two sizes is log(t2 / t1) / log(n2 / n1):
+~1 is linear, above 1 the stage is degrading, and a failed run (or --timeout)
+marks where it stops scaling.
+
+Usage:
+    python benchmarks/bench_pipeline_scaling.py --sizes 10000 100000 1000000 --format parquet
+    python benchmarks/bench_pipeline_scaling.py --sizes 1000000 10000000 --mode streaming --format npy
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+import yaml
+
+from src.utils.common import read_yaml
+
+REPO = Path(os.getcwd())
+
+
+def bench_config(config: dict, rows: int, args, workdir: Path) -> dict:
+    config = copy.deepcopy(config)
+    config['data']['source'] = "synthetic"
+    config['data'].setdefault('synthetic', {})['rows'] = rows
+    config['storage'] = {"format": args.format}
+    config['transformation']['mode'] = args.mode
+    config['mlflow']['tracking_uri'] = (workdir / "mlruns").as_uri()
+    config['tracking'] = dict(config.get('tracking', {}), offline_dir=str(workdir / "mlruns_offline"),
+                              sync_on_start=False)
+    if not args.full_search:
+        search = config['training']['search']
+        search.update(strategy="grid", cv_folds=2, cache_dir=str(workdir / "search_cache"))
+        for family in config['training']['models'].values():
+            family['params'] = {name: values[:1] for name, values in family['params'].items()}
+    return config
+
+
+def run_pipeline(rows: int, args, base_config: dict) -> dict:
+    """
+    Runs main.py for one size. Returns {"stages": [...], "seconds", "peak_rss_mb", "status"}.
+    """
+    with tempfile.TemporaryDirectory(prefix=f"scaling_{rows}_", dir=args.scratch_dir) as tmp:
+        workdir = Path(tmp)
+        (workdir / "configs").mkdir()
+        # Same relative layout as the repository (stage fingerprints hash src/)
+        os.symlink(REPO / "src", workdir / "src")
+        with open(workdir / "configs" / "config.yaml", "w") as f:
+            yaml.safe_dump(bench_config(base_config, rows, args, workdir), f)
+        with open(REPO / "configs" / "schema.yaml") as src, open(workdir / "configs" / "schema.yaml", "w") as dst:
+            dst.write(src.read())
+
+        report_path = workdir / "stages.json"
+        log_path = workdir / "pipeline.log"
+        start = time.perf_counter()
+        with open(log_path, "w") as log:
+            process = subprocess.Popen(
+                [sys.executable, str(REPO / "main.py"), "--force", "all", "--report-json", str(report_path)],
+                cwd=workdir, stdout=log, stderr=subprocess.STDOUT
+            )
+            status = "ok"
+            deadline = start + args.timeout if args.timeout else None
+            while True:
+                pid, exit_status, usage = os.wait4(process.pid, os.WNOHANG)
+                if pid:
+                    break
+                if deadline and time.perf_counter() > deadline:
+                    process.kill()
+                    _, exit_status, usage = os.wait4(process.pid, 0)
+                    status = "timeout"
+                    break
+                time.sleep(0.2)
+            process.returncode = exit_status
+        seconds = time.perf_counter() - start
+
+        if status == "ok" and exit_status != 0:
+            status = f"failed (exit {os.waitstatus_to_exitcode(exit_status)})"
+        stages = []
+        if report_path.exists():
+            with open(report_path) as f:
+                stages = json.load(f)
+        if status != "ok":
+            print(f"   last log lines ({rows:,} rows):")
+            for line in log_path.read_text(errors="replace").splitlines()[-5:]:
+                print(f"     {line}")
+        return {"rows": rows, "status": status, "seconds": seconds,
+                "peak_rss_mb": usage.ru_maxrss / 1024, "stages": stages}
+
+
+def print_report(results: list):
+    stage_names = []
+    for result in results:
+        for stage in result["stages"]:
+            if stage["stage"] not in stage_names:
+                stage_names.append(stage["stage"])
+
+    print(f"\n{'rows':>12}{'stage':>16}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}{'workers MB':>12}{'exponent':>10}")
+    previous = {}
+    for result in results:
+        by_name = {stage["stage"]: stage for stage in result["stages"]}
+        for name in stage_names:
+            stage = by_name.get(name)
+            if stage is None:
+                print(f"{result['rows']:>12,}{name:>16}{'not reached':>24}")
+                continue
+            exponent = ""
+            if name in previous and previous[name][1] > 0:
+                rows_before, seconds_before = previous[name]
+                exponent = f"{math.log(stage['seconds'] / seconds_before) / math.log(result['rows'] / rows_before):.2f}"
+            previous[name] = (result["rows"], stage["seconds"])
+            workers = f"{stage['workers_peak_rss_mb']:.0f}" if stage.get("workers_peak_rss_mb") else "-"
+            print(f"{result['rows']:>12,}{name:>16}{stage['seconds']:>10.2f}{result['rows'] / stage['seconds']:>14,.0f}"
+                  f"{stage['peak_rss_mb']:>10.0f}{workers:>12}{exponent:>10}")
+        print(f"{result['rows']:>12,}{'pipeline':>16}{result['seconds']:>10.2f}{'':>14}"
+              f"{result['peak_rss_mb']:>10.0f}{'':>12}{result['status']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--format", default="parquet", choices=["csv", "parquet", "feather", "npy"])
+    parser.add_argument("--mode", default="in_memory", choices=["in_memory", "streaming"])
+    parser.add_argument("--full-search", action="store_true", help="Keep the configured hyperparameter search")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds per size (0 = no limit)")
+    parser.add_argument("--scratch-dir", default=None, help="Where the per-size datasets are written")
+    parser.add_argument("--output", default="benchmarks/results/pipeline_scaling.json")
+    args = parser.parse_args()
+
+    base_config = read_yaml(REPO / "configs" / "config.yaml")
+    results = []
+    for rows in sorted(args.sizes):
+        print(f"▶️  {rows:,} rows ({args.format}, {args.mode})...")
+        result = run_pipeline(rows, args, base_config)
+        results.append(result)
+        print(f"   {result['status']} in {result['seconds']:.1f}s, peak RSS {result['peak_rss_mb']:.0f} MB")
+        if result["status"] != "ok":
+            print("   Stopping: larger sizes would fail the same way")
+            break
+
+    print_report(results)
+    os.makedirs(Path(args.output).parent, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"format": args.format, "mode": args.mode, "full_search": args.full_search,
+                   "results": results}, f, indent=2)
+    print(f"\n📄 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: /predict latency with the prediction cache at different hit rates (in-process).
+
+Usage:
+    python benchmarks/bench_prediction_cache.py --requests 3000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import src.api.app as api_module
+from src.api.cache import PredictionCache
+from src.api.model_manager import ModelBundle
+from src.api.schemas.prediction import FEATURE_COLUMNS
+from src.utils.common import load_object
+
+BASE = np.array([59.0, 2.0, 32.1, 101.0, 157.0, 93.2, 38.0, 4.0, 4.85, 87.0])
+
+
+def make_workload(n_requests, hit_rate, seed=42):
+    """Payloads where roughly `hit_rate` of the requests repeat an earlier patient."""
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(n_requests):
+        if payloads and rng.random() < hit_rate:
+            payloads.append(payloads[rng.integers(len(payloads))])
+        else:
+            row = BASE * rng.uniform(0.8, 1.2, size=len(FEATURE_COLUMNS))
+            payloads.append(dict(zip(FEATURE_COLUMNS, row.tolist())))
+    return payloads
+
+
+def run(client, payloads):
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        client.post("/predict", json=payload)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    model = load_object(os.path.join("models", "model.joblib"))
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    api_module.model_manager.install(ModelBundle.build(model, scaler, "bench", "bench", "local_joblib"))
+    client = TestClient(api_module.app)
+
+    print(f"{'hit rate':<10}{'cache':<7}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'measured hits':>15}")
+    for hit_rate in (0.0, 0.5, 0.8, 0.95):
+        payloads = make_workload(args.requests, hit_rate)
+        for enabled in (False, True):
+            api_module.prediction_cache = PredictionCache(max_size=10000) if enabled else None
+            latencies = run(client, payloads)
+            measured = api_module.prediction_cache.stats()["hit_rate"] if enabled else 0.0
+            print(f"{hit_rate:<10.0%}{'on' if enabled else 'off':<7}{latencies.mean():>10.0f}"
+                  f"{np.percentile(latencies, 50):>10.0f}{np.percentile(latencies, 99):>10.0f}{measured:>15.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: API cold start (import + startup until /health/ready is 200) in blocking vs
+background startup mode, with the MLflow registry down and up.
+
+Every measurement runs in a fresh interpreter, so import costs are included.
+"Registry up" uses a throw-away file-store registry with a Production model;
+"registry down" points at a closed local port.
+
+Usage:
+    python benchmarks/bench_startup.py --repeats 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+DOWN_URI = "http://127.0.0.1:9"
+
+
+def child(mode, tracking_uri, snapshot_dir):
+    """Runs inside the fresh interpreter and prints one JSON line."""
+    start = time.perf_counter()
+    import src.api.app as api_module
+    from fastapi.testclient import TestClient
+    imported = time.perf_counter()
+    mlflow_at_import = "mlflow" in sys.modules
+
+    api_module.STARTUP_MODE = mode
+    api_module.model_manager.tracking_uri = tracking_uri
+    api_module.model_manager.snapshot_dir = api_module.Path(snapshot_dir)
+
+    with TestClient(api_module.app) as client:
+        ready = client.get("/health/ready")
+        ready_at = time.perf_counter()
+        # Time until the registry lookup has finished (background mode keeps serving meanwhile)
+        while client.get("/health/ready").json()["registry"] == "pending":
+            time.sleep(0.005)
+        settled_at = time.perf_counter()
+        final = client.get("/health/ready").json()
+
+    print(json.dumps({
+        "import_s": imported - start,
+        "ready_s": ready_at - start,
+        "ready_status": ready.status_code,
+        "first_source": ready.json()["model_source"],
+        "settled_s": settled_at - start,
+        "final_source": final["model_source"],
+        "registry": final["registry"],
+        "mlflow_at_import": mlflow_at_import,
+    }))
+
+
+def make_registry(root):
+    """Registers models/model.joblib as the Production model of a local file-store registry."""
+    import mlflow
+    import mlflow.sklearn
+    from mlflow.tracking import MlflowClient
+    from src.utils.common import load_object, read_yaml
+
+    model_name = read_yaml("configs/config.yaml")["mlflow"]["model_name"]
+    uri = f"file://{root}/mlruns"
+    mlflow.set_tracking_uri(uri)
+    with mlflow.start_run():
+        mlflow.sklearn.log_model(load_object("models/model.joblib"), "model", registered_model_name=model_name)
+    MlflowClient().transition_model_version_stage(model_name, "1", "Production")
+    return uri
+
+
+def measure(mode, uri, snapshot_dir):
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, uri, snapshot_dir],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "URI", "SNAPSHOT_DIR"))
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        up_uri = make_registry(root)
+        warm_snapshot = os.path.join(root, "snapshot")
+
+        # Populate the warm snapshot once (background start against a live registry writes it)
+        measure("background", up_uri, warm_snapshot)
+
+        # snapshot_dir None = a fresh empty directory for every run (cold start)
+        scenarios = [
+            ("blocking", "down", DOWN_URI, None),
+            ("background", "down", DOWN_URI, None),
+            ("blocking", "up", up_uri, None),
+            ("background", "up", up_uri, None),
+            ("background", "up+snapshot", up_uri, warm_snapshot),
+        ]
+
+        print(f"{'mode':<12}{'registry':<13}{'import s':>10}{'ready s':>10}{'settled s':>11}  {'first model':<16}{'final model':<16}")
+        for mode, label, uri, snapshot_dir in scenarios:
+            runs = [measure(mode, uri, snapshot_dir or tempfile.mkdtemp(dir=root)) for _ in range(args.repeats)]
+            best = min(runs, key=lambda r: r["ready_s"])
+            print(f"{mode:<12}{label:<13}{best['import_s']:>10.2f}{best['ready_s']:>10.2f}{best['settled_s']:>11.2f}  "
+                  f"{best['first_source']:<16}{best['final_source']:<16}")
+
+
+if __name__ == "__main__":
+    main()
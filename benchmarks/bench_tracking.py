@@ -0,0 +1,104 @@
+"""
+Benchmark: time the training thread spends in MLflow logging, synchronous (one
+request per call, as ModelTrainer used to log) vs. the buffered ExperimentTracker,
+at several simulated tracking-server round-trip latencies.
+
+The "server" is a throw-away file store whose calls sleep for the given latency.
+The logged content mirrors one training run: 3 tuned families (their best params,
+5 metrics and the model) plus the champion run. The tracker additionally logs every
+candidate and CV fold (45 candidates x 5 folds).
+
+Usage:
+    python benchmarks/bench_tracking.py --latency-ms 0 50 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import mlflow
+import mlflow.sklearn
+from mlflow.store.tracking.file_store import FileStore
+from sklearn.linear_model import ElasticNet
+
+from src.components.tracking import ExperimentTracker
+
+FAMILIES = ["ElasticNet", "RandomForest", "XGBoost"]
+CANDIDATES, FOLDS = 15, 5
+DELAYED = ["create_run", "log_batch", "log_param", "log_metric", "get_experiment_by_name",
+           "update_run_info", "set_tag", "get_run"]
+
+
+def add_latency(seconds):
+    for name in DELAYED:
+        original = getattr(FileStore, f"_original_{name}", None) or getattr(FileStore, name)
+        setattr(FileStore, f"_original_{name}", original)
+
+        def delayed(self, *args, _original=original, **kwargs):
+            time.sleep(seconds)
+            return _original(self, *args, **kwargs)
+        setattr(FileStore, name, delayed)
+
+
+def synchronous(tracking_uri, model):
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment("bench_sync")
+    start = time.perf_counter()
+    for family in FAMILIES:
+        with mlflow.start_run(run_name=f"Tuning_{family}"):
+            mlflow.log_params({"alpha": 0.1, "l1_ratio": 0.5})
+            for metric in ("rmse", "r2", "cv_r2", "search_wall_time", "cache_hit_rate"):
+                mlflow.log_metric(metric, 0.5)
+            mlflow.sklearn.log_model(model, family)
+    with mlflow.start_run(run_name="Best_Model_Production"):
+        mlflow.log_param("best_model", "ElasticNet")
+        mlflow.log_metric("r2", 0.5)
+        mlflow.sklearn.log_model(model, "model")
+    return time.perf_counter() - start, 0.0
+
+
+def buffered(tracking_uri, model):
+    config = {"mlflow": {"tracking_uri": tracking_uri, "experiment_name": "bench_buffered"},
+              "tracking": {"offline_dir": os.path.join(tempfile.mkdtemp(), "offline"), "sync_on_start": False}}
+    tracker = ExperimentTracker(config).__enter__()
+    start = time.perf_counter()
+    for family in FAMILIES:
+        with tracker.start_run(f"Tuning_{family}") as run:
+            run.log_params({"alpha": 0.1, "l1_ratio": 0.5})
+            run.log_metrics({metric: 0.5 for metric in ("rmse", "r2", "cv_r2", "search_wall_time", "cache_hit_rate")})
+            for step in range(CANDIDATES):
+                run.log_metrics({"cv_mean_r2": 0.5, **{f"cv_fold{k}_r2": 0.5 for k in range(FOLDS)}}, step=step)
+            run.log_model(model, family)
+    with tracker.start_run("Best_Model_Production") as run:
+        run.log_param("best_model", "ElasticNet")
+        run.log_metric("r2", 0.5)
+        run.log_model(model, "model")
+    training_thread = time.perf_counter() - start
+    drain_start = time.perf_counter()
+    tracker.close()
+    return training_thread, time.perf_counter() - drain_start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0, 50, 200])
+    args = parser.parse_args()
+
+    X = np.random.default_rng(0).normal(size=(200, 10))
+    model = ElasticNet().fit(X, X.sum(axis=1))
+
+    print(f"{'latency ms':>11}{'mode':>10}{'training thread s':>19}{'drain s':>9}")
+    for latency_ms in args.latency_ms:
+        add_latency(latency_ms / 1000)
+        for mode, fn in (("sync", synchronous), ("buffered", buffered)):
+            with tempfile.TemporaryDirectory() as root:
+                blocked, drain = fn(f"file://{root}/mlruns", model)
+            print(f"{latency_ms:>11.0f}{mode:>10}{blocked:>19.3f}{drain:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: model families tuned one after another (HyperparameterSearch.search per family)
+vs. concurrently with early abort (search_families), on the training search of
+configs/config.yaml (training.search, training.models, training.scheduler).
+
+Every run starts with an empty fold score cache. The data is the raw diabetes dataset,
+optionally repeated (--scale) with small noise to make fits heavier.
+
+Usage:
+    python benchmarks/bench_training_scheduler.py --scale 10 --n-jobs 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+from sklearn.datasets import load_diabetes
+from sklearn.preprocessing import StandardScaler
+
+from src.components.hyperparameter_search import HyperparameterSearch, get_estimator
+from src.utils.common import read_yaml
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the dataset this many times")
+    parser.add_argument("--n-jobs", type=int, default=None, help="Pool size (default: training.search.n_jobs)")
+    args = parser.parse_args()
+
+    config = read_yaml(os.path.join("configs", "config.yaml"))
+    training_config = config['training']
+    scheduler_config = training_config.get('scheduler', {})
+    diabetes = load_diabetes(scaled=False)
+    rng = np.random.default_rng(0)
+    X = np.tile(diabetes.data, (args.scale, 1)) * rng.normal(1, 0.01, (len(diabetes.data) * args.scale, 10))
+    X = StandardScaler().fit_transform(X)
+    y = np.tile(diabetes.target, args.scale)
+    families = {name: (get_estimator(name), info['params']) for name, info in training_config['models'].items()}
+    print(f"{len(X)} rows, families: {', '.join(families)}")
+
+    timings = {}
+    for mode in ("sequential", "concurrent"):
+        search_config = dict(training_config['search'], cache_dir=tempfile.mkdtemp())
+        if args.n_jobs:
+            search_config['n_jobs'] = args.n_jobs
+        start = time.perf_counter()
+        with HyperparameterSearch(search_config, X, y) as search:
+            if mode == "sequential":
+                results = {name: search.search(name, estimator, space) for name, (estimator, space) in families.items()}
+            else:
+                results = search.search_families(
+                    families,
+                    min_folds=scheduler_config.get('min_folds', 2),
+                    abort_margin=scheduler_config.get('abort_margin', 0.05),
+                    time_budget=scheduler_config.get('family_time_budget_seconds')
+                )
+        timings[mode] = time.perf_counter() - start
+        best = max(results, key=lambda name: results[name]['best_score'] if results[name]['best_score'] is not None else -np.inf)
+        print(f"{mode}: {timings[mode]:.2f}s, best CV R2 {results[best]['best_score']:.4f} ({best})")
+
+    print(f"Speedup: {timings['sequential'] / timings['concurrent']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
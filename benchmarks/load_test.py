@@ -0,0 +1,309 @@
+"""
+Load test: throughput and tail latency of the prediction service for each champion model.
+
+For every model family (ElasticNet, RandomForest, XGBoost) the champion is selected with the
+training search (training.search + training.models in configs/config.yaml, cached scores make
+reruns fast) and served either:
+- in-process: src.api.app driven through its ASGI app (no network, no server process), or
+- uvicorn: a local server (python -m src.api.serve, --workers N) in a scratch directory.
+
+Closed loop: `--concurrency` virtual users send requests back to back for `--duration`
+seconds (after `--warmup`). `--mix` sets the share of /predict vs /predict/batch calls and
+`--repeat-rate` how often a user resends an earlier patient (prediction cache hits).
+
+Results (throughput, p50/p95/p99/p999 latency per endpoint) go to a JSON file. With
+`--baseline`, the run fails (exit code 1) when throughput drops more than
+`--max-regression` percent against the stored baseline.
+
+Usage:
+    python benchmarks/load_test.py --duration 10 --concurrency 32
+    python benchmarks/load_test.py --target uvicorn --workers 2 --models XGBoost
+    python benchmarks/load_test.py --save-baseline benchmarks/results/baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/results/baseline.json --max-regression 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+import httpx
+import numpy as np
+import yaml
+
+from src.api.schemas.prediction import FEATURE_COLUMNS
+from src.utils.common import load_dataset, load_object, read_yaml, save_object
+
+BASE = np.array([59.0, 2.0, 32.1, 101.0, 157.0, 93.2, 38.0, 4.0, 4.85, 87.0])
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99, "p999": 99.9}
+
+
+# --- Champions ---
+def select_champions(families, config, scaler):
+    """
+    Best estimator of each family, found with the same search as the training pipeline
+    (on the raw dataset scaled with models/scaler.joblib).
+    """
+    from src.components.hyperparameter_search import HyperparameterSearch, get_estimator
+
+    storage_format = config.get('storage', {}).get('format', 'csv')
+    data = load_dataset(config['data']['raw_path'], storage_format)
+    X = np.ascontiguousarray(scaler.transform(data[FEATURE_COLUMNS]))
+    y = np.ascontiguousarray(data['target'].to_numpy(dtype=np.float64))
+
+    champions = {}
+    with HyperparameterSearch(config['training']['search'], X, y) as search:
+        for family in families:
+            param_space = config['training']['models'][family].get('params', {})
+            result = search.search(family, get_estimator(family), param_space)
+            champions[family] = (result['best_estimator'], result['best_params'], result['best_score'])
+    return champions
+
+
+# --- Workload ---
+class Workload:
+    """
+    Random patients around a typical record; a share of requests repeats earlier ones.
+    """
+
+    def __init__(self, mix_batch: float, batch_size: int, repeat_rate: float, seed: int):
+        self.rng = np.random.default_rng(seed)
+        self.mix_batch = mix_batch
+        self.batch_size = batch_size
+        self.repeat_rate = repeat_rate
+        self.seen = []
+
+    def patient(self) -> dict:
+        if self.seen and self.rng.random() < self.repeat_rate:
+            return self.seen[self.rng.integers(len(self.seen))]
+        record = dict(zip(FEATURE_COLUMNS, (BASE * self.rng.uniform(0.8, 1.2, len(BASE))).tolist()))
+        if len(self.seen) < 10000:
+            self.seen.append(record)
+        return record
+
+    def next_request(self):
+        if self.rng.random() < self.mix_batch:
+            return "/predict/batch", {"records": [self.patient() for _ in range(self.batch_size)]}
+        return "/predict", self.patient()
+
+
+async def run_load(client, duration, warmup, concurrency, workload_args):
+    """
+    Closed-loop load. Returns {endpoint: [latency seconds]}, errors and measured wall time.
+    """
+    latencies = {"/predict": [], "/predict/batch": []}
+    errors = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    async def user(seed):
+        nonlocal errors
+        workload = Workload(*workload_args, seed=seed)
+        while True:
+            path, payload = workload.next_request()
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                return
+            try:
+                response = await client.post(path, json=payload)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if sent >= measure_from:
+                if ok:
+                    latencies[path].append(time.perf_counter() - sent)
+                else:
+                    errors += 1
+
+    await asyncio.gather(*(user(seed) for seed in range(concurrency)))
+    return latencies, errors, time.perf_counter() - measure_from
+
+
+def summarize(latencies, errors, elapsed, batch_size) -> dict:
+    summary = {"errors": errors, "duration_s": elapsed, "endpoints": {}}
+    total = 0
+    rows = 0
+    for path, values in latencies.items():
+        if not values:
+            continue
+        values_ms = np.asarray(values) * 1000
+        summary["endpoints"][path] = {
+            "requests": len(values),
+            "requests_per_s": len(values) / elapsed,
+            "mean_ms": float(values_ms.mean()),
+            **{f"{name}_ms": float(np.percentile(values_ms, q)) for name, q in PERCENTILES.items()},
+            "max_ms": float(values_ms.max()),
+        }
+        total += len(values)
+        rows += len(values) * (batch_size if path == "/predict/batch" else 1)
+    summary["requests_per_s"] = total / elapsed
+    summary["rows_per_s"] = rows / elapsed
+    return summary
+
+
+# --- Targets ---
+async def run_inprocess(model, scaler, args, workload_args):
+    import src.api.app as api_module
+    from src.api.model_manager import ModelBundle
+
+    api_module.model_manager.install(ModelBundle.build(model, scaler, "loadtest", "loadtest", "local_joblib"))
+    transport = httpx.ASGITransport(app=api_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        return await run_load(client, args.duration, args.warmup, args.concurrency, workload_args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_workdir(root: Path, model, args) -> Path:
+    """
+    Scratch copy of configs/ and models/ with the champion as models/model.joblib.
+    """
+    shutil.copytree("configs", root / "configs")
+    shutil.copytree("models", root / "models", ignore=shutil.ignore_patterns("snapshot", "engine"))
+    os.symlink(Path("src").resolve(), root / "src")
+    save_object(root / "models" / "model.joblib", model)
+
+    config_path = root / "configs" / "config.yaml"
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    # Local model only: no registry lookups or reloads during the measurement
+    config["mlflow"]["tracking_uri"] = "http://127.0.0.1:9"
+    config["api"]["reload"]["enabled"] = False
+    config["api"]["prediction_cache"]["enabled"] = not args.no_cache
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+    return root
+
+
+async def run_uvicorn(model, args, workload_args):
+    with tempfile.TemporaryDirectory() as root:
+        workdir = make_workdir(Path(root), model, args)
+        port = free_port()
+        command = [sys.executable, "-m", "src.api.serve", "--workers", str(args.workers), "--port", str(port)]
+        with open(workdir / "server.log", "w") as log:
+            server = subprocess.Popen(command, cwd=workdir, env=dict(os.environ, PYTHONPATH=str(workdir)),
+                                      stdout=log, stderr=subprocess.STDOUT)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30, limits=limits) as client:
+                deadline = time.time() + 120
+                while True:
+                    try:
+                        if (await client.get("/health/ready")).status_code == 200:
+                            break
+                    except httpx.HTTPError:
+                        pass
+                    if time.time() > deadline or server.poll() is not None:
+                        raise RuntimeError(f"Server did not start, see {workdir / 'server.log'}")
+                    await asyncio.sleep(0.2)
+                return await run_load(client, args.duration, args.warmup, args.concurrency, workload_args)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+# --- Regression gate ---
+def check_regression(results: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Returns one message per model whose throughput dropped more than max_regression percent.
+    """
+    failures = []
+    for family, result in results.items():
+        reference = baseline.get("results", {}).get(family)
+        if reference is None:
+            continue
+        drop = 100 * (1 - result["requests_per_s"] / reference["requests_per_s"])
+        if drop > max_regression:
+            failures.append(f"{family}: {result['requests_per_s']:,.0f} req/s is {drop:.1f}% below "
+                            f"the baseline ({reference['requests_per_s']:,.0f} req/s, limit {max_regression}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the prediction API")
+    parser.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn target: worker processes")
+    parser.add_argument("--models", nargs="+", default=["ElasticNet", "RandomForest", "XGBoost"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per model")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=float, default=0.1, help="Share of /predict/batch requests")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat-rate", type=float, default=0.0, help="Share of repeated patients")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the prediction cache")
+    parser.add_argument("--output", default="benchmarks/results/load_test.json")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON for the regression gate")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Allowed throughput drop in percent")
+    parser.add_argument("--save-baseline", default=None, help="Also store these results as the baseline")
+    args = parser.parse_args()
+
+    config = read_yaml(Path("configs/config.yaml"))
+    print(f"🏆 Selecting champions ({', '.join(args.models)})...")
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    champions = select_champions(args.models, config, scaler)
+    workload_args = (args.mix, args.batch_size, args.repeat_rate)
+
+    if args.target == "inprocess":
+        import src.api.app as api_module
+        if args.no_cache:
+            api_module.prediction_cache = None
+
+    results = {}
+    for family, (model, params, cv_score) in champions.items():
+        if args.target == "inprocess":
+            latencies, errors, elapsed = asyncio.run(run_inprocess(model, scaler, args, workload_args))
+        else:
+            latencies, errors, elapsed = asyncio.run(run_uvicorn(model, args, workload_args))
+        results[family] = {"params": params, "cv_r2": cv_score,
+                           **summarize(latencies, errors, elapsed, args.batch_size)}
+
+    print(f"\n{'model':<14}{'endpoint':<16}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'p999 ms':>9}")
+    for family, result in results.items():
+        for path, stats in result["endpoints"].items():
+            print(f"{family:<14}{path:<16}{stats['requests_per_s']:>9,.0f}{stats['p50_ms']:>9.2f}"
+                  f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['p999_ms']:>9.2f}")
+        print(f"{family:<14}{'total':<16}{result['requests_per_s']:>9,.0f}  ({result['rows_per_s']:,.0f} rows/s, "
+              f"{result['errors']} errors)")
+
+    report = {
+        "settings": {key: value for key, value in vars(args).items() if key not in ("baseline", "save_baseline")},
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        compared = ("target", "workers", "concurrency", "mix", "batch_size", "repeat_rate", "no_cache")
+        changed = [key for key in compared if baseline.get("settings", {}).get(key) != report["settings"][key]]
+        if changed:
+            print(f"⚠️ Baseline was recorded with different settings ({', '.join(changed)}): comparison is not like for like")
+        failures = check_regression(results, baseline, args.max_regression)
+        if failures:
+            for failure in failures:
+                print(f"❌ Throughput regression: {failure}")
+            sys.exit(1)
+        print(f"✅ No throughput regression above {args.max_regression}%")
+
+
+if __name__ == "__main__":
+    main()
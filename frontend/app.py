@@ -1,7 +1,13 @@
 import streamlit as st
 import requests
-import json
+import pandas as pd
+import io
 import os
+import time
+
+from batch_client import (
+    api_base_url, make_session, fetch_input_fields, validate_patients, score_patients
+)
 
 # Page Config
 st.set_page_config(
@@ -30,60 +36,170 @@ with st.sidebar:
     api_url = st.text_input("API URL", default_url)
     st.info("Ensure the API container is running.")
 
-# User Input Form
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Physiological Data")
-    # Age: Generally an integer
-    age = st.number_input("Age (Years)", value=59.0, step=1.0, format="%.0f", help="Patient's age in years")
-    # Sex: 1 or 2
-    sex = st.number_input("Sex", value=2.0, step=1.0, format="%.0f", help="1: Male, 2: Female")
-    # BMI: Can be a decimal
-    bmi = st.number_input("BMI", value=32.1, step=0.1, format="%.1f", help="Body Mass Index")
-    # Blood Pressure: Generally close to an integer
-    bp = st.number_input("Blood Pressure (BP)", value=101.0, step=1.0, format="%.1f", help="Average Blood Pressure (mm Hg)")
-
-with col2:
-    st.subheader("Blood Serum Data")
-    # s1 - s6 values for realistic ranges
-    s1 = st.number_input("s1 (tc) - Total Cholesterol", value=157.0, step=1.0, format="%.1f")
-    s2 = st.number_input("s2 (ldl) - Low-Density Lipoproteins", value=93.2, step=0.1, format="%.1f")
-    s3 = st.number_input("s3 (hdl) - High-Density Lipoproteins", value=38.0, step=1.0, format="%.1f")
-    s4 = st.number_input("s4 (tch) - Total / HDL Ratio", value=4.0, step=0.1, format="%.1f")
-    # s5 logarithmic, can be small (4.0 - 6.0 is normal)
-    s5 = st.number_input("s5 (ltg) - Log Serum Triglycerides", value=4.85, step=0.01, format="%.2f")
-    s6 = st.number_input("s6 (glu) - Glucose", value=87.0, step=1.0, format="%.1f")
-
-# Prediction Button
-if st.button("🔍 Predict Progression", type="primary", use_container_width=True):
-    input_data = {
-        "age": age, "sex": sex, "bmi": bmi, "bp": bp,
-        "s1": s1, "s2": s2, "s3": s3, "s4": s4, "s5": s5, "s6": s6
-    }
+    # Bulk upload: rows per /predict/batch call, calls in flight, per-call timeout
+    with st.expander("Bulk scoring"):
+        chunk_size = st.number_input("Patients per request", min_value=10, max_value=10000,
+                                     value=int(os.getenv("BATCH_CHUNK_SIZE", 200)), step=50)
+        max_concurrency = st.slider("Parallel requests", min_value=1, max_value=16,
+                                    value=int(os.getenv("BATCH_CONCURRENCY", 4)))
+        timeout_seconds = st.number_input("Request timeout (s)", min_value=1.0,
+                                          value=float(os.getenv("API_TIMEOUT_SECONDS", 30)), step=5.0)
+
+base_url = api_base_url(api_url)
+# (connect, read) timeouts: a slow or unreachable API never hangs the UI
+timeout = (3.05, timeout_seconds)
+
+
+@st.cache_resource
+def get_session(max_connections: int) -> requests.Session:
+    # One keep-alive connection pool per server process, shared by every rerun & user
+    return make_session(max_connections=max_connections, retries=3)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_input_fields(url: str) -> list:
+    return fetch_input_fields(get_session(max_concurrency), url)
+
+
+@st.cache_data(show_spinner=False, max_entries=10)
+def read_patients(file_bytes: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(file_bytes))
+
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=20)
+def score_upload(file_bytes: bytes, batch_url: str, fields: tuple, chunk: int, concurrency: int,
+                 read_timeout: float, _on_progress=None):
+    """
+    Predictions of an uploaded file. Re-submitting the same file to the same API within
+    10 minutes returns the cached result (no request sent).
+    """
+    features, _ = validate_patients(read_patients(file_bytes), list(fields))
+    return score_patients(
+        get_session(concurrency), batch_url, features,
+        chunk_size=chunk, max_concurrency=concurrency,
+        timeout=(3.05, read_timeout), on_progress=_on_progress
+    )
+
+
+def risk_level(prediction: float) -> str:
+    if prediction < 100:
+        return "Low Risk Progression"
+    if prediction < 200:
+        return "Moderate Progression"
+    return "High Progression Risk"
+
+single_tab, upload_tab = st.tabs(["🧍 Single Patient", "📄 Upload CSV"])
+
+with single_tab:
+    # User Input Form
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Physiological Data")
+        # Age: Generally an integer
+        age = st.number_input("Age (Years)", value=59.0, step=1.0, format="%.0f", help="Patient's age in years")
+        # Sex: 1 or 2
+        sex = st.number_input("Sex", value=2.0, step=1.0, format="%.0f", help="1: Male, 2: Female")
+        # BMI: Can be a decimal
+        bmi = st.number_input("BMI", value=32.1, step=0.1, format="%.1f", help="Body Mass Index")
+        # Blood Pressure: Generally close to an integer
+        bp = st.number_input("Blood Pressure (BP)", value=101.0, step=1.0, format="%.1f", help="Average Blood Pressure (mm Hg)")
+
+    with col2:
+        st.subheader("Blood Serum Data")
+        # s1 - s6 values for realistic ranges
+        s1 = st.number_input("s1 (tc) - Total Cholesterol", value=157.0, step=1.0, format="%.1f")
+        s2 = st.number_input("s2 (ldl) - Low-Density Lipoproteins", value=93.2, step=0.1, format="%.1f")
+        s3 = st.number_input("s3 (hdl) - High-Density Lipoproteins", value=38.0, step=1.0, format="%.1f")
+        s4 = st.number_input("s4 (tch) - Total / HDL Ratio", value=4.0, step=0.1, format="%.1f")
+        # s5 logarithmic, can be small (4.0 - 6.0 is normal)
+        s5 = st.number_input("s5 (ltg) - Log Serum Triglycerides", value=4.85, step=0.01, format="%.2f")
+        s6 = st.number_input("s6 (glu) - Glucose", value=87.0, step=1.0, format="%.1f")
+
+    # Prediction Button
+    if st.button("🔍 Predict Progression", type="primary", use_container_width=True):
+        input_data = {
+            "age": age, "sex": sex, "bmi": bmi, "bp": bp,
+            "s1": s1, "s2": s2, "s3": s3, "s4": s4, "s5": s5, "s6": s6
+        }
     
-    with st.spinner("Consulting the AI Model..."):
-        try:
-            response = requests.post(api_url, json=input_data)
+        with st.spinner("Consulting the AI Model..."):
+            try:
+                response = get_session(max_concurrency).post(api_url, json=input_data, timeout=timeout)
             
-            if response.status_code == 200:
-                result = response.json()
-                prediction = result['prediction']
+                if response.status_code == 200:
+                    result = response.json()
+                    prediction = result['prediction']
                 
-                st.success("Prediction Complete!")
-                st.metric(label="Predicted Disease Progression", value=f"{prediction:.2f}")
+                    st.success("Prediction Complete!")
+                    st.metric(label="Predicted Disease Progression", value=f"{prediction:.2f}")
                 
-                # Simple risk assessment
-                if prediction < 100:
-                    st.info("Low Risk Progression")
-                elif prediction < 200:
-                    st.warning("Moderate Progression")
+                    # Simple risk assessment
+                    level = risk_level(prediction)
+                    if prediction < 100:
+                        st.info(level)
+                    elif prediction < 200:
+                        st.warning(level)
+                    else:
+                        st.error(level)
                 else:
-                    st.error("High Progression Risk")
-            else:
-                st.error(f"API Error: {response.status_code}")
-                st.write(response.text)
+                    st.error(f"API Error: {response.status_code}")
+                    st.write(response.text)
                 
+            except Exception as e:
+                st.error(f"Connection Error: {e}")
+                st.warning("Make sure the API is running and accessible.")
+
+with upload_tab:
+    st.markdown("Upload a CSV with one row per patient and the columns of the form above "
+                "(extra columns such as a patient id are kept in the results).")
+    uploaded = st.file_uploader("Patients CSV", type=["csv"])
+
+    if uploaded is not None:
+        file_bytes = uploaded.getvalue()
+        try:
+            patients = read_patients(file_bytes)
         except Exception as e:
-            st.error(f"Connection Error: {e}")
-            st.warning("Make sure the API is running and accessible.")
\ No newline at end of file
+            st.error(f"Could not read the file: {e}")
+            st.stop()
+
+        fields = get_input_fields(base_url)
+        _, errors = validate_patients(patients, fields)
+        if errors:
+            for error in errors:
+                st.error(error)
+            st.stop()
+
+        st.caption(f"{len(patients):,} patients, columns OK")
+        st.dataframe(patients.head(), use_container_width=True)
+
+        if st.button(f"🔍 Predict {len(patients):,} Patients", type="primary", use_container_width=True):
+            progress = st.progress(0.0, text="Scoring...")
+            table = st.empty()
+
+            def on_progress(done, total, predictions):
+                progress.progress(done / total, text=f"Scored {done:,} / {total:,} patients")
+                table.dataframe(patients.assign(prediction=predictions), use_container_width=True)
+
+            start = time.perf_counter()
+            try:
+                predictions = score_upload(
+                    file_bytes, f"{base_url}/predict/batch", tuple(fields),
+                    int(chunk_size), int(max_concurrency), float(timeout_seconds), _on_progress=on_progress
+                )
+            except requests.HTTPError as e:
+                st.error(f"API Error: {e.response.status_code}")
+                st.write(e.response.text)
+                st.stop()
+            except Exception as e:
+                st.error(f"Connection Error: {e}")
+                st.warning("Make sure the API is running and accessible.")
+                st.stop()
+            elapsed = time.perf_counter() - start
+
+            progress.progress(1.0, text=f"Scored {len(patients):,} patients in {elapsed:.2f}s "
+                                        f"({elapsed / len(patients) * 1000:.1f} ms per patient)")
+            results = patients.assign(prediction=predictions, risk=[risk_level(p) for p in predictions])
+            table.dataframe(results, use_container_width=True)
+            st.download_button("⬇️ Download predictions", results.to_csv(index=False),
+                               file_name="predictions.csv", mime="text/csv")
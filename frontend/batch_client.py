@@ -0,0 +1,124 @@
+"""
+HTTP client of the Streamlit upload mode: validates an uploaded patient table and
+scores it through POST /predict/batch in chunks, over one pooled keep-alive session.
+
+Only depends on requests / pandas (the frontend image does not ship the API code):
+the expected input fields are read from the API's OpenAPI schema (DiabetesInput).
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# DiabetesInput fields in training order, used when the API schema cannot be fetched
+DEFAULT_FIELDS = ["age", "sex", "bmi", "bp", "s1", "s2", "s3", "s4", "s5", "s6"]
+
+
+def api_base_url(predict_url: str) -> str:
+    """
+    http://host:8000/predict -> http://host:8000 (the sidebar holds the /predict URL).
+    """
+    url = predict_url.rstrip("/")
+    return url[: -len("/predict")] if url.endswith("/predict") else url
+
+
+def make_session(max_connections=4, retries=3, backoff_factor=0.3) -> requests.Session:
+    """
+    Keep-alive session with up to max_connections pooled connections to the API.
+    Connection errors and 502/503/504 are retried with exponential backoff; POSTs
+    are retried too because predictions have no side effects.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_input_fields(session: requests.Session, base_url: str, timeout=5) -> list:
+    """
+    DiabetesInput fields (in declaration order) from the API's /openapi.json.
+    Falls back to DEFAULT_FIELDS when the API is unreachable.
+    """
+    try:
+        response = session.get(f"{base_url}/openapi.json", timeout=timeout)
+        response.raise_for_status()
+        schema = response.json()["components"]["schemas"]["DiabetesInput"]
+        return list(schema["properties"])
+    except (requests.RequestException, KeyError, ValueError):
+        return list(DEFAULT_FIELDS)
+
+
+def validate_patients(df: pd.DataFrame, fields: list):
+    """
+    Checks an uploaded table against the input fields.
+    Returns (feature matrix as a DataFrame in field order, list of error messages).
+    Extra columns (e.g. a patient id) are allowed and ignored.
+    """
+    errors = []
+    missing = [field for field in fields if field not in df.columns]
+    if missing:
+        errors.append(f"Missing columns: {', '.join(missing)}")
+        return None, errors
+    if df.empty:
+        return None, ["The file has no rows"]
+
+    features = df[fields].apply(pd.to_numeric, errors="coerce")
+    invalid = features.isna() & df[fields].notna()
+    empty = df[fields].isna()
+    for column in fields:
+        if invalid[column].any():
+            rows = (np.flatnonzero(invalid[column]) + 1)[:5].tolist()
+            errors.append(f"Column '{column}' has non-numeric values (rows {rows})")
+        if empty[column].any():
+            rows = (np.flatnonzero(empty[column]) + 1)[:5].tolist()
+            errors.append(f"Column '{column}' has empty values (rows {rows})")
+    return (None if errors else features.astype(np.float64)), errors
+
+
+def score_patients(session: requests.Session, batch_url: str, features: pd.DataFrame,
+                   chunk_size=200, max_concurrency=4, timeout=(3.05, 30), on_progress=None) -> np.ndarray:
+    """
+    Scores every row with POST /predict/batch (columnar payload), chunk_size rows per
+    call and at most max_concurrency calls in flight. Predictions keep the row order.
+
+    on_progress(done_rows, total_rows, predictions): called after each completed chunk,
+    with the predictions so far (NaN for rows still in flight).
+    Raises requests.HTTPError (after the session's retries) when a chunk fails.
+    """
+    total = len(features)
+    predictions = np.full(total, np.nan)
+    starts = range(0, total, chunk_size)
+
+    def post_chunk(start):
+        chunk = features.iloc[start:start + chunk_size]
+        payload = {"columns": {column: chunk[column].tolist() for column in chunk.columns}}
+        response = session.post(batch_url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return start, response.json()["predictions"]
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = [pool.submit(post_chunk, start) for start in starts]
+        try:
+            for future in as_completed(futures):
+                start, values = future.result()
+                predictions[start:start + len(values)] = values
+                done += len(values)
+                if on_progress is not None:
+                    on_progress(done, total, predictions)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+    return predictions
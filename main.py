@@ -1,5 +1,7 @@
 import sys
 import os
+import json
+import argparse
 from pathlib import Path
 
 
@@ -10,31 +12,137 @@ from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
+from src.components.model_export import ModelExporter
+from src.components.tracking import ExperimentTracker
+from src.pipeline.stage_runner import Stage, StageRunner
+from src.utils.common import read_yaml, dataset_files
+from src.utils.profiling import Profiler
+
+STAGES = ["ingestion", "validation", "transformation", "training", "export"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Diabetes MLOps training pipeline")
+    parser.add_argument(
+        "--force", action="append", default=[], choices=STAGES + ["all"],
+        help="Re-run a stage even if its inputs are unchanged (can be repeated, or 'all')"
+    )
+    parser.add_argument("--config", default="configs/config.yaml", help="Pipeline config file")
+    parser.add_argument("--report-json", default=None,
+                        help="Write per-stage wall time & peak memory to this JSON file")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile every stage (CPU, memory, I/O) and log the reports to MLflow")
+    return parser.parse_args()
 
 def main():
-    config_path = Path("configs/config.yaml")
+    args = parse_args()
+    config_path = Path(args.config)
     schema_path = Path("configs/schema.yaml")
+    config = read_yaml(config_path)
+
+    # Dataset files depend on the storage format (configs/config.yaml -> storage.format)
+    storage_format = config.get('storage', {}).get('format', 'csv')
+    raw_files = dataset_files(config['data']['raw_path'], storage_format)
+    train_files = dataset_files(os.path.join("data/processed", "train.csv"), storage_format)
+    test_files = dataset_files(os.path.join("data/processed", "test.csv"), storage_format)
+    scaler_path = os.path.join(config['artifacts']['model_dir'], "scaler.joblib")
+    model_path = os.path.join("models", "model.joblib")
+    reference_path = config.get('monitoring', {}).get('reference_path', os.path.join("models", "drift_reference.json"))
+    onnx_path = config.get('export', {}).get('onnx_path', os.path.join("models", "model.onnx"))
+
+    # Opt-in: profiling.enabled in the config or --profile
+    profiler = Profiler.from_config(config, enabled=True if args.profile else None)
+    runner = StageRunner(config['pipeline']['manifest_path'], force=args.force, profiler=profiler)
 
     print("--- 1. DATA INGESTION ---")
     ingestion = DataIngestion(config_path)
-    ingestion.initiate_data_ingestion()
+    runner.run_stage(Stage(
+        "ingestion", ingestion.initiate_data_ingestion,
+        config={"data": config['data'], "storage": storage_format},
+        code=["src/components/data_ingestion.py", "src/utils/synthetic_data.py"],
+        outputs=raw_files
+    ))
 
     print("--- 2. DATA VALIDATION ---")
     validation = DataValidation(config_path, schema_path)
-    if not validation.validate_all_columns():
+
+    def validate():
+        if not validation.validate_all_columns():
+            raise ValueError("Data validation failed!")
+
+    try:
+        runner.run_stage(Stage(
+            "validation", validate,
+            config={"validation": config['validation']},
+            inputs=raw_files + [schema_path],
+            code=["src/components/data_validation.py"],
+            outputs=[config['validation']['report_path']]
+        ))
+    except ValueError:
         print("❌ Data validation failed!")
         return
 
     print("--- 3. DATA TRANSFORMATION ---")
     transformation = DataTransformation(config_path)
-    X_train, X_test, y_train, y_test = transformation.initiate_data_transformation()
+    # Streaming mode: chunked scaler fit + .npy shards for out-of-core training
+    streaming = config['transformation']['mode'] == "streaming"
+    if streaming:
+        transform = transformation.initiate_streaming_transformation
+        processed_files = [os.path.join(config['transformation']['shard_dir'], "index.json")]
+    else:
+        transform = transformation.initiate_data_transformation
+        processed_files = train_files + test_files
+
+    splits = runner.run_stage(Stage(
+        "transformation", transform,
+        config={"data": config['data'], "artifacts": config['artifacts'], "storage": storage_format,
+                "transformation": config['transformation']},
+        inputs=raw_files,
+        code=["src/components/data_transformation.py"],
+        outputs=[scaler_path] + processed_files
+    ))
 
     print("--- 4. MODEL TRAINING ---")
-    trainer = ModelTrainer(config_path)
-    # Passing the data returned from Transformation to Trainer:
-    trainer.initiate_model_trainer(X_train, X_test, y_train, y_test)
-    
+    trainer = ModelTrainer(config_path, profiler=profiler)
+
+    def train():
+        if streaming:
+            train_shards, test_shards = splits if splits is not None else transformation.load_shard_index()
+            trainer.initiate_incremental_trainer(train_shards, test_shards)
+            return
+        # Transformation skipped -> reuse the splits it saved last time
+        X_train, X_test, y_train, y_test = splits if splits is not None else transformation.load_transformed_data()
+        # Passing the data returned from Transformation to Trainer:
+        trainer.initiate_model_trainer(X_train, X_test, y_train, y_test)
+
+    runner.run_stage(Stage(
+        "training", train,
+        config={"training": config['training'], "mlflow": config['mlflow'], "streaming": streaming,
+                "monitoring": config.get('monitoring', {})},
+        # The scaler too: the drift reference (and the served pair) depend on it
+        inputs=processed_files + [scaler_path],
+        code=["src/components/model_trainer.py", "src/components/hyperparameter_search.py", "src/utils/drift.py"],
+        outputs=[model_path, reference_path]
+    ))
+
+    print("--- 5. MODEL EXPORT (ONNX) ---")
+    exporter = ModelExporter(config_path)
+    runner.run_stage(Stage(
+        "export", exporter.initiate_model_export,
+        config={"export": config.get('export', {})},
+        inputs=[model_path, scaler_path],
+        code=["src/components/model_export.py", "src/utils/onnx_export.py"],
+        outputs=[onnx_path]
+    ))
+
+    runner.report()
+    if args.report_json:
+        with open(args.report_json, "w") as f:
+            json.dump(runner.summary(), f, indent=2)
+    if profiler.reports:
+        with ExperimentTracker(config) as tracker, tracker.start_run("Pipeline_Profile") as run:
+            profiler.log_reports(run)
+        print(f"🔬 Profiles saved in {profiler.run_dir}")
     print("✅ Pipeline completed successfully! Check MLflow UI.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,44 @@
+import sys
+import os
+import argparse
+from pathlib import Path
+
+
+# Path setting: to find the src folder
+sys.path.append(os.getcwd())
+
+from src.components.batch_scorer import BatchScorer
+from src.utils.common import read_yaml
+
+def parse_args(scoring_config):
+    parser = argparse.ArgumentParser(
+        description="Offline bulk scoring with models/model.joblib + models/scaler.joblib (no HTTP layer)"
+    )
+    parser.add_argument("--input", required=True, help="Patients to score (.csv, .parquet, .feather or .npy)")
+    parser.add_argument("--output", required=True, help="Predictions file (.csv or .parquet), in input order")
+    parser.add_argument("--chunk-size", type=int, default=scoring_config.get('chunk_size', 50000),
+                        help="Rows read and scored per chunk")
+    parser.add_argument("--workers", type=int, default=scoring_config.get('workers'),
+                        help="Scoring processes (default: all cores, 0 = score in this process)")
+    parser.add_argument("--max-pending-chunks", type=int, default=scoring_config.get('max_pending_chunks'),
+                        help="Chunks in flight at most (default: 2 x workers), bounds memory")
+    parser.add_argument("--keep-columns", nargs="*", default=scoring_config.get('keep_columns', []),
+                        help="Input columns copied next to the prediction (e.g. an id)")
+    parser.add_argument("--model-dir", default=None, help="Directory of model.joblib & scaler.joblib")
+    return parser.parse_args()
+
+def main():
+    config = read_yaml(Path("configs/config.yaml"))
+    args = parse_args(config.get('scoring', {}))
+
+    scorer = BatchScorer(
+        model_dir=args.model_dir or config['artifacts']['model_dir'],
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_pending_chunks=args.max_pending_chunks
+    )
+    print(f"🧮 Scoring {args.input} in chunks of {args.chunk_size:,} rows with {scorer.workers} worker(s)...")
+    scorer.score_file(args.input, args.output, keep_columns=args.keep_columns)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
-import pandas as pd
+import asyncio
+import secrets
+import time
+import numpy as np
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from src.api.schemas.prediction import DiabetesInput
-from src.utils.common import read_yaml, load_object
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from src.api.schemas.prediction import DiabetesInput, DiabetesBatchInput, FEATURE_COLUMNS
+from src.api.schemas.admin import ModelAdminRequest
+from src.api.inference import read_features
+from src.api.batcher import MicroBatcher
+from src.api.cache import PredictionCache
+from src.api.metrics import MetricsRegistry, MetricsMiddleware, CONTENT_TYPE
+from src.api.model_manager import ModelBundle, ModelManager
+from src.api.monitoring import DriftMonitor
+from src.utils.common import read_yaml
+from src.utils.drift import load_reference
 import os
 from pathlib import Path
-import mlflow
-from mlflow.tracking import MlflowClient
 
 app = FastAPI(
     title="Diabetes Prediction API",
@@ -14,6 +25,32 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# --- METRICS (Prometheus text format at /metrics) ---
+metrics = MetricsRegistry()
+REQUESTS_TOTAL = metrics.counter("api_requests_total", "HTTP requests by endpoint and status code", ["endpoint", "status"])
+REQUEST_LATENCY = metrics.histogram("api_request_duration_seconds", "End-to-end request latency", ["endpoint"])
+IN_FLIGHT = metrics.gauge("api_requests_in_flight", "Requests currently being processed", ["endpoint"])
+STAGE_LATENCY = metrics.histogram("api_predict_stage_duration_seconds", "Latency of each prediction stage", ["endpoint", "stage"])
+MODEL_LOAD_SECONDS = metrics.gauge("api_model_load_duration_seconds", "Duration of the last model & scaler load")
+MODEL_LOADS = metrics.counter("api_model_loads_total", "Model loads by source", ["source"])
+
+# Stage timers resolved once (no label lookups on the hot path)
+# parse = body read + pydantic validation, before the handler runs
+PREDICT_PARSE = STAGE_LATENCY.labels("/predict", "parse")
+PREDICT_CACHE = STAGE_LATENCY.labels("/predict", "cache_lookup")
+PREDICT_INFERENCE = STAGE_LATENCY.labels("/predict", "inference")
+BATCH_PARSE = STAGE_LATENCY.labels("/predict/batch", "parse")
+BATCH_BUILD = STAGE_LATENCY.labels("/predict/batch", "build_matrix")
+BATCH_INFERENCE = STAGE_LATENCY.labels("/predict/batch", "inference")
+
+app.add_middleware(
+    MetricsMiddleware,
+    requests_total=REQUESTS_TOTAL,
+    request_latency=REQUEST_LATENCY,
+    in_flight=IN_FLIGHT,
+    endpoints=["/predict", "/predict/batch", "/metrics"]
+)
+
 # --- CONFIG & GLOBALS ---
 config_path = Path("configs/config.yaml")
 config = read_yaml(config_path)
@@ -23,87 +60,449 @@ MLFLOW_TRACKING_URI = config['mlflow']['tracking_uri']
 model_name = config['mlflow']['model_name'] 
 stage = "Production"
 
-# Model & Scaler Global Variables
-model = None
-scaler = None
+# Batch Settings
+MAX_BATCH_SIZE = config.get('api', {}).get('max_batch_size', 10000)
+
+# Micro-batching Settings (opt-in): groups concurrent /predict calls into one model call
+MICRO_BATCHING = config.get('api', {}).get('micro_batching', {})
+
+# Prediction Cache Settings: repeated identical inputs skip scaler + model
+CACHE_CONFIG = config.get('api', {}).get('prediction_cache', {})
+prediction_cache = PredictionCache(
+    max_size=CACHE_CONFIG.get('max_size', 10000),
+    ttl_seconds=CACHE_CONFIG.get('ttl_seconds')
+) if CACHE_CONFIG.get('enabled', False) else None
+
+# Startup Settings: serve the local snapshot at once, resolve the registry in the background
+STARTUP_CONFIG = config.get('api', {}).get('startup', {})
+STARTUP_MODE = STARTUP_CONFIG.get('mode', 'background')
+REGISTRY_TIMEOUT = STARTUP_CONFIG.get('registry_timeout_seconds', 5)
+
+# Inference backend: joblib (numpy fast path) | onnx (models/model.onnx on onnxruntime)
+BACKEND = config.get('api', {}).get('backend', 'joblib')
+ONNX_CONFIG = config.get('api', {}).get('onnx', {})
+
+# Hot Reload Settings: new versions are loaded & swapped in by a background task
+RELOAD_CONFIG = config.get('api', {}).get('reload', {})
+# Set by the multi-worker entry point (src/api/serve.py). Model state is per process, so with
+# several workers the parent resolves the version (registry included) before starting them:
+# workers only map that shared engine, without registry checks, hot reloads or admin changes.
+SERVING_WORKERS = int(os.getenv("API_SERVING_WORKERS", "1"))
+# Admin endpoints (pin / rollback) are disabled unless this token is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Drift Monitoring Settings: live inputs & predictions vs. the training reference
+MONITORING_CONFIG = config.get('monitoring', {})
+REFERENCE_PATH = Path(MONITORING_CONFIG.get('reference_path', "models/drift_reference.json"))
+drift_monitor = DriftMonitor(
+    columns=FEATURE_COLUMNS,
+    window_size=MONITORING_CONFIG.get('window_size', 10000),
+    ranges=read_yaml(Path("configs/schema.yaml")).get('RANGES', {}),
+    psi_threshold=MONITORING_CONFIG.get('psi_threshold', 0.2),
+    ks_threshold=MONITORING_CONFIG.get('ks_threshold', 0.1),
+    min_samples=MONITORING_CONFIG.get('min_samples', 100)
+) if MONITORING_CONFIG.get('enabled', False) else None
+
+# Micro-batcher (created at startup when enabled)
+batcher = None
+# Background registry / reload task (reference kept so it is not garbage collected)
+reload_task = None
+# Background drift comparison task
+monitoring_task = None
+
+def on_model_swap(bundle: ModelBundle):
+    # New artifacts: entries of the previous version can never hit again
+    if prediction_cache is not None:
+        prediction_cache.clear()
+    MODEL_LOAD_SECONDS.set(bundle.load_seconds)
+    MODEL_LOADS.labels(bundle.source).inc()
+
+# Owns the served (model, scaler, engine, version) bundle, see src/api/model_manager.py
+model_manager = ModelManager(
+    tracking_uri=MLFLOW_TRACKING_URI,
+    model_name=model_name,
+    stage=stage,
+    model_dir="models",
+    snapshot_dir=STARTUP_CONFIG.get('snapshot_dir', "models/snapshot"),
+    watch=RELOAD_CONFIG.get('watch', 'registry') if SERVING_WORKERS == 1 else "none",
+    registry_timeout=REGISTRY_TIMEOUT,
+    history_size=RELOAD_CONFIG.get('history_size', 3),
+    on_swap=on_model_swap,
+    # Set by the multi-worker entry point (src/api/serve.py): map the shared engine arrays
+    engine_dir=os.getenv("MODEL_ENGINE_DIR"),
+    backend=BACKEND,
+    onnx_options={
+        "path": config.get('export', {}).get('onnx_path', "models/model.onnx"),
+        "intra_op_threads": ONNX_CONFIG.get('intra_op_threads', 1)
+    }
+)
 
 def load_artifacts():
     """
-    Model & Scaler load from MLflow or local file.
+    Model & Scaler load from MLflow or local file (blocking: registry first, then local files).
     """
-    global model, scaler
-    
-    # 1. MODEL YÜKLEME
     try:
-        # Önce MLflow'dan çekmeyi dene (Localhost/Geliştirme Ortamı)
-        print(f"🔄 Connecting to MLflow at {MLFLOW_TRACKING_URI}...")
-        mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
-        client = MlflowClient()
-        
-        model_production_uri = f"models:/{model_name}/{stage}"
-        model = mlflow.sklearn.load_model(model_production_uri)
-        print("✅ Model loaded from MLflow Registry")
-        
+        model_manager.load_registry()
     except Exception as e:
         print(f"⚠️ MLflow connection failed: {e}")
         print("🔄 Switching to local file loading (Offline/Render Mode)...")
-        
-        try:
-            # Başarısız olursa yerel dosyadan yükle (Render/Production)
-            local_model_path = os.path.join("models", "model.joblib")
-            model = load_object(local_model_path)
-            print(f"✅ Model loaded from local file ({local_model_path})")
-        except Exception as e2:
-            print(f"❌ FATAL: Could not load model from file either: {e2}")
-            model = None
-
-    # 2. SCALER LOADING
+        if not model_manager.load_local():
+            print("❌ FATAL: Could not load model from file either")
+            MODEL_LOADS.labels("failed").inc()
+
+async def check_registry(poll=False):
+    """
+    Runs one registry check / file poll in a worker thread, bounded by the registry timeout.
+    Never raises: the served bundle stays in place when the source is unavailable.
+    """
+    check = model_manager.poll_once if poll else model_manager.load_registry
     try:
-        # Scaler genelde dosya olarak durur
-        local_scaler_path = os.path.join("models", "scaler.joblib")
-        scaler = load_object(local_scaler_path)
-        print(f"✅ Scaler loaded from {local_scaler_path}")
+        await asyncio.wait_for(run_in_threadpool(check), timeout=REGISTRY_TIMEOUT)
     except Exception as e:
-        print(f"❌ Scaler loading failed: {e}")
-        scaler = None
+        if model_manager.watch == "registry":
+            model_manager.registry_status = "unavailable"
+        reason = f"no answer within {REGISTRY_TIMEOUT}s" if isinstance(e, asyncio.TimeoutError) else e
+        served = model_manager.current.version if model_manager.current is not None else "nothing"
+        print(f"⚠️ Model source unavailable ({reason}), serving {served}")
+
+async def reload_loop():
+    """
+    Background task: first registry check, then periodic polls (hot reload).
+    """
+    if STARTUP_MODE != "blocking" and model_manager.watch == "registry":
+        await check_registry()
+    if not RELOAD_CONFIG.get('enabled', False) or model_manager.watch == "none":
+        return
+    while True:
+        await asyncio.sleep(RELOAD_CONFIG.get('poll_interval_seconds', 30))
+        await check_registry(poll=True)
+
+def ensure_artifacts():
+    """
+    Returns the served bundle, otherwise raises 503. Loading never happens on the request path.
+    """
+    bundle = model_manager.current
+    if bundle is None:
+        raise HTTPException(status_code=503, detail="Model or Scaler not available. Service is initializing or failed.")
+    return bundle
+
+def build_feature_matrix(batch: DiabetesBatchInput) -> np.ndarray:
+    """
+    Builds one float64 matrix (rows x features) from a records or columnar payload.
+    Column order always follows FEATURE_COLUMNS.
+    """
+    if (batch.records is None) == (batch.columns is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'records' or 'columns'.")
+
+    if batch.records is not None:
+        n_rows = len(batch.records)
+        _check_batch_size(n_rows)
+        matrix = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+        for i, record in enumerate(batch.records):
+            matrix[i] = [getattr(record, col) for col in FEATURE_COLUMNS]
+        return matrix
+
+    missing = [col for col in FEATURE_COLUMNS if col not in batch.columns]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing feature columns: {missing}")
+    n_rows = len(batch.columns[FEATURE_COLUMNS[0]])
+    if any(len(batch.columns[col]) != n_rows for col in FEATURE_COLUMNS):
+        raise HTTPException(status_code=422, detail="All feature columns must have the same length.")
+    _check_batch_size(n_rows)
+
+    matrix = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        matrix[:, j] = batch.columns[col]
+    return matrix
+
+def _check_batch_size(n_rows: int):
+    if n_rows == 0:
+        raise HTTPException(status_code=422, detail="Batch is empty.")
+    if n_rows > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch size {n_rows} exceeds the limit of {MAX_BATCH_SIZE} rows.")
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
+    global reload_task
     print("🚀 API is starting up...")
-    load_artifacts()
+    if STARTUP_MODE == "blocking" and SERVING_WORKERS == 1:
+        await run_in_threadpool(load_artifacts)
+    else:
+        # Ready as soon as the local model is loaded; the registry is checked afterwards
+        await run_in_threadpool(model_manager.load_local)
+    reload_task = asyncio.create_task(reload_loop())
+
+@app.on_event("shutdown")
+async def cancel_reload_task():
+    if reload_task is not None and not reload_task.done():
+        reload_task.cancel()
+
+def refresh_drift_reference(loaded_mtime=None):
+    """
+    (Re)loads the training reference when the file is new or changed. Returns its mtime.
+    """
+    if not REFERENCE_PATH.exists():
+        return loaded_mtime
+    mtime = REFERENCE_PATH.stat().st_mtime_ns
+    if mtime != loaded_mtime:
+        drift_monitor.set_reference(load_reference(REFERENCE_PATH))
+        print(f"📐 Drift reference loaded from {REFERENCE_PATH}")
+    return mtime
+
+async def monitoring_loop():
+    """
+    Background task: compares the live window with the training reference every interval.
+    The comparison runs in a worker thread, requests only write into the ring buffer.
+    """
+    reference_mtime = None
+    while True:
+        try:
+            reference_mtime = await run_in_threadpool(refresh_drift_reference, reference_mtime)
+            report = await run_in_threadpool(drift_monitor.run)
+            if report["drifted_features"]:
+                print(f"⚠️ Drift detected on: {', '.join(report['drifted_features'])}")
+        except Exception as e:
+            print(f"⚠️ Drift monitoring run failed: {e}")
+        await asyncio.sleep(MONITORING_CONFIG.get('interval_seconds', 60))
+
+@app.on_event("startup")
+async def start_drift_monitor():
+    global monitoring_task
+    if drift_monitor is not None:
+        monitoring_task = asyncio.create_task(monitoring_loop())
+
+@app.on_event("shutdown")
+async def cancel_monitoring_task():
+    if monitoring_task is not None and not monitoring_task.done():
+        monitoring_task.cancel()
+
+@app.on_event("startup")
+async def start_micro_batcher():
+    global batcher
+    if MICRO_BATCHING.get('enabled', False):
+        # Each row is submitted with the engine of its request's bundle
+        batcher = MicroBatcher(
+            max_wait_ms=MICRO_BATCHING.get('max_wait_ms', 2),
+            max_batch_size=MICRO_BATCHING.get('max_batch_size', 64)
+        )
+        batcher.start()
+        print(f"📦 Micro-batching enabled (max {batcher.max_batch_size} rows / {MICRO_BATCHING.get('max_wait_ms', 2)} ms)")
+
+@app.on_event("shutdown")
+async def stop_micro_batcher():
+    global batcher
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
 
 @app.get("/")
 def read_root():
     return {"message": "Diabetes Prediction API is Live! Go to /docs for Swagger UI."}
 
+@app.get("/health/live",
+         summary="Liveness Probe",
+         description="The process is up and serving HTTP (no model needed).")
+def health_live():
+    return {"status": "alive"}
+
+@app.get("/health/ready",
+         summary="Readiness Probe",
+         description="200 once a model is loaded and predictions can be served, 503 before.")
+def health_ready(response: Response):
+    bundle = model_manager.current
+    if bundle is None:
+        response.status_code = 503
+    return {
+        "ready": bundle is not None,
+        "model_source": bundle.source if bundle is not None else None,
+        "artifact_version": bundle.version if bundle is not None else "unloaded",
+        "registry": model_manager.registry_status,
+    }
+
+def check_admin_token(token):
+    # Fail closed: no configured token, no admin access
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled: set ADMIN_TOKEN to enable them.")
+    if token is None or not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+@app.get("/admin/model",
+         summary="Served Model Status",
+         description="Served model version, pin, reload source and the versions available for rollback.")
+def model_status(x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    return model_manager.status()
+
+@app.post("/admin/model",
+          summary="Pin / Roll Back / Reload the Model",
+          description="pin: serve a version (in memory or registry-vN) and stop auto reloads. "
+                      "unpin: resume auto reloads. rollback: serve the previous version (pinned). "
+                      "reload: check the watched source now.")
+async def manage_model(command: ModelAdminRequest, x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    if SERVING_WORKERS > 1:
+        # Only the worker receiving this request would change version
+        raise HTTPException(status_code=409, detail=f"Model changes are disabled with {SERVING_WORKERS} workers: "
+                                                    "restart the server to serve a new version.")
+    try:
+        if command.action == "pin":
+            if not command.version:
+                raise HTTPException(status_code=422, detail="'version' is required to pin.")
+            # Loading may download a model: worker thread, the event loop keeps serving
+            await run_in_threadpool(model_manager.pin, command.version)
+        elif command.action == "unpin":
+            model_manager.unpin()
+        elif command.action == "rollback":
+            await run_in_threadpool(model_manager.rollback)
+        else:
+            await run_in_threadpool(model_manager.poll_once)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Model load failed: {str(e)}")
+    return model_manager.status()
+
 @app.post("/predict", 
           summary="Predict Diabetes Progression",
           description="Predicts disease progression based on physiological metrics.")
-def predict(data: DiabetesInput):
-    # Global variables
-    
-    # Model & Scaler not found, attempting to reload...
-    if model is None or scaler is None:
-        # Lazy Loading: Tekrar yüklemeyi dene
-        print("⚠️ Model/Scaler not found, attempting to reload...")
-        load_artifacts()
-        if model is None or scaler is None:
-             raise HTTPException(status_code=503, detail="Model or Scaler not available. Service is initializing or failed.")
+async def predict(data: DiabetesInput, request: Request):
+    handler_start = time.perf_counter()
+    PREDICT_PARSE.observe(handler_start - request.scope.get("metrics_start", handler_start))
+    # One bundle for the whole request: a concurrent swap cannot mix model & scaler versions
+    bundle = ensure_artifacts()
 
     try:
-        # 1. DataFrame
-        input_df = pd.DataFrame([data.dict()])
-        
-        # 2. Scaling
-        scaled_data = scaler.transform(input_df)
-        
-        # 3. Prediction
-        prediction = model.predict(scaled_data)
-        
-        return {"prediction": float(prediction[0])}
+        features = read_features(data)
+        if prediction_cache is not None:
+            cache_key = PredictionCache.make_key(bundle.version, features)
+            cached = prediction_cache.get(cache_key)
+            PREDICT_CACHE.observe(time.perf_counter() - handler_start)
+            if cached is not None:
+                if drift_monitor is not None:
+                    drift_monitor.record(features, cached)
+                return {"prediction": cached}
+
+        inference_start = time.perf_counter()
+        if batcher is not None and batcher.running:
+            # Shares one vectorized model call with other concurrent requests on the same bundle
+            prediction = await batcher.submit(features, bundle.engine.predict_matrix)
+        else:
+            # Fields -> preallocated buffer -> scaling -> prediction (no DataFrame)
+            prediction = await run_in_threadpool(bundle.engine.predict_one, data)
+        PREDICT_INFERENCE.observe(time.perf_counter() - inference_start)
+
+        if prediction_cache is not None:
+            prediction_cache.put(cache_key, prediction)
+        if drift_monitor is not None:
+            # Preallocated ring buffer slot, the comparison runs in the background
+            drift_monitor.record(features, prediction)
+
+        return {"prediction": prediction}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction Error: {str(e)}")
 
+@app.post("/predict/batch",
+          summary="Batch Predict Diabetes Progression",
+          description="Predicts disease progression for many patients at once. Predictions keep the input order.")
+def predict_batch(batch: DiabetesBatchInput, request: Request):
+    handler_start = time.perf_counter()
+    BATCH_PARSE.observe(handler_start - request.scope.get("metrics_start", handler_start))
+    bundle = ensure_artifacts()
+    matrix = build_feature_matrix(batch)
+    inference_start = time.perf_counter()
+    BATCH_BUILD.observe(inference_start - handler_start)
+
+    try:
+        # One vectorized scaling + prediction for the whole batch
+        predictions = bundle.engine.predict_matrix(matrix)
+        BATCH_INFERENCE.observe(time.perf_counter() - inference_start)
+        if drift_monitor is not None:
+            drift_monitor.record_batch(matrix, predictions)
+
+        return {"predictions": predictions.tolist(), "count": len(matrix)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction Error: {str(e)}")
+
+@app.get("/metrics/batching",
+         summary="Micro-batching Metrics",
+         description="Queue depth and batch size statistics of the /predict micro-batcher.")
+def batching_metrics():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+@app.get("/metrics/cache",
+         summary="Prediction Cache Metrics",
+         description="Hit / miss / eviction counters of the /predict result cache.")
+def cache_metrics():
+    if prediction_cache is None:
+        return {"enabled": False}
+    bundle = model_manager.current
+    return {"enabled": True, "artifact_version": bundle.version if bundle is not None else "unloaded",
+            **prediction_cache.stats()}
+
+@app.get("/monitoring/drift",
+         summary="Drift & Data Quality Report",
+         description="Latest comparison of the live request window with the training reference "
+                     "(PSI / KS per feature and for predictions) and lifetime feature summaries.")
+def drift_report():
+    if drift_monitor is None:
+        return {"enabled": False}
+    if drift_monitor.last_report is None:
+        return {"enabled": True, "status": "pending", "rows_seen": drift_monitor.buffer.total}
+    return {"enabled": True, **drift_monitor.last_report}
+
+def collect_runtime_metrics():
+    """
+    Scrape-time metrics read from the model state, micro-batcher and prediction cache.
+    """
+    bundle = model_manager.current
+    families = [
+        ("api_model_info", "gauge", "Loaded model (value 1) with its source and version",
+         [({"source": bundle.source, "version": bundle.version}, 1)] if bundle is not None else []),
+        ("api_model_swaps_total", "counter", "Model bundles swapped in (startup load + hot reloads)",
+         [({}, model_manager.swaps)]),
+    ]
+    if batcher is not None:
+        stats = batcher.stats()
+        families += [
+            ("api_batcher_queue_depth", "gauge", "Requests waiting for the micro-batcher", [({}, stats["queue_depth"])]),
+            ("api_batcher_batches_total", "counter", "Micro-batches executed", [({}, stats["batches_total"])]),
+            ("api_batcher_rows_total", "counter", "Rows predicted through the micro-batcher", [({}, stats["rows_total"])]),
+            ("api_batcher_last_batch_size", "gauge", "Rows in the last micro-batch", [({}, stats["last_batch_size"])]),
+        ]
+    if prediction_cache is not None:
+        stats = prediction_cache.stats()
+        families += [
+            ("api_prediction_cache_size", "gauge", "Entries in the prediction cache", [({}, stats["size"])]),
+            ("api_prediction_cache_hits_total", "counter", "Prediction cache hits", [({}, stats["hits"])]),
+            ("api_prediction_cache_misses_total", "counter", "Prediction cache misses", [({}, stats["misses"])]),
+            ("api_prediction_cache_evictions_total", "counter", "Prediction cache LRU evictions", [({}, stats["evictions"])]),
+        ]
+    if drift_monitor is not None and drift_monitor.last_report is not None:
+        report = drift_monitor.last_report
+        columns = list(report["features"].items()) + [("prediction", report["prediction"])]
+        families += [
+            ("api_drift_psi", "gauge", "Population Stability Index of the live window vs. the training reference",
+             [({"feature": col}, result["psi"]) for col, result in columns if "psi" in result]),
+            ("api_drift_ks", "gauge", "Kolmogorov-Smirnov statistic of the live window vs. the training reference",
+             [({"feature": col}, result["ks"]) for col, result in columns if "ks" in result]),
+            ("api_drift_features", "gauge", "Features over the drift thresholds in the last report",
+             [({}, len(report["drifted_features"]))]),
+        ]
+    return families
+
+metrics.add_collector(collect_runtime_metrics)
+
+@app.get("/metrics",
+         summary="Prometheus Metrics",
+         description="Request counters, latency histograms, per-stage timers and model load info in Prometheus text format.")
+def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import json
+import os
+from pathlib import Path
+
+import shutil
+
+from src.api.inference import InferenceEngine
+from src.utils.common import hash_file, load_object, save_object
+
+
+def load_local_artifacts(model_dir="models"):
+    """
+    Loads models/model.joblib + models/scaler.joblib.
+    Returns (model, scaler, model_version, scaler_version); versions are content hashes.
+    """
+    model_path = os.path.join(model_dir, "model.joblib")
+    scaler_path = os.path.join(model_dir, "scaler.joblib")
+    # Arrays stay on (shared) file pages where the estimator keeps them as numpy arrays
+    model = load_object(model_path, mmap_mode="r")
+    scaler = load_object(scaler_path, mmap_mode="r")
+    return model, scaler, f"local-{hash_file(model_path)[:12]}", hash_file(scaler_path)[:12]
+
+
+def load_registry_model(tracking_uri: str, model_name: str, stage: str, timeout: float = None,
+                        current_version: str = None, version: str = None):
+    """
+    Loads the model of a registry stage (or an explicit registry version, e.g. "registry-v3").
+    Returns (model, version), or (None, version) when the registry version equals
+    current_version (nothing to download).
+
+    mlflow is imported here, not at API import time, and its HTTP timeout / retries
+    are bounded so an unreachable tracking server fails fast.
+    """
+    if timeout is not None:
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_TIMEOUT", str(max(1, int(timeout))))
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", "0")
+
+    import mlflow
+    import mlflow.sklearn
+    from mlflow.tracking import MlflowClient
+
+    mlflow.set_tracking_uri(tracking_uri)
+    if version is not None:
+        number = version.removeprefix("registry-v")
+    else:
+        latest = MlflowClient().get_latest_versions(model_name, stages=[stage])
+        if not latest:
+            raise LookupError(f"No '{stage}' version of {model_name} in the registry")
+        number = latest[0].version
+
+    version = f"registry-v{number}"
+    if version == current_version:
+        return None, version
+    return mlflow.sklearn.load_model(f"models:/{model_name}/{number}"), version
+
+
+def save_snapshot(snapshot_dir, model, scaler, model_version: str, scaler_version: str, source: str):
+    """
+    Stores the last known good model/scaler pair as uncompressed joblib files, so the
+    next startup can memory-map it instead of waiting for the registry.
+    Files are written next to the old ones and renamed (never a half-written snapshot).
+    """
+    snapshot_dir = Path(snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    for name, obj in (("model", model), ("scaler", scaler)):
+        save_object(snapshot_dir / f"{name}.joblib", obj)
+
+    meta = {"model_version": model_version, "scaler_version": scaler_version, "source": source}
+    tmp_path = snapshot_dir / "snapshot.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, snapshot_dir / "snapshot.json")
+
+
+def load_snapshot(snapshot_dir, model_dir="models"):
+    """
+    Memory-maps the snapshot (numpy arrays inside the model stay on disk pages shared
+    with the OS cache). Returns (model, scaler, model_version, scaler_version, source),
+    or None when there is no snapshot or models/ holds a newer locally trained model.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    meta_path = snapshot_dir / "snapshot.json"
+    if not meta_path.exists():
+        return None
+
+    local_model = Path(model_dir) / "model.joblib"
+    if local_model.exists() and local_model.stat().st_mtime > meta_path.stat().st_mtime:
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    model = load_object(snapshot_dir / "model.joblib", mmap_mode="r")
+    scaler = load_object(snapshot_dir / "scaler.joblib", mmap_mode="r")
+    return model, scaler, meta["model_version"], meta["scaler_version"], meta["source"]
+
+
+def export_shared_engine(engine_dir, engine, model_version: str, scaler_version: str, source: str) -> Path:
+    """
+    Writes the engine arrays for memory-mapped sharing between worker processes to
+    engine_dir/<version>/ (one directory per version: files mapped by running workers
+    are never rewritten). Returns that directory. ONNX engines go to <version>-onnx/
+    (the graph file, loaded by each worker's onnxruntime session).
+    """
+    version = f"{model_version}+scaler-{scaler_version}"
+    if engine.kind == "onnx":
+        version = f"{version}-onnx"
+    target = Path(engine_dir) / version.replace("/", "_")
+    if (target / "bundle.json").exists():
+        return target
+
+    tmp_dir = Path(f"{target}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    engine.save_arrays(tmp_dir)
+    with open(tmp_dir / "bundle.json", "w") as f:
+        json.dump({"model_version": model_version, "scaler_version": scaler_version, "source": source}, f)
+    os.replace(tmp_dir, target)
+    return target
+
+
+def load_shared_engine(path):
+    """
+    Maps an exported engine. Returns (engine, model_version, scaler_version, source).
+    """
+    path = Path(path)
+    with open(path / "bundle.json") as f:
+        meta = json.load(f)
+    engine = InferenceEngine.from_arrays(path, mmap_mode="r")
+    return engine, meta["model_version"], meta["scaler_version"], meta["source"]
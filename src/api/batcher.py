@@ -0,0 +1,132 @@
+import asyncio
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row requests for up to `max_wait_ms` or
+    `max_batch_size` rows, runs one vectorized prediction in the threadpool
+    and resolves each caller's future with its own result.
+
+    A row can be submitted with its own predict function (the engine of the
+    model version its request started with): rows of different functions are
+    never predicted in the same call.
+    """
+
+    def __init__(self, predict_fn=None, max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        # predict_fn: (rows x features) float64 matrix -> 1D array of predictions
+        # (default for rows submitted without their own)
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.queue = None
+        self._task = None
+        # Items taken off the queue and not yet answered (collected or being predicted)
+        self._batch = []
+
+        # Metrics
+        self.batches_total = 0
+        self.rows_total = 0
+        self.last_batch_size = 0
+        self.max_seen_batch_size = 0
+
+    def start(self):
+        """
+        Starts the background collector (must be called from the event loop).
+        """
+        self.queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Fail anything dequeued or still waiting so no caller hangs
+        pending, self._batch = self._batch, []
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, row, predict_fn=None) -> float:
+        """
+        Queues one feature row (sequence of floats in FEATURE_COLUMNS order) and waits for its prediction.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((row, predict_fn or self.predict_fn, future))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "batches_total": self.batches_total,
+            "rows_total": self.rows_total,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_seen_batch_size,
+            "avg_batch_size": self.rows_total / self.batches_total if self.batches_total else 0.0,
+        }
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        # Collected into self._batch: stop() fails these items if the task is cancelled
+        items = self._batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(items) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self.queue.empty():
+                items.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            # Callers that went away (client disconnect) are skipped
+            items = [item for item in items if not item[2].done()]
+
+            # One vectorized call per predict function, in arrival order
+            groups = {}
+            for row, predict_fn, future in items:
+                groups.setdefault(predict_fn, []).append((row, future))
+            for predict_fn, group in groups.items():
+                await self._predict(predict_fn, group)
+            self._batch = []
+
+    async def _predict(self, predict_fn, items: list):
+        matrix = np.array([row for row, _ in items], dtype=np.float64)
+        self.batches_total += 1
+        self.rows_total += len(items)
+        self.last_batch_size = len(items)
+        self.max_seen_batch_size = max(self.max_seen_batch_size, len(items))
+
+        try:
+            predictions = await run_in_threadpool(predict_fn, matrix)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(items, predictions):
+            if not future.done():
+                future.set_result(float(prediction))
@@ -0,0 +1,308 @@
+import copy
+import json
+import os
+import threading
+from operator import attrgetter
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import (
+    ExtraTreesRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge, SGDRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from src.api.schemas.prediction import FEATURE_COLUMNS
+
+LINEAR_MODELS = (ElasticNet, Lasso, Ridge, LinearRegression, SGDRegressor)
+FOREST_MODELS = (RandomForestRegressor, ExtraTreesRegressor)
+
+# Reads the 10 input fields in training order with a single C-level call
+read_features = attrgetter(*FEATURE_COLUMNS)
+
+
+class InferenceEngine:
+    """
+    Compact predictor built once from the fitted StandardScaler and the champion model.
+
+    Goes straight from the pydantic fields to a float, without pandas or the
+    estimator's own input validation:
+    - Linear models: scaling is folded into the coefficients (one dot product).
+    - sklearn tree ensembles: trees are flattened into arrays and traversed together.
+    - XGBoost: the native booster is called on the scaled buffer.
+    - Anything else: model.predict on the scaled buffer.
+
+    The flattened arrays can be exported with save_arrays() and memory-mapped by
+    several worker processes with from_arrays() (one copy of the weights in RAM).
+    XGBoost trees (squared error objective) are flattened for that export only.
+    """
+
+    def __init__(self, model, scaler):
+        self.model = model
+        self.model_type = type(model).__name__
+        self.n_features = len(FEATURE_COLUMNS)
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        # Per-thread input buffers (sync endpoints run in a threadpool)
+        self._local = threading.local()
+
+        if isinstance(model, LINEAR_MODELS):
+            self.kind = "linear"
+            self._build_linear(model)
+        elif isinstance(model, FOREST_MODELS) or isinstance(model, DecisionTreeRegressor):
+            self.kind = "forest"
+            estimators = [model] if isinstance(model, DecisionTreeRegressor) else model.estimators_
+            self._build_trees(estimators)
+            self._tree_weight = 1.0 / len(estimators)
+            self._offset = 0.0
+        elif isinstance(model, GradientBoostingRegressor) and model.init_ != "zero":
+            self.kind = "boosting"
+            self._build_trees(model.estimators_[:, 0])
+            self._tree_weight = model.learning_rate
+            self._offset = float(model.init_.predict(np.zeros((1, self.n_features)))[0])
+        elif type(model).__name__ == "XGBRegressor":
+            self._booster = model.get_booster()
+            try:
+                self._iteration_range = (0, model.best_iteration + 1)
+            except AttributeError:
+                self._iteration_range = (0, 0)
+            self.kind = "xgboost"
+        else:
+            self.kind = "generic"
+
+    # --- Builders ---
+    def _build_linear(self, model):
+        coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+        # coef . ((x - mean) / scale) + b  ==  (coef / scale) . x + (b - coef . (mean / scale))
+        self._weights = coef / self.scale
+        self._bias = float(np.asarray(model.intercept_).ravel()[0]) - float(coef @ (self.mean / self.scale))
+
+    def _build_trees(self, estimators):
+        self._pack_trees([
+            (tree.children_left, tree.children_right, tree.feature, tree.threshold, tree.value[:, 0, 0], tree.max_depth)
+            for tree in (estimator.tree_ for estimator in estimators)
+        ])
+
+    def _build_xgboost_trees(self) -> bool:
+        """
+        Flattens the booster's trees (JSON dump) into the sklearn tree layout.
+        Returns False for models that need the native booster (other objectives, categorical splits).
+        """
+        dump = json.loads(self._booster.save_raw("json"))
+        learner = dump["learner"]
+        if learner["objective"]["name"] != "reg:squarederror":
+            return False
+        trees = learner["gradient_booster"]["model"].get("trees")
+        if not trees or any(any(tree.get("split_type", [])) for tree in trees):
+            return False
+
+        start, end = self._iteration_range
+        if end:
+            indptr = learner["gradient_booster"]["model"]["iteration_indptr"]
+            trees = trees[indptr[start]:indptr[end]]
+
+        flat = []
+        for tree in trees:
+            left = np.asarray(tree["left_children"])
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            # XGBoost goes left when x < split; largest float32 below the split makes it x <= threshold
+            thresholds = np.nextafter(conditions, np.float32(-np.inf)).astype(np.float64)
+            depth = np.zeros(len(left), dtype=np.intp)
+            for node in range(len(left)):
+                if left[node] != -1:
+                    depth[left[node]] = depth[tree["right_children"][node]] = depth[node] + 1
+            # Leaves hold their (learning-rate scaled) output in split_conditions
+            flat.append((left, np.asarray(tree["right_children"]), np.asarray(tree["split_indices"]),
+                         thresholds, conditions.astype(np.float64), int(depth.max())))
+
+        self._pack_trees(flat)
+        self._tree_weight = 1.0
+        self._offset = float(learner["learner_model_param"]["base_score"].strip("[]"))
+        return True
+
+    def _pack_trees(self, trees):
+        """
+        trees: (children_left, children_right, feature, threshold, leaf value, depth) per tree,
+        with -1 as the children of a leaf.
+        """
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for children_left, children_right, feature, threshold, value, depth in trees:
+            node_ids = np.arange(len(children_left))
+            is_leaf = children_left == -1
+            # Leaves point to themselves, so extra traversal steps are no-ops
+            lefts.append(np.where(is_leaf, node_ids, children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, children_right) + offset)
+            features.append(np.where(is_leaf, 0, feature))
+            thresholds.append(np.where(is_leaf, np.inf, threshold))
+            values.append(np.where(is_leaf, value, 0.0))
+            roots.append(offset)
+            offset += len(children_left)
+            max_depth = max(max_depth, depth)
+
+        self._left = np.concatenate(lefts).astype(np.intp)
+        self._right = np.concatenate(rights).astype(np.intp)
+        self._feature = np.concatenate(features).astype(np.intp)
+        self._threshold = np.concatenate(thresholds).astype(np.float64)
+        self._value = np.concatenate(values).astype(np.float64)
+        self._roots = np.asarray(roots, dtype=np.intp)
+        self._max_depth = max_depth
+
+    # --- Shared (memory-mapped) layout ---
+    ARRAYS = {
+        "linear": ("mean", "scale", "_weights"),
+        "forest": ("mean", "scale", "_left", "_right", "_feature", "_threshold", "_value", "_roots"),
+    }
+    ARRAYS["boosting"] = ARRAYS["forest"]
+    SCALARS = ("kind", "model_type", "n_features", "_bias", "_tree_weight", "_offset", "_max_depth", "_iteration_range")
+
+    def save_arrays(self, path):
+        """
+        Writes the engine as one .npy file per array + engine.json. Kinds without a flat
+        layout (native xgboost booster, generic) also store the model (uncompressed joblib).
+        """
+        if self.kind == "xgboost":
+            flat = copy.copy(self)
+            if flat._build_xgboost_trees():
+                flat.kind = "boosting"
+                flat.save_arrays(path)
+                return
+
+        path = Path(path)
+        os.makedirs(path, exist_ok=True)
+        for name in self.ARRAYS.get(self.kind, ("mean", "scale")):
+            np.save(path / f"{name.lstrip('_')}.npy", np.ascontiguousarray(getattr(self, name)))
+        if self.kind not in self.ARRAYS:
+            joblib.dump(self.model, path / "model.joblib")
+        meta = {name: getattr(self, name) for name in self.SCALARS if hasattr(self, name)}
+        with open(path / "engine.json", "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def from_arrays(cls, path, mmap_mode="r"):
+        """
+        Rebuilds an engine from save_arrays() output. With mmap_mode="r" the arrays are
+        read-only views of the files: every process mapping them shares the same pages.
+        """
+        path = Path(path)
+        with open(path / "engine.json") as f:
+            meta = json.load(f)
+        if meta["kind"] == "onnx":
+            from src.api.onnx_engine import OnnxInferenceEngine
+
+            return OnnxInferenceEngine.from_arrays(path)
+        engine = cls.__new__(cls)
+        for name, value in meta.items():
+            setattr(engine, name, tuple(value) if name == "_iteration_range" else value)
+        for name in cls.ARRAYS.get(engine.kind, ("mean", "scale")):
+            setattr(engine, name, np.load(path / f"{name.lstrip('_')}.npy", mmap_mode=mmap_mode))
+        engine.model = None
+        if engine.kind not in cls.ARRAYS:
+            engine.model = joblib.load(path / "model.joblib", mmap_mode=mmap_mode)
+            if engine.kind == "xgboost":
+                engine._booster = engine.model.get_booster()
+        engine._local = threading.local()
+        return engine
+
+    # --- Buffers ---
+    def _buffers(self):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            # (raw row, scaled row as 1xN matrix, float32 copy for tree comparisons)
+            buffers = (
+                np.empty(self.n_features, dtype=np.float64),
+                np.empty((1, self.n_features), dtype=np.float64),
+                np.empty(self.n_features, dtype=np.float32),
+            )
+            self._local.buffers = buffers
+        return buffers
+
+    # --- Prediction ---
+    def predict_one(self, data) -> float:
+        """
+        Predicts a single DiabetesInput.
+        """
+        raw, scaled, scaled32 = self._buffers()
+        raw[:] = read_features(data)
+
+        if self.kind == "linear":
+            return float(raw @ self._weights + self._bias)
+
+        np.subtract(raw, self.mean, out=scaled[0])
+        np.divide(scaled[0], self.scale, out=scaled[0])
+
+        if self.kind in ("forest", "boosting"):
+            # sklearn trees compare float32 features against float64 thresholds
+            scaled32[:] = scaled[0]
+            node = self._roots
+            for _ in range(self._max_depth):
+                go_left = scaled32[self._feature[node]] <= self._threshold[node]
+                node = np.where(go_left, self._left[node], self._right[node])
+            return self._offset + self._tree_weight * float(self._value[node].sum())
+
+        if self.kind == "xgboost":
+            prediction = self._booster.inplace_predict(scaled, iteration_range=self._iteration_range)
+            return float(prediction[0])
+
+        return float(self.model.predict(scaled)[0])
+
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predicts a (rows x features) raw float64 matrix in one vectorized call.
+        """
+        X = np.asarray(X, dtype=np.float64)
+
+        if self.kind == "linear":
+            return X @ self._weights + self._bias
+
+        scaled = (X - self.mean) / self.scale
+
+        if self.kind in ("forest", "boosting"):
+            scaled32 = scaled.astype(np.float32)
+            rows = np.arange(len(X))[:, None]
+            node = np.broadcast_to(self._roots, (len(X), len(self._roots)))
+            for _ in range(self._max_depth):
+                go_left = scaled32[rows, self._feature[node]] <= self._threshold[node]
+                node = np.where(go_left, self._left[node], self._right[node])
+            return self._offset + self._tree_weight * self._value[node].sum(axis=1)
+
+        if self.kind == "xgboost":
+            prediction = self._booster.inplace_predict(scaled, iteration_range=self._iteration_range)
+            return np.asarray(prediction, dtype=np.float64)
+
+        return np.asarray(self.model.predict(scaled), dtype=np.float64)
+
+
+def build_inference_engine(model, scaler, backend="joblib", onnx_options=None,
+                           model_version=None, scaler_version=None):
+    """
+    Builds the fast-path predictor once (at artifact load time).
+
+    backend="onnx": the ONNX export served by onnxruntime (src/api/onnx_engine.py),
+    onnx_options = {"path": exported graph, "intra_op_threads": n}. Falls back to
+    the joblib engine when onnxruntime / the converter is missing or the model cannot be converted.
+    """
+    if backend == "onnx":
+        try:
+            from src.api.onnx_engine import load_onnx_engine
+
+            onnx_options = onnx_options or {}
+            engine = load_onnx_engine(
+                model, scaler,
+                onnx_path=onnx_options.get("path"),
+                model_version=model_version,
+                scaler_version=scaler_version,
+                intra_op_threads=onnx_options.get("intra_op_threads", 1)
+            )
+            print(f"⚡ Inference engine ready (onnxruntime, {engine.source})")
+            return engine
+        except Exception as e:
+            print(f"⚠️ ONNX backend unavailable ({e}), serving with the joblib engine")
+
+    engine = InferenceEngine(model, scaler)
+    print(f"⚡ Inference engine ready ({engine.kind} fast path)")
+    return engine
@@ -0,0 +1,182 @@
+import time
+from bisect import bisect_left
+
+# Latency buckets in seconds (100 µs .. 10 s)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def samples(self, name, labels):
+        return [(name, labels, self.value)]
+
+
+class Gauge(Counter):
+    def set(self, value: float):
+        self.value = value
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+
+class Histogram:
+    """
+    Fixed buckets, preallocated counts: observe() is one bisect + two additions.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self, name, labels):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            samples.append((f"{name}_bucket", labels + (("le", le),), cumulative))
+        samples.append((f"{name}_sum", labels, self.sum))
+        samples.append((f"{name}_count", labels, cumulative))
+        return samples
+
+
+class MetricFamily:
+    """
+    A named metric with optional labels. Children are created once per label set
+    and reused, so the hot path never takes a lock (increments rely on the GIL,
+    which is accurate enough for monitoring).
+    """
+
+    def __init__(self, kind, name, help_text, labelnames=(), **kwargs):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._kwargs = kwargs
+        self._children = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, METRIC_TYPES[self.kind](**self._kwargs))
+        return child
+
+    # Shortcuts for unlabeled metrics
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            for name, labels, value in child.samples(self.name, tuple(zip(self.labelnames, values))):
+                lines.append(_format_sample(name, labels, value))
+        return lines
+
+
+METRIC_TYPES = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+
+def _format_sample(name, labels, value) -> str:
+    if labels:
+        label_text = ",".join(f'{key}="{str(val)}"' for key, val in labels)
+        return f"{name}{{{label_text}}} {float(value)!r}"
+    return f"{name} {float(value)!r}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._families = []
+        # Callbacks evaluated at scrape time: () -> list of (name, kind, help, [(labels_dict, value)])
+        self._collectors = []
+
+    def _add(self, kind, name, help_text, labelnames=(), **kwargs) -> MetricFamily:
+        family = MetricFamily(kind, name, help_text, labelnames, **kwargs)
+        self._families.append(family)
+        return family
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add("counter", name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._add("gauge", name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add("histogram", name, help_text, labelnames, buckets=buckets)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(_format_sample(name, tuple(labels.items()), value))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: request counter, latency histogram and in-flight gauge per endpoint.
+    Stores the request start time in scope["metrics_start"] for per-stage timers.
+    """
+
+    def __init__(self, app, requests_total, request_latency, in_flight, endpoints):
+        self.app = app
+        self.requests_total = requests_total
+        self.request_latency = request_latency
+        self.in_flight = in_flight
+        # Only known paths get their own label (bounded cardinality)
+        self.endpoints = set(endpoints)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"] if scope["path"] in self.endpoints else "other"
+        start = time.perf_counter()
+        scope["metrics_start"] = start
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = self.in_flight.labels(path)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            self.request_latency.labels(path).observe(time.perf_counter() - start)
+            self.requests_total.labels(path, str(status["code"])).inc()
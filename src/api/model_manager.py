@@ -0,0 +1,299 @@
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from src.api.artifacts import (
+    load_local_artifacts, load_registry_model, save_snapshot, load_snapshot, load_shared_engine
+)
+from src.api.inference import build_inference_engine
+from src.utils.common import hash_file, load_object
+
+
+class ModelBundle:
+    """
+    Immutable (model, scaler, engine, version) unit served by the API.
+
+    Requests read the manager's current bundle once and use only that object,
+    so a swap can never hand them the model of one version with the scaler of another.
+    """
+
+    __slots__ = ("model", "scaler", "engine", "model_version", "scaler_version",
+                 "version", "source", "load_seconds")
+
+    def __init__(self, model, scaler, engine, model_version, scaler_version, source, load_seconds=0.0):
+        values = {
+            "model": model,
+            "scaler": scaler,
+            "engine": engine,
+            "model_version": model_version,
+            "scaler_version": scaler_version,
+            "version": f"{model_version}+scaler-{scaler_version}",
+            "source": source,
+            "load_seconds": load_seconds,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelBundle is immutable, build a new one instead")
+
+    @classmethod
+    def build(cls, model, scaler, model_version, scaler_version, source, load_start=None,
+              backend="joblib", onnx_options=None):
+        """
+        Builds the inference engine (see build_inference_engine for the backends)
+        and warms it with a probe prediction.
+        """
+        engine = build_inference_engine(model, scaler, backend, onnx_options, model_version, scaler_version)
+        return cls.from_engine(engine, model_version, scaler_version, source, load_start, model, scaler)
+
+    @classmethod
+    def from_engine(cls, engine, model_version, scaler_version, source, load_start=None, model=None, scaler=None):
+        """
+        Warms an engine with a probe prediction (the training mean patient).
+        A bundle that cannot predict a finite value is never swapped in.
+        """
+        probe = engine.predict_matrix(np.asarray(engine.mean)[np.newaxis, :])
+        if not np.all(np.isfinite(probe)):
+            raise ValueError(f"Probe prediction of {model_version} is not finite: {probe}")
+        load_seconds = time.perf_counter() - load_start if load_start is not None else 0.0
+        return cls(model, scaler, engine, model_version, scaler_version, source, load_seconds)
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "model_version": self.model_version,
+            "model_type": self.engine.model_type,
+            "source": self.source,
+        }
+
+
+class ModelManager:
+    """
+    Owns the served ModelBundle and replaces it off the request path.
+
+    - Loads run in worker threads under one lock (never two reloads at once; polls
+      that find a load in progress are skipped).
+    - New versions come from the registry stage (watch="registry") or from changed
+      models/*.joblib files (watch="files": a new model.joblib, the file written last). watch="none": the version is fixed at startup
+      (workers of the multi-worker entry point, whose parent resolved it).
+    - A swap is one attribute assignment, so readers see the old or the new bundle.
+    - engine_dir: an engine exported by the multi-worker entry point (src/api/serve.py);
+      every worker memory-maps the same arrays instead of loading its own copy.
+    - pin() freezes the served version (polling stops replacing it), rollback() goes
+      back to the previous bundle kept in memory.
+    - backend: "joblib" (InferenceEngine) or "onnx" (models/model.onnx on onnxruntime,
+      converted in memory for versions it was not exported from).
+    """
+
+    def __init__(self, tracking_uri, model_name, stage="Production", model_dir="models",
+                 snapshot_dir="models/snapshot", watch="registry", registry_timeout=5,
+                 history_size=3, on_swap=None, engine_dir=None, backend="joblib", onnx_options=None):
+        self.tracking_uri = tracking_uri
+        self.model_name = model_name
+        self.stage = stage
+        self.model_dir = Path(model_dir)
+        self.snapshot_dir = Path(snapshot_dir)
+        self.watch = watch
+        self.registry_timeout = registry_timeout
+        self.on_swap = on_swap
+        self.engine_dir = Path(engine_dir) if engine_dir else None
+        self.backend = backend
+        self.onnx_options = {"path": self.model_dir / "model.onnx", **(onnx_options or {})}
+
+        # Served bundle (read without locking by every request)
+        self.current = None
+        # Previously served bundles, newest last (rollback targets)
+        self.history = deque(maxlen=history_size)
+        # Bundles rolled back from: still pinnable, never a rollback target again
+        self.rolled_back = deque(maxlen=history_size)
+        self.pinned = None
+        # Registry lookup: pending | resolved | unchanged | unavailable | disabled
+        self.registry_status = "pending" if watch == "registry" else "disabled"
+        self.swaps = 0
+        self._file_mtimes = self._local_mtimes()
+        self._lock = threading.Lock()
+
+    # --- swapping ---
+    def _swap(self, bundle: ModelBundle, remember=True):
+        previous = self.current
+        if remember and previous is not None and previous.version != bundle.version:
+            self.history.append(previous)
+        self.current = bundle
+        self.swaps += 1
+        if self.on_swap is not None:
+            self.on_swap(bundle)
+        print(f"🔁 Serving {bundle.version} ({bundle.source}, {bundle.engine.model_type})")
+
+    def install(self, bundle: ModelBundle):
+        with self._lock:
+            self._swap(bundle)
+
+    # --- loaders (blocking, call from worker threads) ---
+    def _build(self, model, scaler, model_version, scaler_version, source, load_start):
+        return ModelBundle.build(model, scaler, model_version, scaler_version, source, load_start,
+                                 backend=self.backend, onnx_options=self.onnx_options)
+
+    def _local_mtimes(self):
+        paths = [self.model_dir / "model.joblib", self.model_dir / "scaler.joblib"]
+        return tuple(path.stat().st_mtime_ns if path.exists() else None for path in paths)
+
+    def _build_local(self):
+        load_start = time.perf_counter()
+        # Read before loading (a file replaced meanwhile is seen by the next poll) but recorded
+        # once the bundle is built: a half-written or broken model is retried
+        mtimes = self._local_mtimes()
+        model, scaler, model_version, scaler_version = load_local_artifacts(self.model_dir)
+        bundle = self._build(model, scaler, model_version, scaler_version, "local_joblib", load_start)
+        self._file_mtimes = mtimes
+        return bundle
+
+    def load_local(self) -> bool:
+        """
+        Serves the shared engine, the warm snapshot (memory-mapped) or, failing that,
+        models/*.joblib. No network access: this is what makes startup fast.
+        """
+        with self._lock:
+            if self.engine_dir is not None:
+                try:
+                    load_start = time.perf_counter()
+                    engine, model_version, scaler_version, _ = load_shared_engine(self.engine_dir)
+                    self._swap(ModelBundle.from_engine(engine, model_version, scaler_version, "shared_mmap", load_start))
+                    print(f"✅ Model mapped from shared engine {self.engine_dir} ({model_version})")
+                    return True
+                except Exception as e:
+                    print(f"⚠️ Shared engine loading failed: {e}")
+
+            try:
+                load_start = time.perf_counter()
+                snapshot = load_snapshot(self.snapshot_dir, self.model_dir)
+                if snapshot is not None:
+                    model, scaler, model_version, scaler_version, source = snapshot
+                    self._swap(self._build(model, scaler, model_version, scaler_version, "snapshot", load_start))
+                    print(f"✅ Model loaded from snapshot {self.snapshot_dir} ({model_version}, originally {source})")
+                    return True
+            except Exception as e:
+                print(f"⚠️ Snapshot loading failed: {e}")
+
+            try:
+                self._swap(self._build_local())
+                print(f"✅ Model & Scaler loaded from local files ({self.model_dir}/)")
+                return True
+            except Exception as e:
+                print(f"❌ Local model loading failed: {e}")
+                return False
+
+    def _load_scaler(self):
+        scaler_path = self.model_dir / "scaler.joblib"
+        return load_object(scaler_path), hash_file(scaler_path)[:12]
+
+    def _load_registry(self, version=None) -> bool:
+        """
+        Registry model + local scaler (the scaler is not registered). Returns True on a swap.
+        """
+        load_start = time.perf_counter()
+        current_version = self.current.model_version if self.current is not None else None
+        print(f"🔄 Checking MLflow Registry at {self.tracking_uri}...")
+        model, model_version = load_registry_model(
+            self.tracking_uri, self.model_name, self.stage, timeout=self.registry_timeout,
+            current_version=current_version, version=version
+        )
+        if model is None:
+            self.registry_status = "unchanged"
+            return False
+
+        scaler, scaler_version = self._load_scaler()
+        bundle = self._build(model, scaler, model_version, scaler_version, "mlflow_registry", load_start)
+        self._swap(bundle)
+        self.registry_status = "resolved"
+        try:
+            save_snapshot(self.snapshot_dir, model, scaler, model_version, scaler_version, "mlflow_registry")
+        except Exception as e:
+            print(f"⚠️ Snapshot could not be saved: {e}")
+        return True
+
+    def load_registry(self) -> bool:
+        with self._lock:
+            try:
+                return self._load_registry()
+            except Exception:
+                self.registry_status = "unavailable"
+                raise
+
+    def poll_once(self) -> bool:
+        """
+        Checks the watched source once. Returns True when a new bundle was swapped in.
+        Skipped while pinned or while another load is running.
+        """
+        if self.pinned is not None or self.watch == "none":
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if self.watch == "files":
+                # model.joblib is written after scaler.joblib by a pipeline run: a new scaler
+                # alone means training has not finished, loading it would mismatch the pair
+                if self._local_mtimes()[0] == self._file_mtimes[0]:
+                    return False
+                self._swap(self._build_local())
+                return True
+            try:
+                return self._load_registry()
+            except Exception:
+                self.registry_status = "unavailable"
+                raise
+        finally:
+            self._lock.release()
+
+    # --- admin ---
+    def pin(self, version: str) -> ModelBundle:
+        """
+        Serves `version` (full or model version, e.g. "registry-v3") and stops automatic reloads.
+        Bundles still in memory are swapped back instantly; registry versions are downloaded.
+        """
+        with self._lock:
+            known = [self.current] if self.current is not None else []
+            for bundle in known + list(self.history) + list(self.rolled_back):
+                if version in (bundle.version, bundle.model_version):
+                    if bundle is not self.current:
+                        (self.history if bundle in self.history else self.rolled_back).remove(bundle)
+                        self._swap(bundle)
+                    break
+            else:
+                if not version.startswith("registry-v"):
+                    raise LookupError(f"Version {version} is not loaded and is not a registry version")
+                self._load_registry(version=version)
+            self.pinned = self.current.version
+            return self.current
+
+    def unpin(self):
+        self.pinned = None
+
+    def rollback(self) -> ModelBundle:
+        """
+        Swaps back to the previously served bundle and pins it. The bundle rolled back
+        from is not a rollback target (a second rollback goes one version further back),
+        it can still be pinned.
+        """
+        with self._lock:
+            if not self.history:
+                raise LookupError("No previous model version to roll back to")
+            previous = self.history.pop()
+            self.rolled_back.append(self.current)
+            self._swap(previous, remember=False)
+            self.pinned = previous.version
+            return previous
+
+    def status(self) -> dict:
+        return {
+            "current": self.current.describe() if self.current is not None else None,
+            "pinned": self.pinned,
+            "watch": self.watch,
+            "registry": self.registry_status,
+            "swaps": self.swaps,
+            "history": [bundle.describe() for bundle in reversed(self.history)],
+            "rolled_back": [bundle.describe() for bundle in reversed(self.rolled_back)],
+        }
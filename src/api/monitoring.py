@@ -0,0 +1,254 @@
+import threading
+import time
+
+import numpy as np
+
+from src.utils.drift import ks_statistic, psi
+
+# Quantiles reported from the streaming sketch
+SKETCH_QUANTILES = (5, 25, 50, 75, 95)
+
+
+class RingBuffer:
+    """
+    Fixed-size window of the latest (features, prediction) rows.
+
+    Arrays are preallocated once: recording a request writes into the next slot
+    (overwriting the oldest row when full), nothing is allocated per request.
+    `total` counts every row ever recorded, so readers can pick up only new rows.
+    """
+
+    def __init__(self, capacity: int, n_features: int):
+        self.capacity = capacity
+        self.features = np.zeros((capacity, n_features), dtype=np.float64)
+        self.predictions = np.zeros(capacity, dtype=np.float64)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def append(self, features, prediction: float):
+        with self._lock:
+            slot = self.total % self.capacity
+            self.features[slot] = features
+            self.predictions[slot] = prediction
+            self.total += 1
+
+    def extend(self, matrix: np.ndarray, predictions: np.ndarray):
+        n = len(matrix)
+        # Only the last `capacity` rows of a large batch can stay in the window
+        kept = min(n, self.capacity)
+        with self._lock:
+            slots = (self.total + n - kept + np.arange(kept)) % self.capacity
+            self.features[slots] = matrix[n - kept:]
+            self.predictions[slots] = predictions[n - kept:]
+            self.total += n
+
+    def snapshot(self, since: int = 0):
+        """
+        Copies of the buffered rows recorded after row number `since`, oldest first,
+        and the row count at the time of the copy.
+        """
+        with self._lock:
+            total = self.total
+            start = max(since, total - self.capacity)
+            slots = np.arange(start, total) % self.capacity
+            return self.features[slots], self.predictions[slots], total
+
+
+class StreamingSummary:
+    """
+    Lifetime summary of one column, updated batch by batch: count, mean & variance
+    (Chan's parallel update), min/max, non-finite values and a fixed-bin quantile
+    sketch over the reference percentiles.
+    """
+
+    def __init__(self, edges=None, value_range=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.non_finite = 0
+        self.out_of_range = 0
+        self.value_range = value_range
+        self.edges = np.asarray(edges, dtype=np.float64) if edges is not None else None
+        self.sketch = np.zeros(len(self.edges) + 1, dtype=np.int64) if self.edges is not None else None
+
+    def update(self, values: np.ndarray):
+        finite = np.isfinite(values)
+        self.non_finite += int(len(values) - finite.sum())
+        values = values[finite]
+        n = len(values)
+        if n == 0:
+            return
+        if self.value_range is not None:
+            low, high = self.value_range
+            self.out_of_range += int(np.count_nonzero((values < low) | (values > high)))
+
+        batch_mean = values.mean()
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self.edges is not None:
+            self.sketch += np.bincount(np.searchsorted(self.edges, values, side="right"), minlength=len(self.sketch))
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile: interpolates inside the sketch bin holding the q-th value
+        (outer bins are bounded by the observed min/max).
+        """
+        if self.count == 0 or self.sketch is None:
+            return None
+        bounds = np.concatenate([[self.min], np.clip(self.edges, self.min, self.max), [self.max]])
+        cumulative = np.cumsum(self.sketch)
+        target = q / 100 * self.count
+        i = min(int(np.searchsorted(cumulative, target)), len(self.sketch) - 1)
+        before = cumulative[i - 1] if i > 0 else 0
+        fraction = (target - before) / self.sketch[i] if self.sketch[i] else 0.0
+        return float(bounds[i] + fraction * (bounds[i + 1] - bounds[i]))
+
+    def describe(self) -> dict:
+        if self.count == 0:
+            return {"count": 0, "non_finite": self.non_finite}
+        summary = {
+            "count": self.count,
+            "mean": self.mean,
+            "std": float(np.sqrt(self.m2 / self.count)),
+            "min": self.min,
+            "max": self.max,
+            "non_finite": self.non_finite,
+        }
+        if self.value_range is not None:
+            summary["out_of_range"] = self.out_of_range
+        if self.sketch is not None:
+            summary["quantiles"] = {f"p{q}": self.quantile(q) for q in SKETCH_QUANTILES}
+        return summary
+
+
+class DriftMonitor:
+    """
+    Live traffic monitoring against the training reference (see src/utils/drift.py).
+
+    The request path only records rows into the ring buffer. `run()` is called by a
+    background task: it folds the rows recorded since the last run into the lifetime
+    summaries and compares the current window with the reference (PSI & KS per
+    feature and for the predictions). `last_report` is what the endpoint returns.
+    """
+
+    def __init__(self, columns: list, window_size: int = 10000, reference: dict = None, ranges: dict = None,
+                 psi_threshold: float = 0.2, ks_threshold: float = 0.1, min_samples: int = 100):
+        self.columns = list(columns)
+        self.buffer = RingBuffer(window_size, len(self.columns))
+        self.reference = reference
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_samples = min_samples
+        self.last_report = None
+        self.runs = 0
+        self.ranges = ranges or {}
+        self._seen = 0
+        self._skipped = 0
+        self._run_lock = threading.Lock()
+        self._reset_summaries()
+
+    def _reset_summaries(self):
+        self.summaries = {
+            col: StreamingSummary(self._sketch_edges(col),
+                                  (self.ranges[col]['min'], self.ranges[col]['max']) if col in self.ranges else None)
+            for col in self.columns
+        }
+        self.summaries["prediction"] = StreamingSummary(self._sketch_edges("prediction"))
+
+    def set_reference(self, reference: dict):
+        """
+        New training reference (retrained model): lifetime summaries restart on its sketch bins.
+        """
+        with self._run_lock:
+            self.reference = reference
+            self._reset_summaries()
+
+    def _column_reference(self, name):
+        if self.reference is None:
+            return None
+        if name == "prediction":
+            return self.reference.get("prediction")
+        return self.reference["columns"].get(name)
+
+    def _sketch_edges(self, name):
+        column_reference = self._column_reference(name)
+        if column_reference is None:
+            return None
+        return np.unique(np.asarray(column_reference["quantiles"])[1:-1])
+
+    # --- request path ---
+    def record(self, features, prediction: float):
+        self.buffer.append(features, prediction)
+
+    def record_batch(self, matrix: np.ndarray, predictions: np.ndarray):
+        self.buffer.extend(matrix, predictions)
+
+    # --- background task ---
+    def run(self) -> dict:
+        """
+        Updates the lifetime summaries and computes a new drift report.
+        """
+        with self._run_lock:
+            start = time.perf_counter()
+            new_X, new_predictions, total = self.buffer.snapshot(since=self._seen)
+            # Rows overwritten before this run was scheduled never reach the lifetime summaries
+            skipped = total - self._seen - len(new_X)
+            self._seen = total
+            self._skipped += skipped
+            for j, col in enumerate(self.columns):
+                self.summaries[col].update(new_X[:, j])
+            self.summaries["prediction"].update(new_predictions)
+
+            window_X, window_predictions, _ = self.buffer.snapshot()
+            features = {col: self._compare(col, window_X[:, j]) for j, col in enumerate(self.columns)}
+            prediction = self._compare("prediction", window_predictions)
+
+            drifted = [col for col, result in features.items() if result.get("drift")]
+            if self.reference is None:
+                status = "no_reference"
+            elif len(window_X) < self.min_samples:
+                status = "insufficient_data"
+            else:
+                status = "drift" if drifted or prediction.get("drift") else "ok"
+
+            self.runs += 1
+            self.last_report = {
+                "status": status,
+                "computed_at": time.time(),
+                "compute_seconds": time.perf_counter() - start,
+                "window_rows": len(window_X),
+                "rows_seen": total,
+                "rows_not_summarized": self._skipped,
+                "thresholds": {"psi": self.psi_threshold, "ks": self.ks_threshold},
+                "drifted_features": drifted,
+                "features": features,
+                "prediction": prediction,
+            }
+            return self.last_report
+
+    def _compare(self, name, window: np.ndarray) -> dict:
+        result = {"lifetime": self.summaries[name].describe()}
+        column_reference = self._column_reference(name)
+        window = window[np.isfinite(window)]
+        if len(window):
+            result["window_mean"] = float(window.mean())
+        if column_reference is None:
+            return result
+
+        result["reference_mean"] = column_reference["mean"]
+        if len(window) < self.min_samples:
+            return result
+        edges = np.asarray(column_reference["bin_edges"])
+        counts = np.bincount(np.searchsorted(edges, window, side="right"), minlength=len(edges) + 1)
+        result["psi"] = psi(column_reference["bin_proportions"], counts / len(window))
+        result["ks"] = ks_statistic(column_reference["quantiles"], window)
+        result["drift"] = result["psi"] > self.psi_threshold or result["ks"] > self.ks_threshold
+        return result
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.api.inference import read_features
+from src.utils.onnx_export import INPUT_NAME
+
+
+class OnnxInferenceEngine:
+    """
+    Serves the ONNX export of the scaler + model pipeline (models/model.onnx) with onnxruntime.
+
+    Same interface as InferenceEngine (predict_one / predict_matrix / mean / kind /
+    model_type): the scaling and the model run inside one compiled graph, called
+    on a per-thread float64 buffer, with no pickled estimator in the process.
+
+    intra_op_threads: onnxruntime threads per call. 1 suits the API (requests are
+    small and already run concurrently); more helps large batches.
+    """
+
+    kind = "onnx"
+
+    def __init__(self, onnx_bytes: bytes, intra_op_threads: int = 1):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._onnx_bytes = onnx_bytes
+        self.intra_op_threads = intra_op_threads
+        self._session = ort.InferenceSession(onnx_bytes, options, providers=["CPUExecutionProvider"])
+
+        self.metadata = dict(self._session.get_modelmeta().custom_metadata_map)
+        self.model_type = self.metadata.get("model_type", "onnx")
+        self.mean = np.asarray(json.loads(self.metadata["feature_mean"]), dtype=np.float64)
+        self.n_features = len(self.mean)
+        self.model = None
+        self._output_name = self._session.get_outputs()[0].name
+        self._local = threading.local()
+
+    @classmethod
+    def from_file(cls, path, intra_op_threads: int = 1):
+        with open(path, "rb") as f:
+            return cls(f.read(), intra_op_threads)
+
+    @classmethod
+    def from_model(cls, model, scaler, intra_op_threads: int = 1):
+        """
+        Converts a loaded (model, scaler) in memory (registry models, stale exports).
+        """
+        from src.utils.onnx_export import convert_to_onnx
+
+        return cls(convert_to_onnx(model, scaler).SerializeToString(), intra_op_threads)
+
+    # --- Shared layout (src/api/serve.py) ---
+    def save_arrays(self, path):
+        """
+        Writes the graph + engine.json; worker processes load it with from_arrays().
+        """
+        path = Path(path)
+        os.makedirs(path, exist_ok=True)
+        with open(path / "model.onnx", "wb") as f:
+            f.write(self._onnx_bytes)
+        with open(path / "engine.json", "w") as f:
+            json.dump({"kind": self.kind, "model_type": self.model_type,
+                       "intra_op_threads": self.intra_op_threads}, f)
+
+    @classmethod
+    def from_arrays(cls, path):
+        path = Path(path)
+        with open(path / "engine.json") as f:
+            meta = json.load(f)
+        return cls.from_file(path / "model.onnx", meta.get("intra_op_threads", 1))
+
+    # --- Prediction ---
+    def predict_one(self, data) -> float:
+        """
+        Predicts a single DiabetesInput.
+        """
+        raw = getattr(self._local, "raw", None)
+        if raw is None:
+            raw = self._local.raw = np.empty((1, self.n_features), dtype=np.float64)
+        raw[0] = read_features(data)
+        return float(self._session.run([self._output_name], {INPUT_NAME: raw})[0][0, 0])
+
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predicts a (rows x features) raw float64 matrix in one session call.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        prediction = self._session.run([self._output_name], {INPUT_NAME: X})[0]
+        return prediction.ravel().astype(np.float64)
+
+
+def load_onnx_engine(model, scaler, onnx_path=None, model_version=None, scaler_version=None,
+                     intra_op_threads: int = 1) -> OnnxInferenceEngine:
+    """
+    Serves onnx_path when it was exported from exactly this model/scaler version,
+    otherwise converts the loaded pair in memory.
+    """
+    if onnx_path is not None and Path(onnx_path).exists():
+        engine = OnnxInferenceEngine.from_file(onnx_path, intra_op_threads)
+        exported = (engine.metadata.get("model_version"), engine.metadata.get("scaler_version"))
+        if exported == (model_version, scaler_version):
+            engine.source = str(onnx_path)
+            return engine
+        print(f"⚠️ {onnx_path} was exported from {exported[0]}, converting {model_version} in memory")
+    engine = OnnxInferenceEngine.from_model(model, scaler, intra_op_threads)
+    engine.source = "in-memory conversion"
+    return engine
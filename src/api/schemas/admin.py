@@ -0,0 +1,7 @@
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class ModelAdminRequest(BaseModel):
+    action: Literal["pin", "unpin", "rollback", "reload"] = Field(..., description="Operation on the served model", example="pin")
+    version: Optional[str] = Field(None, description="Version to pin: a served/previous version or 'registry-vN'", example="registry-v3")
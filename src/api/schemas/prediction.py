@@ -1,5 +1,9 @@
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
+# Feature order expected by the scaler and the model (same order as training data)
+FEATURE_COLUMNS = ["age", "sex", "bmi", "bp", "s1", "s2", "s3", "s4", "s5", "s6"]
+
 class DiabetesInput(BaseModel):
     # Standard physiological measurements (Raw Values)
     age: float = Field(..., description="Age in years", example=59.0)
@@ -13,4 +17,12 @@ class DiabetesInput(BaseModel):
     s3: float = Field(..., description="s3: High-Density Lipoproteins (HDL)", example=38.0)
     s4: float = Field(..., description="s4: Total Cholesterol / HDL Ratio (tch)", example=4.0)
     s5: float = Field(..., description="s5: Serum Triglycerides Level (ltg)", example=4.85)
-    s6: float = Field(..., description="s6: Blood Sugar Level (Glucose - glu)", example=87.0)
\ No newline at end of file
+    s6: float = Field(..., description="s6: Blood Sugar Level (Glucose - glu)", example=87.0)
+
+
+class DiabetesBatchInput(BaseModel):
+    # Either row-oriented records or a columnar payload (feature name -> values)
+    records: Optional[List[DiabetesInput]] = Field(None, description="List of patient records")
+    columns: Optional[Dict[str, List[float]]] = Field(
+        None, description="Columnar payload: one list of values per feature, all of equal length"
+    )
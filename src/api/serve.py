@@ -0,0 +1,94 @@
+"""
+Production entry point: N uvicorn worker processes sharing one memory-mapped model.
+
+The parent process loads the model once (snapshot or models/*.joblib, then the registry
+version when api.reload.watch is "registry"), exports its flattened arrays to
+api.serving.engine_dir and starts the workers with MODEL_ENGINE_DIR pointing there.
+Each worker maps the same files (mmap_mode="r"), so the model weights are in RAM once,
+however many workers run.
+
+Model state is per process: with several workers the version is fixed until the next
+restart (no hot reload, POST /admin/model answers 409), otherwise each worker would
+download its own copy and admin changes would only reach one of them.
+
+Usage:
+    python -m src.api.serve --workers 4
+"""
+import argparse
+import os
+from pathlib import Path
+
+import uvicorn
+
+from src.api.artifacts import export_shared_engine
+from src.api.model_manager import ModelManager
+from src.utils.common import read_yaml
+
+
+def prepare_shared_engine(config: dict):
+    """
+    Exports the engine of the served model: the local one, replaced by the registry
+    version when the registry is watched and answers (the snapshot is saved here, once).
+    Returns its directory, or None when no model is available.
+    """
+    api_config = config.get('api', {})
+    startup_config = api_config.get('startup', {})
+    manager = ModelManager(
+        tracking_uri=config['mlflow']['tracking_uri'],
+        model_name=config['mlflow']['model_name'],
+        model_dir="models",
+        snapshot_dir=startup_config.get('snapshot_dir', "models/snapshot"),
+        watch=api_config.get('reload', {}).get('watch', 'registry'),
+        registry_timeout=startup_config.get('registry_timeout_seconds', 5),
+        backend=api_config.get('backend', 'joblib'),
+        onnx_options={
+            "path": config.get('export', {}).get('onnx_path', "models/model.onnx"),
+            "intra_op_threads": api_config.get('onnx', {}).get('intra_op_threads', 1)
+        }
+    )
+    manager.load_local()
+    if manager.watch == "registry":
+        try:
+            manager.load_registry()
+        except Exception as e:
+            print(f"⚠️ Registry unavailable ({e}), workers serve the local model")
+    bundle = manager.current
+    if bundle is None:
+        return None
+    engine_dir = api_config.get('serving', {}).get('engine_dir', "models/engine")
+    return export_shared_engine(engine_dir, bundle.engine, bundle.model_version, bundle.scaler_version, bundle.source)
+
+
+def main():
+    config = read_yaml(Path("configs/config.yaml"))
+    serving_config = config.get('api', {}).get('serving', {})
+
+    parser = argparse.ArgumentParser(description="Multi-worker Diabetes Prediction API")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", serving_config.get('workers', 4))))
+    parser.add_argument("--host", default=serving_config.get('host', "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=serving_config.get('port', 8000))
+    parser.add_argument("--no-shared-engine", action="store_true",
+                        help="Every worker loads its own copy of the model (for comparison)")
+    args = parser.parse_args()
+
+    if not args.no_shared_engine:
+        try:
+            engine_path = prepare_shared_engine(config)
+            if engine_path is not None:
+                os.environ["MODEL_ENGINE_DIR"] = str(engine_path)
+                print(f"🧩 Shared engine exported to {engine_path} (mapped by all workers)")
+        except Exception as e:
+            print(f"⚠️ Shared engine export failed, workers load their own copy: {e}")
+
+    # Workers fix the version when there are several of them (see the module docstring)
+    os.environ["API_SERVING_WORKERS"] = str(args.workers)
+    if args.workers > 1 and config.get('api', {}).get('reload', {}).get('enabled', False):
+        print(f"⚠️ Hot reload and model admin changes are disabled with {args.workers} workers: "
+              "restart to serve a new version")
+
+    print(f"🚀 Starting {args.workers} worker(s) on {args.host}:{args.port}")
+    uvicorn.run("src.api.app:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
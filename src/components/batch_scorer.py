@@ -0,0 +1,212 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.utils.common import DATASET_FORMATS, iter_dataset_chunks, limit_worker_threads, load_object
+
+# Scaler & champion of each pool worker (loaded once per process by _init_worker)
+_WORKER_SCALER = None
+_WORKER_MODEL = None
+
+PREDICTION_COLUMN = "prediction"
+
+
+def _load_artifacts(model_dir):
+    # Memory-mapped: every worker shares the same file pages
+    scaler = load_object(os.path.join(model_dir, "scaler.joblib"), mmap_mode="r")
+    model = load_object(os.path.join(model_dir, "model.joblib"), mmap_mode="r")
+    return scaler, model
+
+
+def _init_worker(model_dir, single_threaded=True):
+    global _WORKER_SCALER, _WORKER_MODEL
+    if single_threaded:
+        limit_worker_threads()
+    _WORKER_SCALER, _WORKER_MODEL = _load_artifacts(model_dir)
+    if single_threaded and "n_jobs" in _WORKER_MODEL.get_params():
+        _WORKER_MODEL.set_params(n_jobs=1)
+
+
+def _score_chunk(X: np.ndarray) -> np.ndarray:
+    """
+    scaler.transform + model.predict on one chunk of raw features (pool worker).
+    """
+    features = pd.DataFrame(X, columns=_WORKER_SCALER.feature_names_in_)
+    return np.asarray(_WORKER_MODEL.predict(_WORKER_SCALER.transform(features)), dtype=np.float64)
+
+
+def file_format(path) -> str:
+    """
+    Dataset format of a file from its extension (.csv, .parquet, .feather, .npy).
+    """
+    suffix = Path(path).suffix
+    for fmt, extension in DATASET_FORMATS.items():
+        if extension == suffix:
+            return fmt
+    raise ValueError(f"Unsupported file type '{suffix}'. Available: {list(DATASET_FORMATS.values())}")
+
+
+class ChunkWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file (one row group per chunk).
+    columns ({name: dtype}) is the schema written when no chunk was: an empty input
+    still gets a header-only CSV or an empty Parquet file.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = Path(path)
+        self.columns = columns or {}
+        self.format = file_format(path)
+        if self.format not in ("csv", "parquet"):
+            raise ValueError(f"Predictions are written as .csv or .parquet, not {self.path.suffix}")
+        self._parquet_writer = None
+        self._header = True
+        os.makedirs(self.path.parent, exist_ok=True)
+        # Written next to the target and renamed on close (never a half-written output)
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp-{os.getpid()}")
+
+    def write(self, df: pd.DataFrame):
+        if self.format == "csv":
+            df.to_csv(self._tmp_path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self._tmp_path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        if self._header and self._parquet_writer is None:
+            # Nothing written: header / schema only
+            self.write(pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in self.columns.items()}))
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class BatchScorer:
+    """
+    Offline bulk scoring of a CSV / Parquet / Feather / .npy file with the champion
+    (models/model.joblib) and the scaler (models/scaler.joblib), without the HTTP layer.
+
+    - The input is read in chunks of chunk_size rows; feature matrices are fanned out
+      to a process pool (each worker loads the artifacts once, memory-mapped).
+    - Results are written in input order: at most max_pending_chunks chunks are in
+      flight, so memory stays bounded whatever the file size.
+    - workers=0 scores in the calling process.
+    - keep_columns: input columns copied next to the prediction (e.g. a patient id).
+
+    Usage:
+        scorer = BatchScorer("models", chunk_size=50000, workers=4)
+        stats = scorer.score_file("population.parquet", "predictions.parquet", keep_columns=["patient_id"])
+    """
+
+    def __init__(self, model_dir="models", chunk_size=50_000, workers=None, max_pending_chunks=None):
+        self.model_dir = str(model_dir)
+        self.chunk_size = chunk_size
+        self.workers = os.cpu_count() if workers is None else workers
+        self.max_pending_chunks = max_pending_chunks or 2 * max(1, self.workers)
+        scaler = load_object(os.path.join(self.model_dir, "scaler.joblib"))
+        self.features = list(scaler.feature_names_in_)
+
+    def _check_columns(self, input_path, fmt, keep_columns):
+        first = next(iter_dataset_chunks(input_path, fmt, chunk_size=1), None)
+        if first is None:
+            return
+        missing = [col for col in self.features + keep_columns if col not in first.columns]
+        if missing:
+            raise ValueError(f"Missing columns in {input_path}: {missing}")
+
+    def score_file(self, input_path, output_path, keep_columns=None) -> dict:
+        """
+        Scores input_path into output_path (.csv or .parquet). Returns
+        {"rows", "chunks", "seconds", "rows_per_second", "output"}.
+        """
+        keep_columns = list(keep_columns or [])
+        fmt = file_format(input_path)
+        self._check_columns(input_path, fmt, keep_columns)
+        columns = self.features + [col for col in keep_columns if col not in self.features]
+
+        start = time.perf_counter()
+        rows = chunks = 0
+        writer = ChunkWriter(output_path, columns={**{col: object for col in keep_columns},
+                                                   PREDICTION_COLUMN: np.float64})
+        pool = None
+        try:
+            if self.workers > 0:
+                pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           initargs=(self.model_dir,))
+                submit = pool.submit
+            else:
+                _init_worker(self.model_dir, single_threaded=False)
+                submit = _InlineFuture.submit
+
+            # (kept columns, future) per chunk in flight, oldest first
+            pending = deque()
+
+            def write_oldest():
+                kept, future = pending.popleft()
+                kept[PREDICTION_COLUMN] = future.result()
+                writer.write(kept)
+                return len(kept)
+
+            for chunk in iter_dataset_chunks(input_path, fmt, chunk_size=self.chunk_size, columns=columns):
+                if not len(chunk):
+                    # Header-only CSV
+                    continue
+                X = chunk[self.features].to_numpy(dtype=np.float64)
+                pending.append((chunk[keep_columns].reset_index(drop=True), submit(_score_chunk, X)))
+                if len(pending) >= self.max_pending_chunks:
+                    rows += write_oldest()
+                    chunks += 1
+            while pending:
+                rows += write_oldest()
+                chunks += 1
+            writer.close()
+        except Exception as e:
+            writer.abort()
+            print(f"❌ Batch scoring error: {e}")
+            raise e
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        seconds = time.perf_counter() - start
+        stats = {
+            "rows": rows,
+            "chunks": chunks,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else 0.0,
+            "output": str(output_path),
+        }
+        print(f"✅ Scored {rows:,} rows in {chunks} chunk(s) with {self.workers} worker(s): "
+              f"{seconds:.2f}s, {stats['rows_per_second']:,.0f} rows/s -> {output_path}")
+        return stats
+
+
+class _InlineFuture:
+    """
+    Already computed result with the Future interface (workers=0).
+    """
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+    @classmethod
+    def submit(cls, fn, *args):
+        return cls(fn(*args))
@@ -2,8 +2,10 @@ import os
 import pandas as pd
 from sklearn.datasets import load_diabetes
 from sklearn.model_selection import train_test_split
-from src.utils.common import read_yaml, create_directories
+from src.utils.common import read_yaml, create_directories, save_dataset
+from src.utils.synthetic_data import fit_synthetic_model, write_synthetic_dataset
 from pathlib import Path
+import time
 
 class DataIngestion:
     def __init__(self, config_path: Path):
@@ -20,8 +22,13 @@ class DataIngestion:
             raw_data_path = Path(self.config['data']['raw_path'])
             create_directories([raw_data_path.parent])
             
-            # 3. Save raw data
-            df.to_csv(raw_data_path, index=False)
+            # 3. Save raw data (format from configs/config.yaml -> storage.format)
+            storage_format = self.config.get('storage', {}).get('format', 'csv')
+            if self.config['data'].get('source', 'sklearn') == "synthetic":
+                # Scale-up dataset sampled from the real one (data.synthetic)
+                raw_data_path = self.generate_synthetic_data(df, raw_data_path, storage_format)
+                return raw_data_path
+            raw_data_path = save_dataset(df, raw_data_path, storage_format)
             print(f"Data saved successfully: {raw_data_path}")
             
             return raw_data_path
@@ -29,6 +36,27 @@ class DataIngestion:
         except Exception as e:
             raise e
 
+    def generate_synthetic_data(self, df: pd.DataFrame, raw_data_path: Path, storage_format: str):
+        """
+        Fits a Gaussian copula on the real dataset (marginals + correlations, target
+        included) and writes data.synthetic.rows sampled rows with a fixed seed.
+        """
+        synthetic_config = self.config['data'].get('synthetic', {})
+        n_rows = int(synthetic_config.get('rows', 1_000_000))
+        start = time.perf_counter()
+        raw_data_path = write_synthetic_dataset(
+            fit_synthetic_model(df),
+            raw_data_path,
+            storage_format,
+            n_rows=n_rows,
+            seed=synthetic_config.get('seed', 42),
+            chunk_size=int(synthetic_config.get('chunk_size', 1_000_000)),
+            workers=synthetic_config.get('workers')
+        )
+        print(f"🧬 Synthetic data saved successfully: {raw_data_path} "
+              f"({n_rows:,} rows from {len(df)} real rows, {time.perf_counter() - start:.2f}s)")
+        return raw_data_path
+
 if __name__ == "__main__":
     # Test running
     ingestion = DataIngestion(Path("configs/config.yaml"))
@@ -1,14 +1,22 @@
 import os
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-import joblib
+import json
 from pathlib import Path
-from src.utils.common import read_yaml
+from src.utils.common import (read_yaml, save_object, save_dataset, load_dataset, load_dataset_array,
+                              iter_dataset_chunks, hash_file)
 
 class DataTransformation:
     def __init__(self, config_path: Path):
         self.config = read_yaml(config_path)
+        # Dataset storage format (csv | parquet | feather | npy)
+        self.storage_format = self.config.get('storage', {}).get('format', 'csv')
+        # Streaming (out-of-core) mode settings
+        transformation_config = self.config.get('transformation', {})
+        self.chunk_size = transformation_config.get('chunk_size', 100000)
+        self.shard_dir = Path(transformation_config.get('shard_dir', "data/processed/shards"))
 
     def get_transformer_object(self):
         # Create scaler to normalize data
@@ -17,7 +25,7 @@ class DataTransformation:
     def initiate_data_transformation(self):
         try:
             # 1. Load data
-            data = pd.read_csv(self.config['data']['raw_path'])
+            data = load_dataset(self.config['data']['raw_path'], self.storage_format)
 
             # 2. Train-Test Split
             train, test = train_test_split(
@@ -39,17 +47,119 @@ class DataTransformation:
 
             # 5. Save scaler (very important for API)
             scaler_path = os.path.join(self.config['artifacts']['model_dir'], "scaler.joblib")
-            joblib.dump(scaler, scaler_path)
+            save_object(scaler_path, scaler)
 
-            # 6. Save transformed data (optional but good for tracking)
-            train_path = os.path.join("data/processed", "train.csv")
-            test_path = os.path.join("data/processed", "test.csv")
-            
-            pd.DataFrame(X_train_scaled, columns=X_train.columns).to_csv(train_path, index=False)
-            pd.DataFrame(X_test_scaled, columns=X_test.columns).to_csv(test_path, index=False)
+            # 6. Save transformed data (target included, so training can restart from here)
+            train_df = pd.DataFrame(X_train_scaled, columns=X_train.columns)
+            train_df[target_col] = y_train.to_numpy()
+            test_df = pd.DataFrame(X_test_scaled, columns=X_test.columns)
+            test_df[target_col] = y_test.to_numpy()
+
+            save_dataset(train_df, os.path.join("data/processed", "train.csv"), self.storage_format)
+            save_dataset(test_df, os.path.join("data/processed", "test.csv"), self.storage_format)
 
             print(f"✅ Data transformation completed. Scaler saved: {scaler_path}")
             return X_train_scaled, X_test_scaled, y_train, y_test
 
         except Exception as e:
-            raise e
\ No newline at end of file
+            raise e
+
+    def load_transformed_data(self):
+        """
+        Loads the scaled train/test splits saved by a previous run (used when this stage is skipped).
+        """
+        try:
+            target_col = 'target'
+            splits = []
+            for name in ("train.csv", "test.csv"):
+                # Zero-copy for the npy format (memory-mapped)
+                data, columns = load_dataset_array(os.path.join("data/processed", name), self.storage_format)
+                target_idx = columns.index(target_col)
+                # Target is saved last, so the features are a view (no copy)
+                if target_idx == len(columns) - 1:
+                    X = data[:, :target_idx]
+                else:
+                    X = np.delete(data, target_idx, axis=1)
+                splits.append((X, pd.Series(data[:, target_idx], name=target_col)))
+
+            (X_train, y_train), (X_test, y_test) = splits
+            return X_train, X_test, y_train, y_test
+
+        except Exception as e:
+            raise e
+
+    def split_mask(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Deterministic per-row train/test split: True = test row.
+        Based on a hash of the row content, so it does not depend on chunking or row order
+        (duplicate rows always land in the same split).
+        """
+        row_hash = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        buckets = row_hash % np.uint64(10000)
+        return buckets < np.uint64(round(self.config['data']['test_size'] * 10000))
+
+    def initiate_streaming_transformation(self):
+        """
+        Out-of-core transformation: two passes over the raw data in chunks.
+        1. scaler.partial_fit on the train rows of each chunk
+        2. scale each chunk and write it as a memory-mappable .npy shard
+        Returns (train_shards, test_shards) paths; scaler.joblib stays API compatible.
+        """
+        try:
+            target_col = 'target'
+            raw_path = self.config['data']['raw_path']
+
+            # 1. Fit scaler incrementally
+            scaler = self.get_transformer_object()
+            n_train = n_test = 0
+            for chunk in iter_dataset_chunks(raw_path, self.storage_format, self.chunk_size):
+                is_test = self.split_mask(chunk)
+                train = chunk[~is_test]
+                if len(train):
+                    scaler.partial_fit(train.drop([target_col], axis=1))
+                n_train += len(train)
+                n_test += int(is_test.sum())
+
+            scaler_path = os.path.join(self.config['artifacts']['model_dir'], "scaler.joblib")
+            save_object(scaler_path, scaler)
+
+            # 2. Scale & write shards
+            os.makedirs(self.shard_dir, exist_ok=True)
+            # Only what this stage writes: the directory may be shared
+            for pattern in ("train_*.npy", "test_*.npy", "index.json"):
+                for old_shard in self.shard_dir.glob(pattern):
+                    old_shard.unlink()
+
+            shards = {"train": [], "test": []}
+            for i, chunk in enumerate(iter_dataset_chunks(raw_path, self.storage_format, self.chunk_size)):
+                is_test = self.split_mask(chunk)
+                for split, rows in (("train", chunk[~is_test]), ("test", chunk[is_test])):
+                    if not len(rows):
+                        continue
+                    scaled = pd.DataFrame(scaler.transform(rows.drop([target_col], axis=1)),
+                                          columns=scaler.feature_names_in_)
+                    scaled[target_col] = rows[target_col].to_numpy()
+                    shard_path = save_dataset(scaled, self.shard_dir / f"{split}_{i:05d}.npy", "npy")
+                    shards[split].append(shard_path.as_posix())
+
+            # Shard index (stage output for the pipeline manifest). Content hashes make it
+            # change whenever the shards or the scaler do, even with the same row counts.
+            hashes = {path: hash_file(path) for path in shards["train"] + shards["test"]}
+            hashes[Path(scaler_path).as_posix()] = hash_file(scaler_path)
+            with open(self.shard_dir / "index.json", "w") as f:
+                json.dump({"rows": {"train": n_train, "test": n_test}, **shards, "hashes": hashes}, f, indent=2)
+
+            print(f"✅ Streaming transformation completed ({n_train} train / {n_test} test rows, "
+                  f"{len(shards['train']) + len(shards['test'])} shards). Scaler saved: {scaler_path}")
+            return shards["train"], shards["test"]
+
+        except Exception as e:
+            raise e
+
+    def load_shard_index(self):
+        """
+        Returns the (train_shards, test_shards) written by a previous streaming run.
+        """
+        with open(self.shard_dir / "index.json") as f:
+            index = json.load(f)
+        return index["train"], index["test"]
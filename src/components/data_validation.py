@@ -1,34 +1,141 @@
+import json
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from src.utils.common import read_yaml
+from src.utils.common import read_yaml, iter_dataset_chunks
+
+class ColumnStats:
+    """
+    Per-column statistics merged chunk by chunk (constant memory, Chan's parallel variance).
+    """
+
+    def __init__(self, name: str, expected_dtype: str, value_range: dict):
+        self.name = name
+        self.expected_dtype = expected_dtype
+        self.value_range = value_range or {}
+        self.dtypes = set()
+        self.count = 0
+        self.nulls = 0
+        self.out_of_range = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, series: pd.Series):
+        self.dtypes.add(str(series.dtype))
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+        is_null = np.isnan(values)
+        self.nulls += int(is_null.sum())
+        values = values[~is_null]
+        if len(values) == 0:
+            return
+
+        if "min" in self.value_range:
+            self.out_of_range += int((values < self.value_range["min"]).sum())
+        if "max" in self.value_range:
+            self.out_of_range += int((values > self.value_range["max"]).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        n_chunk = len(values)
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n_chunk
+        delta = chunk_mean - self.mean
+        self.mean += delta * n_chunk / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n_chunk / total
+        self.count = total
+
+    @property
+    def dtype_ok(self) -> bool:
+        return self.dtypes == {self.expected_dtype}
+
+    def to_dict(self) -> dict:
+        return {
+            "expected_dtype": self.expected_dtype,
+            "dtypes": sorted(self.dtypes),
+            "dtype_ok": self.dtype_ok,
+            "count": self.count,
+            "nulls": self.nulls,
+            "out_of_range": self.out_of_range,
+            "range": self.value_range,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean if self.count else None,
+            "std": float(np.sqrt(self.m2 / self.count)) if self.count else None,
+        }
 
 class DataValidation:
     def __init__(self, config_path: Path, schema_path: Path):
         self.config = read_yaml(config_path)
         self.schema = read_yaml(schema_path)
+        validation_config = self.config.get('validation', {})
+        self.chunk_size = validation_config.get('chunk_size', 100000)
+        self.report_path = Path(validation_config.get('report_path', "artifacts/validation/report.json"))
+        self.status_path = Path(validation_config.get('status_path', "artifacts/validation/status.txt"))
+
+    def validate_in_chunks(self) -> dict:
+        """
+        Streams the raw dataset chunk by chunk and returns a full-table validation report.
+        """
+        storage_format = self.config.get('storage', {}).get('format', 'csv')
+        expected_schema = self.schema['COLUMNS']
+        ranges = self.schema.get('RANGES', {})
+
+        stats = {col: ColumnStats(col, dtype, ranges.get(col)) for col, dtype in expected_schema.items()}
+        unexpected_columns = set()
+        n_rows = 0
+        n_chunks = 0
+
+        for chunk in iter_dataset_chunks(self.config['data']['raw_path'], storage_format, self.chunk_size):
+            n_rows += len(chunk)
+            n_chunks += 1
+            for col in chunk.columns:
+                if col in stats:
+                    stats[col].update(chunk[col])
+                else:
+                    unexpected_columns.add(col)
+
+        errors = []
+        for col in sorted(unexpected_columns):
+            errors.append(f"{col} column not found in expected schema!")
+        for col, col_stats in stats.items():
+            if not col_stats.dtypes:
+                errors.append(f"{col} column is missing from the data!")
+                continue
+            if not col_stats.dtype_ok:
+                errors.append(f"{col} column type is wrong! Expected: {col_stats.expected_dtype}, got: {sorted(col_stats.dtypes)}")
+            if col_stats.nulls:
+                errors.append(f"{col} column has {col_stats.nulls} null values!")
+            if col_stats.out_of_range:
+                errors.append(f"{col} column has {col_stats.out_of_range} values outside {col_stats.value_range}!")
+
+        return {
+            "status": not errors,
+            "rows": n_rows,
+            "chunks": n_chunks,
+            "errors": errors,
+            "columns": {col: col_stats.to_dict() for col, col_stats in stats.items()},
+        }
 
     def validate_all_columns(self) -> bool:
         try:
-            validation_status = None
-            data = pd.read_csv(self.config['data']['raw_path'])
-            all_cols = list(data.columns)
-            expected_schema = self.schema['COLUMNS']
-
-            for col in all_cols:
-                if col not in expected_schema:
-                    validation_status = False
-                    print(f"Error: {col} column not found in expected schema!")
-                elif data[col].dtype != expected_schema[col]:
-                    validation_status = False
-                    print(f"Error: {col} column type is wrong! Expected: {expected_schema[col]}")
-                else:
-                    validation_status = True
-            
-            # Write status to a file (for pipeline tracking)
-            with open("status.txt", "w") as f:
-                f.write(f"Validation status: {validation_status}")
+            report = self.validate_in_chunks()
+            for error in report['errors']:
+                print(f"Error: {error}")
+
+            # Write report & status to files (for pipeline tracking)
+            os.makedirs(self.report_path.parent, exist_ok=True)
+            with open(self.report_path, "w") as f:
+                json.dump(report, f, indent=2)
+            os.makedirs(self.status_path.parent, exist_ok=True)
+            with open(self.status_path, "w") as f:
+                f.write(f"Validation status: {report['status']}")
 
-            return validation_status
+            print(f"📋 Validation report ({report['rows']} rows, {report['chunks']} chunks): {self.report_path}")
+            return report['status']
 
         except Exception as e:
-            raise e
\ No newline at end of file
+            raise e
@@ -0,0 +1,456 @@
+import hashlib
+import json
+import math
+import os
+import resource
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import ElasticNet, SGDRegressor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from xgboost import XGBRegressor
+
+from src.utils.common import limit_worker_threads
+
+# Model families that can be referenced by name in configs/config.yaml (training.models)
+MODEL_REGISTRY = {
+    "ElasticNet": ElasticNet,
+    "RandomForest": RandomForestRegressor,
+    "GradientBoosting": GradientBoostingRegressor,
+    "XGBoost": XGBRegressor,
+    # Incremental learner (partial_fit) for the out-of-core training path
+    "SGDRegressor": SGDRegressor,
+}
+
+# Training data shared with pool workers (set once per worker by _init_worker)
+_WORKER_X = None
+_WORKER_Y = None
+
+
+def get_estimator(model_name: str):
+    """
+    Creates an unfitted estimator for a model family name from the registry.
+    """
+    if model_name not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown model '{model_name}'. Available: {list(MODEL_REGISTRY)}")
+    return MODEL_REGISTRY[model_name]()
+
+
+def hash_data(X, y) -> str:
+    """
+    Content hash of the training data (used as part of every cache key).
+    """
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(np.asarray(array, dtype=np.float64))
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _init_worker(X, y):
+    global _WORKER_X, _WORKER_Y
+    _WORKER_X, _WORKER_Y = X, y
+    limit_worker_threads()
+
+
+def _subsample_indices(n_total: int, n_samples: int, random_state: int) -> np.ndarray:
+    if n_samples >= n_total:
+        return np.arange(n_total)
+    return np.random.RandomState(random_state).permutation(n_total)[:n_samples]
+
+
+def _single_threaded(estimator, params):
+    model = clone(estimator).set_params(**params)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+    return model
+
+
+def _fit_and_score(estimator, params, fold, cv, n_samples, random_state):
+    """
+    Fits one (candidate, fold) on a pool worker.
+    Returns (R2 score, CPU seconds, wall seconds, worker peak RSS in MB).
+    """
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    rows = _subsample_indices(len(_WORKER_X), n_samples, random_state)
+    X, y = _WORKER_X[rows], _WORKER_Y[rows]
+    train_idx, test_idx = list(KFold(n_splits=cv).split(X))[fold]
+
+    model = _single_threaded(estimator, params)
+    model.fit(X[train_idx], y[train_idx])
+    score = r2_score(y[test_idx], model.predict(X[test_idx]))
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return score, time.process_time() - cpu_start, time.perf_counter() - wall_start, peak_rss_mb
+
+
+def _refit(estimator, params):
+    """
+    Fits the best candidate of a family on all training rows (pool worker).
+    """
+    model = _single_threaded(estimator, params).fit(_WORKER_X, _WORKER_Y)
+    # Served with the family's own threading default, not the pool's single thread
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=estimator.get_params()["n_jobs"])
+    return model
+
+
+class ScoreCache:
+    """
+    Content-addressed on-disk cache: (data hash, estimator, params, fold) -> CV score.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)["score"]
+
+    def set(self, key: str, score: float):
+        path = self._path(key)
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"score": score}, f)
+        os.replace(tmp_path, path)
+
+
+class HyperparameterSearch:
+    """
+    Cross-validated hyperparameter search over one shared process pool.
+
+    Strategies (training.search.strategy in configs/config.yaml):
+    - grid:    every combination of the parameter space
+    - random:  n_iter sampled combinations
+    - halving: successive halving, growing the number of samples each round
+               and keeping the best 1/factor candidates
+
+    Fold scores are cached on disk, so re-runs on unchanged data only fit new folds.
+
+    Usage:
+        with HyperparameterSearch(search_config, X_train, y_train) as search:
+            result = search.search("ElasticNet", ElasticNet(), {"alpha": [0.1, 1.0]})
+    """
+
+    def __init__(self, search_config: dict, X, y):
+        self.strategy = search_config.get("strategy", "grid")
+        self.cv = search_config.get("cv_folds", 5)
+        self.n_iter = search_config.get("n_iter", 10)
+        self.factor = search_config.get("halving_factor", 3)
+        self.random_state = search_config.get("random_state", 42)
+        n_jobs = search_config.get("n_jobs", -1)
+        self.n_workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+        self.cache = ScoreCache(search_config.get("cache_dir", "artifacts/search_cache"))
+
+        self.X = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+        self.y = np.ascontiguousarray(np.asarray(y, dtype=np.float64))
+        self.data_hash = hash_data(self.X, self.y)
+        self.pool = None
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.n_workers, initializer=_init_worker, initargs=(self.X, self.y)
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.shutdown(wait=True)
+        self.pool = None
+
+    # --- Candidates ---
+    def _candidates(self, param_space: dict) -> list:
+        if self.strategy == "random":
+            return list(ParameterSampler(param_space, n_iter=self.n_iter, random_state=self.random_state))
+        if self.strategy in ("grid", "halving"):
+            return list(ParameterGrid(param_space))
+        raise ValueError(f"Unknown search strategy '{self.strategy}' (use grid, random or halving)")
+
+    def _cache_key(self, estimator, params: dict, fold: int, n_samples: int) -> str:
+        base_params = {k: v for k, v in estimator.get_params().items() if k not in ("n_jobs", "verbose", "verbosity")}
+        payload = json.dumps({
+            "data": self.data_hash,
+            "estimator": f"{type(estimator).__module__}.{type(estimator).__name__}",
+            "base_params": repr(sorted(base_params.items())),
+            "params": repr(sorted(params.items())),
+            "fold": fold,
+            "cv": self.cv,
+            "n_samples": n_samples,
+            "random_state": self.random_state,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # --- Evaluation ---
+    def _evaluate(self, estimator, candidates: list, n_samples: int, stats: dict) -> np.ndarray:
+        """
+        Returns a (candidates x folds) score matrix, fitting only the folds not in the cache.
+        """
+        scores = np.empty((len(candidates), self.cv))
+        pending = {}
+        for i, params in enumerate(candidates):
+            for fold in range(self.cv):
+                key = self._cache_key(estimator, params, fold, n_samples)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    scores[i, fold] = cached
+                    stats["hits"] += 1
+                else:
+                    future = self.pool.submit(
+                        _fit_and_score, estimator, params, fold, self.cv, n_samples, self.random_state
+                    )
+                    pending[(i, fold)] = (key, future)
+                    stats["misses"] += 1
+
+        for (i, fold), (key, future) in pending.items():
+            scores[i, fold] = future.result()[0]
+            self.cache.set(key, float(scores[i, fold]))
+        return scores
+
+    def search(self, model_name: str, estimator, param_space: dict) -> dict:
+        """
+        Runs the configured search strategy for one model family and refits the best candidate.
+        """
+        start = time.perf_counter()
+        stats = {"hits": 0, "misses": 0}
+        n_total = len(self.X)
+        candidates = self._candidates(param_space)
+        cv_results = []
+
+        if self.strategy == "halving" and len(candidates) > 1:
+            # Rounds needed to shrink the candidate list down to one
+            n_rounds, remaining = 1, len(candidates)
+            while remaining > 1:
+                remaining = math.ceil(remaining / self.factor)
+                n_rounds += 1
+            min_samples = max(self.cv * 10, n_total // self.factor ** (n_rounds - 1))
+            for round_idx in range(n_rounds):
+                last_round = round_idx == n_rounds - 1 or len(candidates) == 1
+                n_samples = n_total if last_round else min(n_total, min_samples * self.factor ** round_idx)
+                scores = self._evaluate(estimator, candidates, n_samples, stats)
+                cv_results.extend(self._rows(candidates, scores, round_idx, n_samples))
+                if last_round:
+                    break
+                keep = max(1, math.ceil(len(candidates) / self.factor))
+                candidates = [candidates[i] for i in np.argsort(-scores.mean(axis=1), kind="stable")[:keep]]
+        else:
+            scores = self._evaluate(estimator, candidates, n_total, stats)
+            cv_results.extend(self._rows(candidates, scores, 0, n_total))
+
+        # Best candidate of the final (full data) round, refit on all training data
+        mean_scores = scores.mean(axis=1)
+        best_idx = int(np.argmax(mean_scores))
+        best_params = candidates[best_idx]
+        best_estimator = clone(estimator).set_params(**best_params).fit(self.X, self.y)
+
+        total = stats["hits"] + stats["misses"]
+        result = {
+            "best_params": best_params,
+            "best_score": float(mean_scores[best_idx]),
+            "best_estimator": best_estimator,
+            "cv_results": cv_results,
+            "wall_time": time.perf_counter() - start,
+            "cache_hits": stats["hits"],
+            "cache_misses": stats["misses"],
+            "cache_hit_rate": stats["hits"] / total if total else 0.0,
+        }
+        print(f"   ⏱️ {model_name}: {result['wall_time']:.2f}s | {total} fold fits ({self.strategy}) "
+              f"| cache hit rate {result['cache_hit_rate']:.0%} ({stats['hits']}/{total})")
+        return result
+
+    # --- Concurrent families ---
+    def search_families(self, families: dict, min_folds: int = 2, abort_margin: float = 0.05,
+                        time_budget: float = None) -> dict:
+        """
+        Tunes several model families at once on the shared pool (the pool size is the
+        global CPU budget). families: {name: (estimator, param_space)}.
+
+        Candidates are submitted candidate by candidate, round-robin across families,
+        so cheap families complete candidates early and set the champion CV R2.
+        A candidate with at least `min_folds` folds whose partial mean + `abort_margin`
+        is below the champion's mean on the same folds is pruned: its remaining folds are skipped. A family whose
+        candidates are all pruned is "aborted" and is not refit. One still running after
+        `time_budget` seconds is "timed_out": its best fully evaluated candidate (if any) is refit.
+
+        Returns {name: result} like search(), with "status" and "resources" added
+        ("best_estimator" is None when the family was not refit).
+        """
+        if self.strategy == "halving":
+            # Successive halving rounds depend on each other: families run one after another
+            return {name: dict(self.search(name, estimator, space), status="completed")
+                    for name, (estimator, space) in families.items()}
+
+        start = time.perf_counter()
+        states = {}
+        for name, (estimator, param_space) in families.items():
+            candidates = self._candidates(param_space)
+            states[name] = {
+                "estimator": estimator,
+                "candidates": candidates,
+                "scores": np.full((len(candidates), self.cv), np.nan),
+                "pruned": np.zeros(len(candidates), dtype=bool),
+                "queued": 0,
+                "in_flight": 0,
+                "status": "running",
+                "wall_time": 0.0,
+                "resources": {"fits": 0, "cached_fits": 0, "cancelled_fits": 0, "pruned_candidates": 0,
+                              "cpu_seconds": 0.0, "fit_seconds": 0.0, "peak_rss_mb": 0.0},
+            }
+
+        # Candidate by candidate, round-robin across families. Folds are handed to the pool
+        # only when a worker is free, so pruned candidates never reach it.
+        queue = deque()
+        for i in range(max(len(state["candidates"]) for state in states.values())):
+            for name, state in states.items():
+                if i >= len(state["candidates"]):
+                    continue
+                for fold in range(self.cv):
+                    key = self._cache_key(state["estimator"], state["candidates"][i], fold, len(self.X))
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        state["scores"][i, fold] = cached
+                        state["resources"]["cached_fits"] += 1
+                    else:
+                        queue.append((name, i, fold, key))
+                        state["queued"] += 1
+
+        def complete_means(state):
+            # Mean CV score of candidates with every fold, -inf for the others
+            means = state["scores"].mean(axis=1)
+            return np.where(np.isnan(means), -np.inf, means)
+
+        in_flight = {}
+        while True:
+            # Champion: best fully evaluated candidate of any family (fold scores)
+            champion = None
+            for state in states.values():
+                means = complete_means(state)
+                best_idx = int(np.argmax(means))
+                if np.isfinite(means[best_idx]) and (champion is None or means[best_idx] > champion.mean()):
+                    champion = state["scores"][best_idx]
+            elapsed = time.perf_counter() - start
+
+            for state in states.values():
+                if state["status"] != "running":
+                    continue
+                n_done = (~np.isnan(state["scores"])).sum(axis=1)
+                for i in np.flatnonzero(~state["pruned"] & (n_done >= min_folds) & (n_done < self.cv)):
+                    # Compared on the same folds: fold difficulty varies more than candidates do
+                    done = ~np.isnan(state["scores"][i])
+                    if champion is not None and state["scores"][i, done].mean() + abort_margin < champion[done].mean():
+                        state["pruned"][i] = True
+                        state["resources"]["pruned_candidates"] += 1
+                if time_budget is not None and elapsed > time_budget:
+                    state["status"] = "timed_out"
+                    state["wall_time"] = elapsed
+
+            # One extra task keeps the workers busy while results are processed
+            while queue and len(in_flight) <= self.n_workers:
+                name, i, fold, key = queue.popleft()
+                state = states[name]
+                state["queued"] -= 1
+                if state["status"] != "running" or state["pruned"][i]:
+                    state["resources"]["cancelled_fits"] += 1
+                    continue
+                future = self.pool.submit(_fit_and_score, state["estimator"], state["candidates"][i],
+                                          fold, self.cv, len(self.X), self.random_state)
+                in_flight[future] = (name, i, fold, key)
+                state["in_flight"] += 1
+
+            for state in states.values():
+                if state["status"] == "running" and state["queued"] == 0 and state["in_flight"] == 0:
+                    state["status"] = "aborted" if state["pruned"].all() else "completed"
+                    state["wall_time"] = elapsed
+
+            if not in_flight:
+                break
+            done, _ = wait(list(in_flight), timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, i, fold, key = in_flight.pop(future)
+                state = states[name]
+                state["in_flight"] -= 1
+                score, cpu_seconds, fit_seconds, peak_rss_mb = future.result()
+                self.cache.set(key, float(score))
+                resources = state["resources"]
+                resources["fits"] += 1
+                resources["cpu_seconds"] += cpu_seconds
+                resources["fit_seconds"] += fit_seconds
+                resources["peak_rss_mb"] = max(resources["peak_rss_mb"], peak_rss_mb)
+                # A fold still running when its family timed out fills the cache, not the results
+                if state["status"] != "timed_out":
+                    state["scores"][i, fold] = score
+
+        # Refit the best fully evaluated candidate of every completed or timed-out family, in parallel on the pool
+        results, refits = {}, {}
+        for name, state in states.items():
+            means = complete_means(state)
+            best_idx = int(np.argmax(means))
+            has_best = np.isfinite(means[best_idx])
+            if has_best and state["status"] in ("completed", "timed_out"):
+                refits[name] = self.pool.submit(_refit, state["estimator"], state["candidates"][best_idx])
+            total = state["resources"]["fits"] + state["resources"]["cached_fits"]
+            results[name] = {
+                "status": state["status"],
+                "best_params": state["candidates"][best_idx] if has_best else None,
+                "best_score": float(means[best_idx]) if has_best else None,
+                "best_estimator": None,
+                "cv_results": self._partial_rows(state["candidates"], state["scores"], state["pruned"]),
+                "wall_time": state["wall_time"],
+                "resources": state["resources"],
+                "cache_hits": state["resources"]["cached_fits"],
+                "cache_misses": state["resources"]["fits"],
+                "cache_hit_rate": state["resources"]["cached_fits"] / total if total else 0.0,
+            }
+        for name, future in refits.items():
+            results[name]["best_estimator"] = future.result()
+
+        self._print_resources(results, time.perf_counter() - start)
+        return results
+
+    def _print_resources(self, results: dict, wall_time: float):
+        print(f"   ⏱️ {len(results)} families on {self.n_workers} worker(s) in {wall_time:.2f}s")
+        print(f"   {'family':<14}{'status':<11}{'wall s':>8}{'cpu s':>8}{'fits':>6}{'cached':>8}"
+              f"{'cancelled':>11}{'pruned':>8}{'peak MB':>9}")
+        for name, result in results.items():
+            r = result["resources"]
+            print(f"   {name:<14}{result['status']:<11}{result['wall_time']:>8.2f}{r['cpu_seconds']:>8.2f}"
+                  f"{r['fits']:>6}{r['cached_fits']:>8}{r['cancelled_fits']:>11}{r['pruned_candidates']:>8}"
+                  f"{r['peak_rss_mb']:>9.0f}")
+
+    def _partial_rows(self, candidates, scores, pruned) -> list:
+        """
+        cv_results rows with only the folds that were evaluated.
+        """
+        rows = []
+        for params, fold_scores, is_pruned in zip(candidates, scores, pruned):
+            done = ~np.isnan(fold_scores)
+            row = {"params": params, "iter": 0, "n_samples": len(self.X), "n_folds": int(done.sum()),
+                   "pruned": bool(is_pruned)}
+            if done.any():
+                row["mean_test_score"] = float(fold_scores[done].mean())
+                row["std_test_score"] = float(fold_scores[done].std())
+            for fold in np.flatnonzero(done):
+                row[f"split{fold}_test_score"] = float(fold_scores[fold])
+            rows.append(row)
+        return rows
+
+    def _rows(self, candidates, scores, round_idx, n_samples) -> list:
+        rows = []
+        for params, fold_scores in zip(candidates, scores):
+            row = {"params": params, "iter": round_idx, "n_samples": n_samples,
+                   "mean_test_score": float(fold_scores.mean()), "std_test_score": float(fold_scores.std())}
+            for fold, score in enumerate(fold_scores):
+                row[f"split{fold}_test_score"] = float(score)
+            rows.append(row)
+        return rows
@@ -0,0 +1,56 @@
+import os
+import time
+from pathlib import Path
+from src.utils.common import read_yaml, load_object, hash_file
+from src.utils.onnx_export import convert_to_onnx, check_parity, save_onnx
+
+class ModelExporter:
+    """
+    Converts the champion (models/model.joblib) and the scaler into one ONNX graph
+    (models/model.onnx) served by onnxruntime when api.backend is "onnx".
+    The graph records the versions of the joblib files it came from, so the API
+    never serves a stale export.
+    """
+
+    def __init__(self, config_path):
+        self.config = read_yaml(Path(config_path))
+        self.export_config = self.config.get('export', {})
+        self.model_dir = self.config['artifacts']['model_dir']
+        self.onnx_path = self.export_config.get('onnx_path', os.path.join(self.model_dir, "model.onnx"))
+
+    def initiate_model_export(self):
+        try:
+            model_path = os.path.join("models", "model.joblib")
+            scaler_path = os.path.join(self.model_dir, "scaler.joblib")
+            model = load_object(model_path)
+            scaler = load_object(scaler_path)
+
+            try:
+                start = time.perf_counter()
+                onnx_model = convert_to_onnx(
+                    model,
+                    scaler,
+                    metadata={
+                        # Same versions as the API's local bundle (src/api/artifacts.py)
+                        "model_version": f"local-{hash_file(model_path)[:12]}",
+                        "scaler_version": hash_file(scaler_path)[:12],
+                    },
+                    target_opset=self.export_config.get('target_opset', 17)
+                )
+            except ImportError as e:
+                print(f"⚠️ ONNX export skipped, converter not installed ({e.name}): the API serves the joblib model")
+                return None
+
+            max_diff = check_parity(
+                onnx_model, model, scaler,
+                n_rows=self.export_config.get('parity_rows', 1000),
+                rtol=self.export_config.get('parity_rtol', 1e-4)
+            )
+            save_onnx(onnx_model, self.onnx_path)
+            print(f"✅ ONNX model saved as: {self.onnx_path} ({type(model).__name__}, "
+                  f"max |diff| vs joblib {max_diff:.2e}, {time.perf_counter() - start:.2f}s)")
+            return self.onnx_path
+
+        except Exception as e:
+            print(f"❌ Model export error: {e}")
+            raise e
@@ -1,20 +1,20 @@
 import pandas as pd
 import os
-import mlflow
-import mlflow.sklearn
-from src.utils.common import read_yaml, save_object
-from sklearn.linear_model import ElasticNet
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import GridSearchCV
-from xgboost import XGBRegressor
+from src.utils.common import read_yaml, save_object, load_object, load_dataset_array
+from src.utils.drift import build_reference, save_reference
+from src.components.hyperparameter_search import HyperparameterSearch, get_estimator
+from src.components.tracking import ExperimentTracker
+from src.utils.profiling import Profiler, log_profile
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import numpy as np
 import joblib
 from pathlib import Path
 
 class ModelTrainer:
-    def __init__(self, config_path):
+    def __init__(self, config_path, profiler=None):
         self.config = read_yaml(Path(config_path))
+        # Profiled sections (search, MLflow drain) when profiling is enabled
+        self.profiler = profiler or Profiler.from_config(self.config)
 
     def eval_metrics(self, actual, pred):
         rmse = np.sqrt(mean_squared_error(actual, pred))
@@ -22,105 +22,228 @@ class ModelTrainer:
         r2 = r2_score(actual, pred)
         return rmse, mae, r2
 
+    def log_cv_results(self, run, cv_results):
+        """
+        Every candidate (step) and CV fold of the search, plus the candidates' params as JSON.
+        """
+        for step, row in enumerate(cv_results):
+            # Candidates aborted before their first fold have no score
+            if "mean_test_score" not in row:
+                continue
+            fold_scores = {key.replace("split", "cv_fold").replace("_test_score", "_r2"): value
+                           for key, value in row.items() if key.startswith("split")}
+            run.log_metrics({"cv_mean_r2": row["mean_test_score"], "cv_std_r2": row["std_test_score"],
+                             **fold_scores}, step=step)
+        run.log_dict({"cv_results": cv_results}, "cv_results.json")
+
+    def save_drift_reference(self, X_train, model, run):
+        """
+        Reference statistics for the API drift monitor: training features on the raw
+        (request) scale and the model's predictions. Saved next to the model and logged to MLflow.
+        """
+        monitoring_config = self.config.get('monitoring', {})
+        reference_path = monitoring_config.get('reference_path', os.path.join("models", "drift_reference.json"))
+        scaler = load_object(os.path.join(self.config['artifacts']['model_dir'], "scaler.joblib"))
+        X_raw = scaler.inverse_transform(X_train)
+        reference = build_reference(
+            X_raw,
+            list(scaler.feature_names_in_),
+            predictions=model.predict(X_train),
+            n_bins=monitoring_config.get('n_bins', 10)
+        )
+        save_reference(reference, reference_path)
+        run.log_artifact(reference_path, "monitoring")
+        print(f"📐 Drift reference saved as: {reference_path}")
+
     def initiate_model_trainer(self, X_train, X_test, y_train, y_test):
         try:
             print("🚀 Model training and Optimization is starting...")
             
-            # 1. Models and Hyperparameters
-            models = {
-                "ElasticNet": {
-                    "model": ElasticNet(),
-                    "params": {
-                        "alpha": [0.1, 0.5, 1.0],
-                        "l1_ratio": [0.1, 0.5, 0.9]
-                    }
-                },
-                "RandomForest": {
-                    "model": RandomForestRegressor(),
-                    "params": {
-                        "n_estimators": [50, 100],
-                        "max_depth": [5, 10, None]
-                    }
-                },
-                "XGBoost": {
-                    "model": XGBRegressor(),
-                    "params": {
-                        "n_estimators": [50, 100],
-                        "learning_rate": [0.01, 0.1],
-                        "max_depth": [3, 5]
-                    }
-                }
-            }
+            # 1. Models and Hyperparameters (configs/config.yaml -> training)
+            training_config = self.config['training']
+            models = training_config['models']
 
             best_model_name = ""
             best_model_score = -1 # R2 score for (best)
             best_model_obj = None
             best_params = None
+            best_rmse = None
+
+            # 2. Tune every model family (one shared process pool + fold score cache)
+            # Tracking is buffered & flushed by a background thread (src/components/tracking.py)
+            scheduler_config = training_config.get('scheduler', {})
+            families = {name: (get_estimator(name), info['params']) for name, info in models.items()}
+            # Profile reports: the whole search (pool shutdown included, so its workers'
+            # CPU is counted) and, when families run one after another, each family
+            family_profiles = {}
+            with ExperimentTracker(self.config) as tracker:
+                with self.profiler.profile("search") as search_profile, \
+                        HyperparameterSearch(training_config['search'], X_train, y_train) as search:
+                    if scheduler_config.get('parallel_families', True):
+                        # Families share the pool, losing candidates are aborted early
+                        print(f"🥊 {', '.join(families)} training concurrently...")
+                        results = search.search_families(
+                            families,
+                            min_folds=scheduler_config.get('min_folds', 2),
+                            abort_margin=scheduler_config.get('abort_margin', 0.05),
+                            time_budget=scheduler_config.get('family_time_budget_seconds')
+                        )
+                    else:
+                        results = {}
+                        for model_name, (estimator, param_space) in families.items():
+                            print(f"🥊 {model_name} training...")
+                            with self.profiler.profile(f"search_{model_name}") as family_profiles[model_name]:
+                                results[model_name] = dict(search.search(model_name, estimator, param_space),
+                                                           status="completed")
+
+                for model_name, result in results.items():
+                    with tracker.start_run(f"Tuning_{model_name}") as run:
+                        run.log_param("search_status", result['status'])
+                        run.log_metrics({"search_wall_time": result['wall_time'],
+                                         "cache_hit_rate": result['cache_hit_rate']})
+                        run.log_metrics({f"search_{key}": value for key, value in result.get('resources', {}).items()})
+                        self.log_cv_results(run, result['cv_results'])
+                        log_profile(run, family_profiles.get(model_name))
+
+                        # Aborted families (and timed-out ones without a fully evaluated candidate) are not refit
+                        if result['best_estimator'] is None:
+                            print(f"   ⛔ {model_name} -> {result['status']}, skipped")
+                            continue
+
+                        # Get the best version of the model
+                        current_best_model = result['best_estimator']
+                        current_best_params = result['best_params']
+
+                        # Test data prediction
+                        predicted = current_best_model.predict(X_test)
+                        (rmse, mae, r2) = self.eval_metrics(y_test, predicted)
+
+                        print(f"   ✅ {model_name} -> R2: {r2:.4f}, RMSE: {rmse:.4f}")
 
-            mlflow.set_experiment(self.config['mlflow']['experiment_name'])
-
-            # 2. Loop: Try each model
-            for model_name, model_info in models.items():
-                print(f"🥊 {model_name} training...")   
-                
-                with mlflow.start_run(run_name=f"Tuning_{model_name}", nested=True):
-                    # GridSearchCV ile Cross-Validation (5-Fold)
-                    grid_search = GridSearchCV(
-                        estimator=model_info['model'],
-                        param_grid=model_info['params'],
-                        cv=5,            # 5 Fold Cross Validation
-                        n_jobs=-1,       # Use all processors
-                        scoring='r2',    # Success criterion R2 Score
-                        verbose=1
+                        # Log to MLflow (Save each attempt, with every candidate & CV fold)
+                        run.log_params(current_best_params)
+                        run.log_metrics({"rmse": rmse, "r2": r2, "cv_r2": result['best_score']})
+                        run.log_model(current_best_model, model_name)
+
+                        # Update Champion
+                        if r2 > best_model_score:
+                            best_model_score = r2
+                            best_model_name = model_name
+                            best_model_obj = current_best_model
+                            best_params = current_best_params
+                            best_rmse = rmse
+
+                if best_model_obj is None:
+                    raise ValueError("No model family produced a champion (every family was aborted or timed out "
+                                     "before a candidate was fully evaluated): raise "
+                                     "training.scheduler.family_time_budget_seconds or abort_margin")
+
+                print(f"🏆 Champion Model: {best_model_name} (R2: {best_model_score:.4f})")
+
+                # 3. Save the best model
+                with tracker.start_run("Best_Model_Production") as run:
+                    run.log_param("best_model", best_model_name)
+                    run.log_params(best_params)
+                    run.log_metrics({"rmse": best_rmse, "r2": best_model_score}) # Champion's score
+                    log_profile(run, search_profile, prefix="search")
+
+                    run.log_model(
+                        best_model_obj,
+                        "model",
+                        registered_model_name=self.config['mlflow']['model_name']
                     )
-                    
-                    grid_search.fit(X_train, y_train)
-                    
-                    # Get the best version of the model
-                    current_best_model = grid_search.best_estimator_
-                    current_best_params = grid_search.best_params_
-                    
-                    # Test data prediction
-                    predicted = current_best_model.predict(X_test)
-                    (rmse, mae, r2) = self.eval_metrics(y_test, predicted)
-                    
-                    print(f"   ✅ {model_name} -> R2: {r2:.4f}, RMSE: {rmse:.4f}")
-                    
-                    # Log to MLflow (Save each attempt)
-                    mlflow.log_params(current_best_params)
-                    mlflow.log_metric("rmse", rmse)
-                    mlflow.log_metric("r2", r2)
-                    mlflow.sklearn.log_model(current_best_model, model_name)
-
-                    # Update Champion
-                    if r2 > best_model_score:
-                        best_model_score = r2
-                        best_model_name = model_name
-                        best_model_obj = current_best_model
-                        best_params = current_best_params
-
-            print(f"🏆 Champion Model: {best_model_name} (R2: {best_model_score:.4f})")
-            
-            # 3. Save the best model   
-            with mlflow.start_run(run_name="Best_Model_Production"):
-                mlflow.log_param("best_model", best_model_name)
-                mlflow.log_params(best_params)
-                mlflow.log_metric("rmse", rmse) # Champion's score
-                mlflow.log_metric("r2", best_model_score)
-                
-                mlflow.sklearn.log_model(
-                    best_model_obj, 
+
+                    save_object(
+                        file_path=os.path.join("models", "model.joblib"),
+                        obj=best_model_obj
+                    )
+
+                    print(f"✅ Model saved as: models/model.joblib")
+
+                    self.save_drift_reference(np.asarray(X_train), best_model_obj, run)
+
+                # Serialization + upload of the logged models (mlflow.sklearn) ends here
+                with self.profiler.profile("mlflow_drain"):
+                    tracker.close()
+
+        except Exception as e:
+            print(f"❌ Model training error: {e}")
+            raise e
+
+    def _iter_shards(self, shard_paths):
+        """
+        Yields (X, y) per .npy shard, memory-mapped (target is the last column).
+        """
+        for shard_path in shard_paths:
+            data, _ = load_dataset_array(shard_path, "npy")
+            yield data[:, :-1], data[:, -1]
+
+    def initiate_incremental_trainer(self, train_shards, test_shards):
+        """
+        Out-of-core training: an incremental learner (partial_fit) streams the scaled
+        shards for a few epochs, then is evaluated shard by shard.
+        """
+        try:
+            incremental_config = self.config['training']['incremental']
+            model_name = incremental_config['model']
+            params = incremental_config.get('params', {})
+            epochs = incremental_config.get('epochs', 5)
+            print(f"🚀 Incremental training ({model_name}, {epochs} epochs, {len(train_shards)} shards)...")
+
+            model = get_estimator(model_name).set_params(**params)
+            rng = np.random.RandomState(params.get('random_state', 42))
+            with self.profiler.profile("incremental_fit") as fit_profile:
+                for epoch in range(epochs):
+                    # Shuffle shard order every epoch (SGD converges better on shuffled data)
+                    for shard_idx in rng.permutation(len(train_shards)):
+                        for X, y in self._iter_shards([train_shards[shard_idx]]):
+                            model.partial_fit(X, y)
+
+            # Streaming evaluation: accumulate sums, never hold the test set in memory
+            n, sse, sae, sum_y, sum_y2 = 0, 0.0, 0.0, 0.0, 0.0
+            for X, y in self._iter_shards(test_shards):
+                errors = y - model.predict(X)
+                n += len(y)
+                sse += float(errors @ errors)
+                sae += float(np.abs(errors).sum())
+                sum_y += float(y.sum())
+                sum_y2 += float(y @ y)
+            if n == 0:
+                raise ValueError(f"No test rows in the {len(test_shards)} test shards: "
+                                 "check data.test_size and the raw data, then rerun the transformation")
+            rmse = np.sqrt(sse / n)
+            mae = sae / n
+            r2 = 1 - sse / (sum_y2 - sum_y ** 2 / n)
+            print(f"   ✅ {model_name} -> R2: {r2:.4f}, RMSE: {rmse:.4f}")
+
+            with ExperimentTracker(self.config) as tracker, tracker.start_run("Best_Model_Production") as run:
+                run.log_params({"best_model": model_name, "training_mode": "incremental", "epochs": epochs, **params})
+                run.log_metrics({"rmse": rmse, "mae": mae, "r2": r2})
+                log_profile(run, fit_profile)
+
+                run.log_model(
+                    model,
                     "model",
                     registered_model_name=self.config['mlflow']['model_name']
                 )
 
                 save_object(
                     file_path=os.path.join("models", "model.joblib"),
-                    obj=best_model_obj
+                    obj=model
                 )
-                
+
                 print(f"✅ Model saved as: models/model.joblib")
 
+                self.save_drift_reference(self._sample_shards(train_shards), model, run)
+
         except Exception as e:
             print(f"❌ Model training error: {e}")
-            raise e
\ No newline at end of file
+            raise e
+
+    def _sample_shards(self, shard_paths, max_rows=100000):
+        """
+        Evenly strided rows of every shard (at most ~max_rows in total) for the drift reference.
+        """
+        n_rows = sum(len(load_dataset_array(path, "npy")[0]) for path in shard_paths)
+        step = max(1, n_rows // max_rows)
+        return np.concatenate([X[::step] for X, _ in self._iter_shards(shard_paths)])
@@ -0,0 +1,411 @@
+"""
+Buffered, non-blocking MLflow tracking for the training pipeline.
+
+The training thread only appends params / metrics / artifacts to in-memory
+buffers. A background thread creates the runs and flushes the buffers with
+`log_batch`; model artifacts are serialized and uploaded by a small thread
+pool. When the tracking server is unreachable, everything is written to a
+local file store instead (tracking.offline_dir) and uploaded to the server
+by `sync_offline_runs` at the start of a later training run.
+
+Usage:
+    with ExperimentTracker(config) as tracker:
+        with tracker.start_run("Tuning_ElasticNet") as run:
+            run.log_params({"alpha": 0.1})
+            run.log_metric("r2", 0.45)
+            run.log_model(model, "ElasticNet")
+
+Sync manually:
+    python -m src.components.tracking --sync
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.common import read_yaml
+
+# MLflow log_batch limits per request
+MAX_PARAMS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+
+# Tags of offline runs (model registration is replayed by the sync)
+SYNCED_TAG = "offline.synced_run_id"
+REGISTER_TAG = "offline.registered_model"
+
+
+def _configure_http(tracking_config: dict):
+    # Bounded requests: an unreachable server fails fast instead of retrying for minutes
+    os.environ["MLFLOW_HTTP_REQUEST_TIMEOUT"] = str(tracking_config.get('request_timeout_seconds', 10))
+    os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"] = str(tracking_config.get('max_retries', 0))
+
+
+def _offline_uri(offline_dir) -> str:
+    return Path(offline_dir).resolve().as_uri()
+
+
+def _get_experiment_id(client, experiment_name: str) -> str:
+    experiment = client.get_experiment_by_name(experiment_name)
+    if experiment is not None:
+        return experiment.experiment_id
+    return client.create_experiment(experiment_name)
+
+
+def _register_model(client, name: str, source: str, run_id: str):
+    from mlflow.exceptions import MlflowException
+    try:
+        client.create_registered_model(name)
+    except MlflowException as e:
+        if "ALREADY_EXISTS" not in str(e.error_code):
+            raise e
+    return client.create_model_version(name, source, run_id)
+
+
+class TrackedRun:
+    """
+    Training-side handle of one run. Every call only appends to the run's buffers.
+    """
+
+    def __init__(self, tracker, name: str):
+        self._tracker = tracker
+        self.name = name
+        self.params = {}
+        self.metrics = []      # (key, value, timestamp_ms, step)
+        self.artifacts = []    # ("file", local_path, artifact_path) | ("dict", data, artifact_file) | ("model", ...)
+        self.status = None     # FINISHED / FAILED once the run block exits
+
+        # Background-side state (reset when switching to the offline store)
+        self.run_id = None
+        self.artifact_uri = None
+        self.flushed_params = set()
+        self.flushed_metrics = 0
+        self.submitted_artifacts = 0
+        self.uploads = []
+        self.terminated = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracker._end_run(self, "FAILED" if exc_type is not None else "FINISHED")
+
+    def log_param(self, key, value):
+        self.log_params({key: value})
+
+    def log_params(self, params: dict):
+        with self._tracker._lock:
+            self.params.update({key: str(value) for key, value in params.items()})
+        self._tracker._notify()
+
+    def log_metric(self, key, value, step: int = 0):
+        self.log_metrics({key: value}, step)
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        with self._tracker._lock:
+            self.metrics.extend((key, float(value), timestamp, step) for key, value in metrics.items())
+        self._tracker._notify()
+
+    def log_artifact(self, local_path, artifact_path: str = None):
+        self._add_artifact(("file", str(local_path), artifact_path))
+
+    def log_dict(self, data: dict, artifact_file: str):
+        self._add_artifact(("dict", data, artifact_file))
+
+    def log_model(self, model, artifact_path: str, registered_model_name: str = None):
+        """
+        Serialized (mlflow.sklearn format) and uploaded by the upload pool, then
+        registered when registered_model_name is given.
+        """
+        self._add_artifact(("model", model, artifact_path, registered_model_name))
+
+    def _add_artifact(self, artifact: tuple):
+        with self._tracker._lock:
+            self.artifacts.append(artifact)
+        self._tracker._notify()
+
+
+class ExperimentTracker:
+    """
+    Owns the background flush thread, the upload pool and the server / offline switch.
+    Training never waits for the tracking server, except for the final drain on exit.
+    """
+
+    def __init__(self, config: dict):
+        tracking_config = config.get('tracking', {})
+        _configure_http(tracking_config)
+        self.tracking_uri = config['mlflow']['tracking_uri']
+        self.experiment_name = config['mlflow']['experiment_name']
+        self.offline_dir = tracking_config.get('offline_dir', "artifacts/mlruns_offline")
+        self.flush_interval = tracking_config.get('flush_interval_seconds', 2)
+        self.upload_workers = tracking_config.get('upload_workers', 4)
+        self.sync_on_start = tracking_config.get('sync_on_start', True)
+
+        self.offline = False
+        self.runs = []
+        self.logged = {"params": 0, "metrics": 0, "artifacts": 0}
+        self._client = None
+        self._experiment_id = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._thread = None
+        self._uploader = None
+        self._requirements = {}
+        self._requirements_locks = {}
+
+    # --- training thread ---
+    def __enter__(self):
+        self._uploader = ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="mlflow-upload")
+        self._thread = threading.Thread(target=self._worker, name="mlflow-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start_run(self, run_name: str) -> TrackedRun:
+        run = TrackedRun(self, run_name)
+        with self._lock:
+            self.runs.append(run)
+        self._notify()
+        return run
+
+    def close(self):
+        """
+        Drains the buffers and pending uploads, then stops the background thread.
+        Safe to call again (the context manager exit closes a closed tracker).
+        """
+        if self._thread is None:
+            return
+        start = time.perf_counter()
+        with self._lock:
+            for run in self.runs:
+                # Runs not used as a context manager
+                if run.status is None:
+                    run.status = "KILLED"
+        self._closing = True
+        self._notify()
+        self._thread.join()
+        self._uploader.shutdown(wait=True)
+        self._thread = None
+        target = f"offline store {self.offline_dir}" if self.offline else self.tracking_uri
+        print(f"📡 Tracking: {self.logged['params']} params, {self.logged['metrics']} metrics, "
+              f"{self.logged['artifacts']} artifacts -> {target} (drain {time.perf_counter() - start:.2f}s)")
+
+    def _end_run(self, run: TrackedRun, status: str):
+        with self._lock:
+            run.status = status
+        self._notify()
+
+    def _notify(self):
+        self._wakeup.set()
+
+    # --- background thread ---
+    def _worker(self):
+        if self.sync_on_start and os.path.isdir(self.offline_dir):
+            try:
+                sync_offline_runs(self.tracking_uri, self.offline_dir, self.experiment_name)
+            except Exception as e:
+                print(f"⚠️ Offline runs not synced yet: {e}")
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            closing = self._closing
+            self._flush()
+            if closing and self._drained():
+                return
+
+    def _drained(self) -> bool:
+        with self._lock:
+            return all(run.terminated for run in self.runs)
+
+    def _connect(self):
+        from mlflow.tracking import MlflowClient
+        uri = _offline_uri(self.offline_dir) if self.offline else self.tracking_uri
+        self._client = MlflowClient(tracking_uri=uri, registry_uri=uri)
+        self._experiment_id = _get_experiment_id(self._client, self.experiment_name)
+
+    def _flush(self):
+        try:
+            if self._client is None:
+                self._connect()
+            for run in list(self.runs):
+                self._flush_run(run)
+        except Exception as e:
+            if self.offline:
+                print(f"❌ Offline tracking store error, pending tracking data dropped: {e}")
+                with self._lock:
+                    for run in self.runs:
+                        run.terminated = True
+                return
+            print(f"⚠️ Tracking server unreachable ({type(e).__name__}), logging to {self.offline_dir}")
+            self._go_offline()
+
+    def _go_offline(self):
+        """
+        Replays every run from scratch into the local file store (synced to the server later).
+        """
+        self.offline = True
+        self._client = None
+        self.logged = {"params": 0, "metrics": 0, "artifacts": 0}
+        with self._lock:
+            for run in self.runs:
+                run.run_id = None
+                run.flushed_params = set()
+                run.flushed_metrics = 0
+                run.submitted_artifacts = 0
+                run.uploads = []
+                run.terminated = False
+        self._wakeup.set()
+
+    def _flush_run(self, run: TrackedRun):
+        from mlflow.entities import Metric, Param
+
+        if run.terminated:
+            return
+        with self._lock:
+            params = [Param(key, value) for key, value in run.params.items() if key not in run.flushed_params]
+            metrics = [Metric(*entry) for entry in run.metrics[run.flushed_metrics:]]
+            artifacts = run.artifacts[run.submitted_artifacts:]
+            status = run.status
+
+        if run.run_id is None:
+            created = self._client.create_run(self._experiment_id, run_name=run.name)
+            run.run_id, run.artifact_uri = created.info.run_id, created.info.artifact_uri
+
+        for i in range(0, len(params), MAX_PARAMS_PER_BATCH):
+            self._client.log_batch(run.run_id, params=params[i:i + MAX_PARAMS_PER_BATCH])
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            self._client.log_batch(run.run_id, metrics=metrics[i:i + MAX_METRICS_PER_BATCH])
+        run.flushed_params.update(param.key for param in params)
+        run.flushed_metrics += len(metrics)
+        self.logged["params"] += len(params)
+        self.logged["metrics"] += len(metrics)
+
+        for artifact in artifacts:
+            run.uploads.append(self._uploader.submit(
+                self._upload, self._client, run.run_id, run.artifact_uri, artifact, self.offline
+            ))
+        run.submitted_artifacts += len(artifacts)
+
+        # A failed upload raises here and switches to the offline store like any other call
+        for upload in [upload for upload in run.uploads if upload.done()]:
+            upload.result()
+            run.uploads.remove(upload)
+            self.logged["artifacts"] += 1
+
+        if status is not None and not run.uploads and run.submitted_artifacts == len(run.artifacts):
+            self._client.set_terminated(run.run_id, status)
+            run.terminated = True
+
+    def _pip_requirements(self, model) -> list:
+        """
+        mlflow infers requirements by loading the model in a subprocess (seconds):
+        done once per estimator class, concurrent uploads of the same class wait for it.
+        """
+        import mlflow.sklearn
+        model_class = f"{type(model).__module__}.{type(model).__name__}"
+        with self._lock:
+            class_lock = self._requirements_locks.setdefault(model_class, threading.Lock())
+        with class_lock:
+            if model_class not in self._requirements:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    mlflow.sklearn.save_model(model, os.path.join(tmp_dir, "model"))
+                    with open(os.path.join(tmp_dir, "model", "requirements.txt")) as f:
+                        self._requirements[model_class] = [line.strip() for line in f if line.strip()]
+            return self._requirements[model_class]
+
+    def _upload(self, client, run_id: str, artifact_uri: str, artifact: tuple, offline: bool):
+        try:
+            kind = artifact[0]
+            if kind == "file":
+                _, local_path, artifact_path = artifact
+                client.log_artifact(run_id, local_path, artifact_path)
+            elif kind == "dict":
+                _, data, artifact_file = artifact
+                client.log_dict(run_id, data, artifact_file)
+            else:
+                import mlflow.sklearn
+                _, model, artifact_path, registered_model_name = artifact
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    local_dir = os.path.join(tmp_dir, artifact_path)
+                    mlflow.sklearn.save_model(model, local_dir, pip_requirements=self._pip_requirements(model))
+                    client.log_artifacts(run_id, local_dir, artifact_path)
+                if registered_model_name:
+                    if offline:
+                        # Registered on the server by the sync
+                        client.set_tag(run_id, REGISTER_TAG, f"{registered_model_name}:{artifact_path}")
+                    else:
+                        _register_model(client, registered_model_name, f"{artifact_uri}/{artifact_path}", run_id)
+        finally:
+            # Wakes the flush thread so the run can be terminated
+            self._notify()
+
+
+def sync_offline_runs(tracking_uri: str, offline_dir, experiment_name: str) -> int:
+    """
+    Uploads the runs of the offline store that are not on the server yet (params,
+    full metric history, artifacts, model registration). Returns the number of synced runs.
+    """
+    from mlflow.entities import Metric, Param, RunTag
+    from mlflow.tracking import MlflowClient
+
+    offline_uri = _offline_uri(offline_dir)
+    offline = MlflowClient(tracking_uri=offline_uri, registry_uri=offline_uri)
+    experiment = offline.get_experiment_by_name(experiment_name)
+    if experiment is None:
+        return 0
+    server = MlflowClient(tracking_uri=tracking_uri, registry_uri=tracking_uri)
+    experiment_id = None
+    synced = 0
+
+    for run in offline.search_runs([experiment.experiment_id], order_by=["attributes.start_time ASC"], max_results=10000):
+        if SYNCED_TAG in run.data.tags or run.info.status == "RUNNING":
+            continue
+        if experiment_id is None:
+            experiment_id = _get_experiment_id(server, experiment_name)
+
+        tags = {key: value for key, value in run.data.tags.items()
+                if not key.startswith("mlflow.") and key != REGISTER_TAG}
+        tags["offline.source_run_id"] = run.info.run_id
+        remote = server.create_run(experiment_id, start_time=run.info.start_time,
+                                   tags=tags, run_name=run.info.run_name)
+        remote_id = remote.info.run_id
+
+        params = [Param(key, value) for key, value in run.data.params.items()]
+        metrics = [Metric(m.key, m.value, m.timestamp, m.step)
+                   for key in run.data.metrics for m in offline.get_metric_history(run.info.run_id, key)]
+        for i in range(0, len(params), MAX_PARAMS_PER_BATCH):
+            server.log_batch(remote_id, params=params[i:i + MAX_PARAMS_PER_BATCH])
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            server.log_batch(remote_id, metrics=metrics[i:i + MAX_METRICS_PER_BATCH])
+
+        local_artifacts = offline.download_artifacts(run.info.run_id, "")
+        if os.listdir(local_artifacts):
+            server.log_artifacts(remote_id, local_artifacts)
+        if REGISTER_TAG in run.data.tags:
+            name, artifact_path = run.data.tags[REGISTER_TAG].split(":", 1)
+            _register_model(server, name, f"{remote.info.artifact_uri}/{artifact_path}", remote_id)
+
+        server.set_terminated(remote_id, run.info.status, end_time=run.info.end_time)
+        offline.set_tag(run.info.run_id, SYNCED_TAG, remote_id)
+        synced += 1
+        print(f"🔁 Synced offline run '{run.info.run_name}' -> {remote_id}")
+    return synced
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline MLflow store tools")
+    parser.add_argument("--sync", action="store_true", help="Upload offline runs to the tracking server")
+    args = parser.parse_args()
+    if args.sync:
+        config = read_yaml(Path("configs/config.yaml"))
+        _configure_http(config.get('tracking', {}))
+        count = sync_offline_runs(config['mlflow']['tracking_uri'],
+                                  config.get('tracking', {}).get('offline_dir', "artifacts/mlruns_offline"),
+                                  config['mlflow']['experiment_name'])
+        print(f"✅ {count} offline run(s) synced")
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from src.utils.common import hash_file
+from src.utils.profiling import PEAK_RSS, Profiler, children_peak_rss_mb
+
+
+class Stage:
+    """
+    One pipeline step and everything its result depends on.
+
+    - config: config sections the stage reads (dict, hashed as canonical JSON)
+    - inputs: files the stage reads (schema, upstream artifacts, ...)
+    - code:   source files implementing the stage
+    - outputs: files the stage produces (reused when the stage is skipped)
+    """
+
+    def __init__(self, name, run, config=None, inputs=None, code=None, outputs=None):
+        self.name = name
+        self.run = run
+        self.config = config or {}
+        self.inputs = [Path(p) for p in (inputs or [])]
+        self.code = [Path(p) for p in (code or [])]
+        self.outputs = [Path(p) for p in (outputs or [])]
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self.config, sort_keys=True, default=str).encode())
+        for path in self.inputs + self.code:
+            file_hash = hash_file(path) if path.exists() else "missing"
+            digest.update(f"{path.as_posix()}:{file_hash}".encode())
+        return digest.hexdigest()
+
+
+class StageRunner:
+    """
+    Runs stages in order and skips the ones whose fingerprint (config + input
+    files + code) matches the manifest of the last successful run, as long as
+    their recorded outputs are still on disk and unchanged.
+
+    Upstream outputs are inputs of downstream stages, so a change anywhere
+    invalidates everything that depends on it.
+    """
+
+    def __init__(self, manifest_path, force=None, profiler=None):
+        self.manifest_path = Path(manifest_path)
+        # Stage names to re-run regardless of the manifest ("all" forces every stage)
+        self.force = set(force or [])
+        # Opt-in profiling of every stage that runs (src/utils/profiling.py)
+        self.profiler = profiler or Profiler()
+        self.manifest = self._read_manifest()
+        self.timings = []
+
+    def _read_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        os.makedirs(self.manifest_path.parent, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _is_up_to_date(self, stage: Stage, fingerprint: str) -> bool:
+        record = self.manifest.get(stage.name)
+        if record is None or record["fingerprint"] != fingerprint:
+            return False
+        for path in stage.outputs:
+            if not path.exists() or hash_file(path) != record["outputs"].get(path.as_posix()):
+                return False
+        return True
+
+    def run_stage(self, stage: Stage):
+        """
+        Runs (or skips) one stage. Returns the stage's return value, or None when skipped.
+        """
+        start = time.perf_counter()
+        fingerprint = stage.fingerprint()
+        forced = stage.name in self.force or "all" in self.force
+
+        if not forced and self._is_up_to_date(stage, fingerprint):
+            reused = f", reusing {', '.join(p.as_posix() for p in stage.outputs)}" if stage.outputs else ""
+            print(f"⏭️  {stage.name}: unchanged{reused}")
+            self.timings.append((stage.name, "skipped", time.perf_counter() - start, None, None))
+            return None
+
+        PEAK_RSS.begin()
+        children_before = children_peak_rss_mb()
+        try:
+            with self.profiler.profile(stage.name):
+                result = stage.run()
+        finally:
+            peak_rss_mb = PEAK_RSS.end()
+        children_after = children_peak_rss_mb()
+        # Only known when a worker of this stage set a new high
+        workers_peak_mb = children_after if children_after > children_before else None
+
+        # Only successful runs are recorded (a failing stage raises before this point)
+        self.manifest[stage.name] = {
+            "fingerprint": fingerprint,
+            "outputs": {p.as_posix(): hash_file(p) for p in stage.outputs if p.exists()},
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._write_manifest()
+        self.timings.append((stage.name, "forced" if forced else "ran", time.perf_counter() - start,
+                             peak_rss_mb, workers_peak_mb))
+        return result
+
+    def summary(self) -> list:
+        """
+        One dict per stage: name, status, seconds, peak_rss_mb (this process, during
+        the stage) and workers_peak_rss_mb (largest pool worker, when it set a new high).
+        """
+        keys = ("stage", "status", "seconds", "peak_rss_mb", "workers_peak_rss_mb")
+        return [dict(zip(keys, timing)) for timing in self.timings]
+
+    def report(self):
+        def mb(value):
+            return f"{value:>12.0f}" if value is not None else f"{'-':>12}"
+
+        print("⏱️  Stage timing report")
+        print(f"   {'stage':<16}{'status':<10}{'seconds':>10}{'peak MB':>12}{'workers MB':>12}")
+        for name, status, seconds, peak_rss_mb, workers_peak_mb in self.timings:
+            print(f"   {name:<16}{status:<10}{seconds:>10.2f}{mb(peak_rss_mb)}{mb(workers_peak_mb)}")
+        print(f"   {'total':<26}{sum(t[2] for t in self.timings):>10.2f}")
@@ -1,8 +1,20 @@
 import os
+import json
+import hashlib
 import yaml
 import joblib
+import numpy as np
+import pandas as pd
 from pathlib import Path
 
+# Dataset storage formats (configs/config.yaml -> storage.format) and their file extensions
+DATASET_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",   # requires pyarrow
+    "feather": ".feather",   # requires pyarrow
+    "npy": ".npy",           # memory-mapped, zero-copy loading
+}
+
 def read_yaml(path_to_yaml: Path):
     """
     Reads a YAML file and returns it as a dictionary.
@@ -26,23 +38,175 @@ def create_directories(path_to_directories: list, verbose=True):
 def save_object(file_path, obj):
     """
     Saves a Python object (model, scaler, etc.) to the specified path.
+    Uncompressed joblib with its numpy arrays stored raw, so it can be loaded with
+    mmap_mode. Written to a temporary file and renamed: processes that already mapped
+    the previous file keep a consistent (old) copy.
     """
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
-        
-        with open(file_path, "wb") as file_obj:
-            joblib.dump(obj, file_obj)
-            
+
+        tmp_path = f"{file_path}.tmp-{os.getpid()}"
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, file_path)
+
     except Exception as e:
         raise e
 
-def load_object(file_path):
+def load_object(file_path, mmap_mode=None):
     """
     Loads a Python object (model, scaler, etc.) from the specified path.
+    mmap_mode="r" maps the numpy arrays of the file instead of copying them
+    (read-only, shared with every process that maps the same file).
     """
     try:
+        if mmap_mode is not None:
+            return joblib.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return joblib.load(file_obj)
     except Exception as e:
-        raise e
\ No newline at end of file
+        raise e
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    Returns the SHA-256 hex digest of a file (read in chunks, constant memory).
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def dataset_path(path, fmt="csv") -> Path:
+    """
+    Returns the dataset path for a storage format (swaps the file extension).
+    """
+    if fmt not in DATASET_FORMATS:
+        raise ValueError(f"Unknown dataset format '{fmt}'. Available: {list(DATASET_FORMATS)}")
+    return Path(path).with_suffix(DATASET_FORMATS[fmt])
+
+def dataset_files(path, fmt="csv") -> list:
+    """
+    Returns every file a saved dataset consists of (the .npy format has a column sidecar).
+    """
+    path = dataset_path(path, fmt)
+    if fmt == "npy":
+        return [path, path.with_suffix(".columns.json")]
+    return [path]
+
+def save_dataset(df: pd.DataFrame, path, fmt="csv") -> Path:
+    """
+    Saves a DataFrame in the given storage format and returns the written path.
+    """
+    try:
+        path = dataset_path(path, fmt)
+        os.makedirs(path.parent, exist_ok=True)
+
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "parquet":
+            df.to_parquet(path, index=False)
+        elif fmt == "feather":
+            df.reset_index(drop=True).to_feather(path)
+        elif fmt == "npy":
+            # One typed 2D matrix + column names/dtypes, so loading can memory-map it
+            dtype = np.result_type(*df.dtypes)
+            np.save(path, np.ascontiguousarray(df.to_numpy(dtype=dtype)))
+            with open(path.with_suffix(".columns.json"), "w") as f:
+                json.dump({"columns": list(df.columns), "dtypes": [str(t) for t in df.dtypes]}, f)
+        return path
+
+    except Exception as e:
+        raise e
+
+def load_dataset(path, fmt="csv", columns=None) -> pd.DataFrame:
+    """
+    Loads a dataset saved with save_dataset as a DataFrame (optionally only some columns).
+    """
+    try:
+        path = dataset_path(path, fmt)
+
+        if fmt == "csv":
+            # round_trip parsing gives back exactly the floats that were written
+            return pd.read_csv(path, usecols=columns, float_precision="round_trip")
+        if fmt == "parquet":
+            return pd.read_parquet(path, columns=columns)
+        if fmt == "feather":
+            return pd.read_feather(path, columns=columns)
+
+        array, names = load_dataset_array(path, fmt, columns)
+        with open(path.with_suffix(".columns.json")) as f:
+            meta = json.load(f)
+        dtypes = dict(zip(meta["columns"], meta["dtypes"]))
+        df = pd.DataFrame(array, columns=names)
+        return df.astype({name: dtypes[name] for name in names})
+
+    except Exception as e:
+        raise e
+
+def load_dataset_array(path, fmt="csv", columns=None):
+    """
+    Loads a dataset as a (rows x columns) NumPy array plus its column names.
+    For the .npy format the array is memory-mapped (no copy, no parsing).
+    """
+    try:
+        path = dataset_path(path, fmt)
+
+        if fmt != "npy":
+            df = load_dataset(path, fmt, columns)
+            return df.to_numpy(), list(df.columns)
+
+        array = np.load(path, mmap_mode="r")
+        with open(path.with_suffix(".columns.json")) as f:
+            names = json.load(f)["columns"]
+        if columns is None:
+            return array, names
+        indices = [names.index(col) for col in columns]
+        # Contiguous column ranges stay zero-copy views
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return array[:, indices[0]:indices[0] + len(indices)], list(columns)
+        return array[:, indices], list(columns)
+
+    except Exception as e:
+        raise e
+
+def iter_dataset_chunks(path, fmt="csv", chunk_size=100_000, columns=None):
+    """
+    Yields a saved dataset as DataFrames of at most chunk_size rows (bounded memory).
+    """
+    path = dataset_path(path, fmt)
+
+    if fmt == "csv":
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_size, float_precision="round_trip") as reader:
+            yield from reader
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif fmt == "feather":
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield batch.to_pandas()
+    elif fmt == "npy":
+        array, names = load_dataset_array(path, fmt, columns)
+        with open(path.with_suffix(".columns.json")) as f:
+            meta = json.load(f)
+        dtypes = dict(zip(meta["columns"], meta["dtypes"]))
+        for start in range(0, len(array), chunk_size):
+            chunk = pd.DataFrame(np.asarray(array[start:start + chunk_size]), columns=names)
+            yield chunk.astype({name: dtypes[name] for name in names})
+
+
+def limit_worker_threads():
+    """
+    Caps BLAS / OpenMP to one thread in a pool worker process. One process per core:
+    nested native threads would oversubscribe the machine.
+    """
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = "1"
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=1)
+    except ImportError:
+        pass
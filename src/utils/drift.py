@@ -0,0 +1,90 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Quantile grid stored in the reference (0, 1, ..., 100 percent)
+QUANTILE_GRID = np.linspace(0, 100, 101)
+
+
+def column_reference(values: np.ndarray, n_bins: int = 10) -> dict:
+    """
+    Reference statistics of one column: moments, percentiles (empirical CDF for KS)
+    and quantile bins with their proportions (PSI).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    quantiles = np.percentile(values, QUANTILE_GRID)
+    # Interior edges; repeated quantiles (discrete columns such as sex) collapse into one bin
+    edges = np.unique(np.percentile(values, np.linspace(0, 100, n_bins + 1)[1:-1]))
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "quantiles": quantiles.tolist(),
+        "bin_edges": edges.tolist(),
+        "bin_proportions": (counts / counts.sum()).tolist(),
+    }
+
+
+def build_reference(X: np.ndarray, columns: list, predictions: np.ndarray = None, n_bins: int = 10) -> dict:
+    """
+    Reference statistics of the training features (raw scale) and, optionally, of the model's predictions.
+    """
+    reference = {"columns": {col: column_reference(X[:, j], n_bins) for j, col in enumerate(columns)}}
+    if predictions is not None:
+        reference["prediction"] = column_reference(predictions, n_bins)
+    return reference
+
+
+def save_reference(reference: dict, path):
+    os.makedirs(Path(path).parent, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(reference, f)
+
+
+def load_reference(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+    """
+    Population Stability Index between two binned distributions (proportions).
+    < 0.1 stable, 0.1-0.2 moderate shift, > 0.2 significant shift.
+    """
+    expected = np.clip(np.asarray(expected, dtype=np.float64), eps, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(reference_quantiles, values: np.ndarray) -> float:
+    """
+    Two-sample Kolmogorov-Smirnov statistic against a reference given by its percentiles
+    (reference CDF interpolated between them).
+    """
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    n = len(values)
+    if n == 0:
+        return 0.0
+    ref_quantiles = np.asarray(reference_quantiles, dtype=np.float64)
+    probabilities = QUANTILE_GRID / 100
+
+    def reference_cdf(x):
+        # Right-continuous: last percentile <= x (handles flat quantile runs of discrete columns)
+        idx = np.searchsorted(ref_quantiles, x, side="right")
+        lower = np.clip(idx - 1, 0, len(ref_quantiles) - 1)
+        upper = np.clip(idx, 0, len(ref_quantiles) - 1)
+        span = ref_quantiles[upper] - ref_quantiles[lower]
+        fraction = np.divide(x - ref_quantiles[lower], span, out=np.zeros_like(x), where=span > 0)
+        cdf = probabilities[lower] + fraction * (probabilities[upper] - probabilities[lower])
+        return np.where(idx == 0, 0.0, np.where(idx >= len(ref_quantiles), 1.0, cdf))
+
+    # Evaluate at every live value and every reference percentile (the two CDFs' jump points)
+    points = np.concatenate([values, ref_quantiles])
+    live_cdf = np.searchsorted(values, points, side="right") / n
+    return float(np.max(np.abs(live_cdf - reference_cdf(points))))
@@ -0,0 +1,103 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge, SGDRegressor
+
+# Models scored in float64 end to end; every other model (trees) gets float32 input,
+# like sklearn / XGBoost cast it after the float64 scaling
+FLOAT64_MODELS = (ElasticNet, Lasso, Ridge, LinearRegression, SGDRegressor)
+INPUT_NAME = "input"
+
+
+def _register_xgboost():
+    """
+    skl2onnx has no XGBoost converter of its own: the onnxmltools one is registered for XGBRegressor.
+    """
+    from skl2onnx import update_registered_converter
+    from skl2onnx.common.shape_calculator import calculate_linear_regressor_output_shapes
+    from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+    from xgboost import XGBRegressor
+
+    update_registered_converter(
+        XGBRegressor, "XGBoostXGBRegressor", calculate_linear_regressor_output_shapes, convert_xgboost
+    )
+
+
+def convert_to_onnx(model, scaler, metadata: dict = None, target_opset: int = 17):
+    """
+    Converts the fused scaler + model pipeline into one ONNX graph (float64 raw features in,
+    one prediction per row out). Requires skl2onnx (and onnxmltools for XGBoost).
+
+    metadata: stored as string properties of the graph (e.g. the versions of the
+    joblib files it was converted from).
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import DoubleTensorType
+    from skl2onnx.sklapi import CastTransformer
+    from sklearn.pipeline import Pipeline
+
+    steps = [("scaler", scaler)]
+    if not isinstance(model, FLOAT64_MODELS):
+        steps.append(("cast", CastTransformer(dtype=np.float32)))
+    steps.append(("model", model))
+    if type(model).__name__ == "XGBRegressor":
+        _register_xgboost()
+
+    n_features = len(scaler.mean_)
+    onnx_model = convert_sklearn(
+        Pipeline(steps),
+        initial_types=[(INPUT_NAME, DoubleTensorType([None, n_features]))],
+        target_opset={"": target_opset, "ai.onnx.ml": 3}
+    )
+
+    properties = {
+        "model_type": type(model).__name__,
+        # Probe input of the API (training mean patient)
+        "feature_mean": json.dumps(np.asarray(scaler.mean_, dtype=np.float64).tolist()),
+        **(metadata or {}),
+    }
+    for key, value in properties.items():
+        prop = onnx_model.metadata_props.add()
+        prop.key, prop.value = key, str(value)
+    return onnx_model
+
+
+def check_parity(onnx_model, model, scaler, n_rows=1000, rtol=1e-4, random_state=0) -> float:
+    """
+    Compares the ONNX graph with scaler.transform + model.predict on synthetic patients
+    (training mean +- 3 std). Returns the largest absolute difference, raises ValueError
+    above rtol * the largest prediction.
+    """
+    import onnxruntime as ort
+
+    rng = np.random.default_rng(random_state)
+    mean, scale = np.asarray(scaler.mean_), np.asarray(scaler.scale_)
+    X = mean + scale * rng.uniform(-3, 3, (n_rows, len(mean)))
+
+    session = ort.InferenceSession(onnx_model.SerializeToString(), providers=["CPUExecutionProvider"])
+    actual = session.run(None, {INPUT_NAME: X})[0].ravel()
+    # Same input as the training pipeline (DataFrame when the scaler was fitted on one)
+    columns = getattr(scaler, "feature_names_in_", None)
+    expected = np.asarray(model.predict(scaler.transform(pd.DataFrame(X, columns=columns))), dtype=np.float64)
+
+    max_diff = float(np.abs(actual - expected).max())
+    tolerance = rtol * max(1.0, float(np.abs(expected).max()))
+    if max_diff > tolerance:
+        raise ValueError(f"ONNX predictions differ from the joblib model by {max_diff:.3g} (tolerance {tolerance:.3g})")
+    return max_diff
+
+
+def save_onnx(onnx_model, path):
+    """
+    Writes the graph to a temporary file and renames it (readers never see half a file).
+    """
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    os.replace(tmp_path, path)
+
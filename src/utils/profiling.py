@@ -0,0 +1,240 @@
+"""
+Opt-in profiling of pipeline stages and training sections (profiling in
+configs/config.yaml, or python main.py --profile).
+
+A section records wall and CPU time (this process and its finished child processes),
+peak RSS, optionally the Python heap peak (tracemalloc), bytes read and written, and
+optionally a cProfile dump. Reports are written as JSON next to the dumps and logged
+to MLflow as metrics + artifacts. A disabled Profiler hands out a shared no-op
+context manager.
+"""
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import resource
+import time
+import tracemalloc
+from pathlib import Path
+
+MB = 1024 * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS of this process (Linux VmHWM), so the next reading is the
+    peak since this call. Returns False where that is not supported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Lifetime peak (kB on Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def children_peak_rss_mb() -> float:
+    # Largest RSS of any finished child process (pool workers) so far
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def _python_peak_mb() -> float:
+    return tracemalloc.get_traced_memory()[1] / MB
+
+
+class _Watermark:
+    """
+    Nested peak measurements over one resettable high-water mark (VmHWM, tracemalloc).
+    Opening a window resets the mark: the peak reached so far is kept as a floor of
+    the enclosing windows, so a stage still sees the peaks of its inner sections.
+    """
+
+    def __init__(self, read, reset):
+        self._read = read
+        self._reset = reset
+        self._floors = []
+
+    def begin(self):
+        current = self._read()
+        self._floors = [max(floor, current) for floor in self._floors]
+        self._reset()
+        self._floors.append(0.0)
+
+    def end(self) -> float:
+        peak = max(self._read(), self._floors.pop())
+        if self._floors:
+            self._floors[-1] = max(self._floors[-1], peak)
+        return peak
+
+
+# Shared by StageRunner and Profiler sections (windows nest)
+PEAK_RSS = _Watermark(peak_rss_mb, reset_peak_rss)
+PEAK_PYTHON = _Watermark(_python_peak_mb, tracemalloc.reset_peak)
+
+_DISABLED = contextlib.nullcontext()
+
+
+def _io_counters() -> dict:
+    """
+    Bytes read / written by this process: storage I/O (read_bytes, write_bytes) and
+    every read() / write() call, page cache hits included (read_chars, write_chars).
+    """
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return {"read_bytes": int(fields["read_bytes"]), "write_bytes": int(fields["write_bytes"]),
+                "read_chars": int(fields["rchar"]), "write_chars": int(fields["wchar"])}
+    except (OSError, KeyError, ValueError):
+        # Block counts (512 bytes) where /proc/self/io is not available
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return {"read_bytes": usage.ru_inblock * 512, "write_bytes": usage.ru_oublock * 512}
+
+
+def log_profile(run, report: dict, prefix: str = "profile"):
+    """
+    Logs a section report to a TrackedRun: <prefix>_<metric> metrics and its files
+    under profiles/. Does nothing for a disabled profiler (report is None).
+    """
+    if report is None:
+        return
+    run.log_metrics({f"{prefix}_{key}": value for key, value in report["metrics"].items()})
+    for path in report["files"]:
+        run.log_artifact(path, "profiles")
+
+
+class Profiler:
+    """
+    Hands out profiled sections: `with profiler.profile("training") as report:`.
+    The report dict ({"name", "status", "metrics", "files"}) is filled when the section
+    exits; it is None when profiling is disabled.
+
+    cProfile and tracemalloc only run in outermost sections (one profiler at a time):
+    nested sections get times, memory and I/O.
+    """
+
+    def __init__(self, enabled=False, output_dir="artifacts/profiles", cprofile=False,
+                 trace_python=False, top_functions=30):
+        self.enabled = enabled
+        self.output_dir = Path(output_dir)
+        self.cprofile = cprofile
+        self.trace_python = trace_python
+        self.top_functions = top_functions
+        self.reports = []
+        self.run_dir = None
+        self._depth = 0
+
+    @classmethod
+    def from_config(cls, config: dict, enabled=None):
+        profiling_config = config.get('profiling', {})
+        return cls(
+            enabled=profiling_config.get('enabled', False) if enabled is None else enabled,
+            output_dir=profiling_config.get('output_dir', "artifacts/profiles"),
+            cprofile=profiling_config.get('cprofile', False),
+            trace_python=profiling_config.get('tracemalloc', False),
+            top_functions=profiling_config.get('top_functions', 30)
+        )
+
+    def profile(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        return self._section(name)
+
+    @contextlib.contextmanager
+    def _section(self, name: str):
+        if self.run_dir is None:
+            # One directory per pipeline run
+            self.run_dir = self.output_dir / time.strftime("%Y%m%d-%H%M%S")
+            os.makedirs(self.run_dir, exist_ok=True)
+        report = {"name": name, "status": "ok", "metrics": {}, "files": []}
+        outermost = self._depth == 0
+        profile = cProfile.Profile() if self.cprofile and outermost else None
+        if self.trace_python and outermost:
+            tracemalloc.start()
+        tracing = tracemalloc.is_tracing()
+
+        self._depth += 1
+        PEAK_RSS.begin()
+        if tracing:
+            PEAK_PYTHON.begin()
+        children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        children_peak_before = children_peak_rss_mb()
+        io_before = _io_counters()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield report
+        except BaseException:
+            report["status"] = "failed"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            metrics = report["metrics"]
+            metrics["wall_seconds"] = time.perf_counter() - wall_start
+            metrics["cpu_seconds"] = time.process_time() - cpu_start
+            children = resource.getrusage(resource.RUSAGE_CHILDREN)
+            metrics["children_cpu_seconds"] = round(children.ru_utime + children.ru_stime
+                                                    - children_before.ru_utime - children_before.ru_stime, 6)
+            metrics["peak_rss_mb"] = PEAK_RSS.end()
+            if children_peak_rss_mb() > children_peak_before:
+                metrics["children_peak_rss_mb"] = children_peak_rss_mb()
+            if tracing:
+                metrics["python_peak_mb"] = PEAK_PYTHON.end()
+                if outermost and self.trace_python:
+                    tracemalloc.stop()
+            io_after = _io_counters()
+            metrics.update({key: io_after[key] - io_before[key] for key in io_after})
+            metrics["children_read_bytes"] = (children.ru_inblock - children_before.ru_inblock) * 512
+            metrics["children_write_bytes"] = (children.ru_oublock - children_before.ru_oublock) * 512
+            self._depth -= 1
+            self._save(report, profile)
+
+    def _save(self, report: dict, profile):
+        # Unique file names when a section name repeats
+        names = [r["name"] for r in self.reports]
+        stem = report["name"] if report["name"] not in names else f"{report['name']}_{names.count(report['name']) + 1}"
+        if profile is not None:
+            # .prof: pstats format (snakeviz, flameprof, gprof2dot)
+            prof_path = self.run_dir / f"{stem}.prof"
+            profile.dump_stats(prof_path)
+            top_path = self.run_dir / f"{stem}_top.txt"
+            with open(top_path, "w") as f:
+                pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(self.top_functions)
+            report["files"] += [str(prof_path), str(top_path)]
+        report_path = self.run_dir / f"{stem}.json"
+        with open(report_path, "w") as f:
+            json.dump({key: value for key, value in report.items() if key != "files"}, f, indent=2)
+        report["files"].insert(0, str(report_path))
+        self.reports.append(report)
+
+        m = report["metrics"]
+        read, written = m.get("read_chars", m["read_bytes"]), m.get("write_chars", m["write_bytes"])
+        print(f"🔬 {report['name']}: {m['wall_seconds']:.2f}s wall, {m['cpu_seconds']:.2f}s cpu "
+              f"(+{m['children_cpu_seconds']:.2f}s children), peak {m['peak_rss_mb']:.0f} MB, "
+              f"read {read / MB:.1f} MB, written {written / MB:.1f} MB")
+
+    def log_reports(self, run):
+        """
+        Every section report to one TrackedRun (<section>_<metric>) plus summary.json.
+        """
+        summary_path = self.run_dir / "summary.json"
+        with open(summary_path, "w") as f:
+            json.dump([{key: value for key, value in report.items() if key != "files"}
+                       for report in self.reports], f, indent=2)
+        for report in self.reports:
+            log_profile(run, report, prefix=report["name"])
+        run.log_artifact(str(summary_path), "profiles")
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+from scipy.stats import rankdata
+
+from src.utils.common import dataset_files, dataset_path
+
+# Columns with at most this many distinct values are sampled as levels (e.g. sex)
+MAX_LEVELS = 10
+# Quantiles kept per continuous column (the inverse marginal CDF)
+N_QUANTILES = 1001
+
+# Generator shared with pool workers (set once per worker by _init_worker)
+_WORKER_MODEL = None
+
+
+def _decimals(values: np.ndarray, max_decimals=6) -> int:
+    for decimals in range(max_decimals + 1):
+        if np.allclose(values, np.round(values, decimals), rtol=0, atol=1e-9):
+            return decimals
+    return max_decimals
+
+
+def fit_synthetic_model(df: pd.DataFrame) -> dict:
+    """
+    Gaussian copula of a real dataset: the per-column marginals (empirical quantiles,
+    or levels and their frequencies for discrete columns) and the correlation matrix
+    of the columns' normal scores. Sampling it keeps every column's distribution
+    and the pairwise (rank) correlations, target included.
+    """
+    values = df.to_numpy(dtype=np.float64)
+    n_rows = len(values)
+    # Normal scores: rank -> uniform (0, 1) -> standard normal
+    scores = ndtri(rankdata(values, axis=0) / (n_rows + 1))
+    correlation = np.corrcoef(scores, rowvar=False)
+    # Nearest positive definite matrix (constant or duplicated columns)
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    correlation = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+
+    columns = []
+    for name, column in zip(df.columns, values.T):
+        levels, counts = np.unique(column, return_counts=True)
+        spec = {"name": name, "decimals": _decimals(column)}
+        if len(levels) <= MAX_LEVELS:
+            spec["levels"] = levels.tolist()
+            spec["cumulative"] = (np.cumsum(counts) / n_rows).tolist()
+        else:
+            spec["quantiles"] = np.quantile(column, np.linspace(0, 1, N_QUANTILES)).tolist()
+        columns.append(spec)
+
+    return {"columns": columns, "cholesky": np.linalg.cholesky(correlation).tolist(), "fitted_rows": n_rows}
+
+
+def generate_rows(model: dict, n_rows: int, seed: int, chunk_index: int = 0) -> pd.DataFrame:
+    """
+    Samples n_rows rows (vectorized). The stream of chunk i depends only on (seed, i),
+    so a dataset is reproducible whatever the number of workers.
+    """
+    rng = np.random.default_rng([seed, chunk_index])
+    cholesky = np.asarray(model["cholesky"])
+    uniforms = ndtr(rng.standard_normal((n_rows, len(cholesky))) @ cholesky.T)
+
+    data = {}
+    for spec, u in zip(model["columns"], uniforms.T):
+        if "levels" in spec:
+            index = np.searchsorted(spec["cumulative"], u, side="right")
+            values = np.asarray(spec["levels"])[np.minimum(index, len(spec["levels"]) - 1)]
+        else:
+            quantiles = np.asarray(spec["quantiles"])
+            values = np.interp(u, np.linspace(0, 1, len(quantiles)), quantiles)
+        data[spec["name"]] = np.round(values, spec["decimals"])
+    return pd.DataFrame(data)
+
+
+def _init_worker(model):
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+
+def _write_chunk(path: str, fmt: str, start: int, n_rows: int, seed: int, chunk_index: int) -> str:
+    """
+    Generates one chunk (pool worker). npy: written in place into the preallocated
+    matrix; other formats: a part file appended to the dataset by the parent.
+    """
+    df = generate_rows(_WORKER_MODEL, n_rows, seed, chunk_index)
+    if fmt == "npy":
+        matrix = np.load(path, mmap_mode="r+")
+        matrix[start:start + n_rows] = df.to_numpy(dtype=np.float64)
+        matrix.flush()
+        return None
+
+    part_path = f"{path}.part{chunk_index:06d}"
+    if fmt == "csv":
+        df.to_csv(part_path, index=False, header=False)
+    elif fmt == "parquet":
+        df.to_parquet(part_path, index=False)
+    elif fmt == "feather":
+        df.to_feather(part_path)
+    return part_path
+
+
+class _DatasetAppender:
+    """
+    Appends part files to one dataset file, in chunk order.
+    """
+
+    def __init__(self, path: Path, fmt: str, columns: list):
+        self.path = path
+        self.fmt = fmt
+        self._writer = None
+        if fmt == "csv":
+            with open(path, "w") as f:
+                f.write(",".join(columns) + "\n")
+
+    def append(self, part_path: str):
+        if self.fmt == "csv":
+            with open(self.path, "ab") as out, open(part_path, "rb") as part:
+                shutil.copyfileobj(part, out, length=16 * 1024 * 1024)
+        else:
+            import pyarrow.feather as feather
+            import pyarrow.ipc as ipc
+            import pyarrow.parquet as pq
+            table = pq.read_table(part_path) if self.fmt == "parquet" else feather.read_table(part_path)
+            if self._writer is None:
+                self._writer = (pq.ParquetWriter(self.path, table.schema) if self.fmt == "parquet"
+                                else ipc.new_file(self.path, table.schema))
+            self._writer.write_table(table)
+        os.remove(part_path)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def write_synthetic_dataset(model: dict, path, fmt="csv", n_rows=1_000_000, seed=42,
+                            chunk_size=1_000_000, workers=None) -> Path:
+    """
+    Writes n_rows synthetic rows as one dataset in a storage format (same files as
+    save_dataset). Chunks are generated by a process pool and assembled in order:
+    memory per process stays at one chunk.
+    """
+    try:
+        if n_rows < 1:
+            raise ValueError(f"n_rows must be positive, got {n_rows}")
+        path = dataset_path(path, fmt)
+        os.makedirs(path.parent, exist_ok=True)
+        columns = [spec["name"] for spec in model["columns"]]
+        workers = os.cpu_count() if workers is None else max(1, workers)
+        chunks = [(start, min(chunk_size, n_rows - start), index)
+                  for index, start in enumerate(range(0, n_rows, chunk_size))]
+
+        appender = None
+        if fmt == "npy":
+            np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n_rows, len(columns))).flush()
+            with open(dataset_files(path, fmt)[1], "w") as f:
+                json.dump({"columns": columns, "dtypes": ["float64"] * len(columns)}, f)
+        else:
+            appender = _DatasetAppender(path, fmt, columns)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+            parts = pool.map(
+                _write_chunk,
+                *zip(*[(str(path), fmt, start, size, seed, index) for start, size, index in chunks])
+            )
+            # map yields in submission order: parts are appended in row order
+            for part_path in parts:
+                if appender is not None:
+                    appender.append(part_path)
+        if appender is not None:
+            appender.close()
+        return path
+
+    except Exception as e:
+        raise e
@@ -1,5 +1,19 @@
+import asyncio
+import os
+import time
+import numpy as np
+import pytest
 from fastapi.testclient import TestClient
+import src.api.app as api_module
 from src.api.app import app
+from src.api.artifacts import save_snapshot, load_snapshot
+from src.api.cache import PredictionCache
+from src.api.model_manager import ModelBundle
+from src.api.monitoring import DriftMonitor
+from src.api.inference import build_inference_engine
+from src.api.schemas.prediction import FEATURE_COLUMNS
+from src.utils.common import load_object
+from src.utils.drift import build_reference
 
 client = TestClient(app)
 
@@ -13,4 +27,192 @@ def test_health_check():
     (Because we send no data, it should return 422, showing that the API is running)
     """
     response = client.post("/predict")
-    assert response.status_code == 422
\ No newline at end of file
+    assert response.status_code == 422
+
+# --- Batch prediction ---
+SAMPLE = {"age": 59.0, "sex": 2.0, "bmi": 32.1, "bp": 101.0, "s1": 157.0,
+          "s2": 93.2, "s3": 38.0, "s4": 4.0, "s5": 4.85, "s6": 87.0}
+
+
+@pytest.fixture
+def local_artifacts(monkeypatch):
+    """Loads model & scaler from models/ without touching MLflow."""
+    model = load_object(os.path.join("models", "model.joblib"))
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    bundle = ModelBundle.build(model, scaler, "test", "test", "local_joblib")
+    monkeypatch.setattr(api_module.model_manager, "current", bundle)
+    if api_module.prediction_cache is not None:
+        api_module.prediction_cache.clear()
+
+
+def test_batch_predict_keeps_order(local_artifacts):
+    records = [dict(SAMPLE, age=age) for age in (25.0, 45.0, 65.0)]
+    response = client.post("/predict/batch", json={"records": records})
+    assert response.status_code == 200
+
+    singles = [client.post("/predict", json=r).json()["prediction"] for r in records]
+    assert response.json()["count"] == 3
+    assert response.json()["predictions"] == pytest.approx(singles)
+
+
+def test_batch_predict_columnar(local_artifacts):
+    columns = {col: [SAMPLE[col]] * 4 for col in FEATURE_COLUMNS}
+    response = client.post("/predict/batch", json={"columns": columns})
+    assert response.status_code == 200
+    assert len(response.json()["predictions"]) == 4
+
+
+def test_batch_predict_limit(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "MAX_BATCH_SIZE", 2)
+    response = client.post("/predict/batch", json={"records": [SAMPLE] * 3})
+    assert response.status_code == 413
+
+
+def test_predict_with_micro_batching(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "MICRO_BATCHING", {"enabled": True, "max_wait_ms": 1, "max_batch_size": 16})
+    monkeypatch.setattr(api_module, "STARTUP_MODE", "blocking")
+    monkeypatch.setattr(api_module, "load_artifacts", lambda: None)
+    monkeypatch.setattr(api_module, "prediction_cache", None)
+
+    expected = client.post("/predict", json=SAMPLE).json()["prediction"]
+    # Context manager runs startup/shutdown events (starts the batcher)
+    with TestClient(app) as batching_client:
+        response = batching_client.post("/predict", json=SAMPLE)
+        stats = batching_client.get("/metrics/batching").json()
+
+    assert response.status_code == 200
+    assert response.json()["prediction"] == pytest.approx(expected)
+    assert stats["enabled"] and stats["rows_total"] == 1
+
+
+def test_predict_cache_hits_and_version_invalidation(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "prediction_cache", PredictionCache(max_size=100))
+
+    first = client.post("/predict", json=SAMPLE).json()["prediction"]
+    second = client.post("/predict", json=SAMPLE).json()["prediction"]
+    assert first == second
+    assert client.get("/metrics/cache").json()["hits"] == 1
+
+    # A different loaded model/scaler version never sees the old entries
+    bundle = api_module.model_manager.current
+    monkeypatch.setattr(api_module.model_manager, "current", ModelBundle.build(
+        bundle.model, bundle.scaler, "reloaded", "test", "local_joblib"))
+    client.post("/predict", json=SAMPLE)
+    stats = client.get("/metrics/cache").json()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_prometheus_metrics(local_artifacts):
+    client.post("/predict", json=SAMPLE)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+    assert 'api_requests_total{endpoint="/predict",status="200"}' in text
+    assert 'api_predict_stage_duration_seconds_count{endpoint="/predict",stage="inference"}' in text
+    assert "api_request_duration_seconds_bucket" in text
+
+
+# --- Startup & health ---
+def test_health_probes(local_artifacts, monkeypatch):
+    assert client.get("/health/live").status_code == 200
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200 and ready.json()["ready"]
+
+    monkeypatch.setattr(api_module.model_manager, "current", None)
+    assert client.get("/health/ready").status_code == 503
+    assert client.get("/health/live").status_code == 200
+
+
+def test_snapshot_round_trip(tmp_path):
+    model = load_object(os.path.join("models", "model.joblib"))
+    scaler = load_object(os.path.join("models", "scaler.joblib"))
+    save_snapshot(tmp_path, model, scaler, "registry-v7", "abc", "mlflow_registry")
+
+    # models/model.joblib is older than the snapshot
+    snap_model, snap_scaler, model_version, scaler_version, source = load_snapshot(tmp_path)
+    assert (model_version, scaler_version, source) == ("registry-v7", "abc", "mlflow_registry")
+    X = np.array([[SAMPLE[col] for col in FEATURE_COLUMNS]])
+    expected = build_inference_engine(model, scaler).predict_matrix(X)
+    assert build_inference_engine(snap_model, snap_scaler).predict_matrix(X) == pytest.approx(expected)
+
+
+def test_background_registry_unavailable_keeps_local_model(local_artifacts, monkeypatch):
+    def unreachable():
+        raise ConnectionError("registry down")
+
+    monkeypatch.setattr(api_module.model_manager, "load_registry", unreachable)
+    asyncio.run(api_module.check_registry())
+
+    assert api_module.model_manager.registry_status == "unavailable"
+    assert client.get("/health/ready").json()["artifact_version"] == "test+scaler-test"
+    assert client.post("/predict", json=SAMPLE).status_code == 200
+
+
+def test_background_registry_timeout(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "REGISTRY_TIMEOUT", 0.05)
+    monkeypatch.setattr(api_module.model_manager, "load_registry", lambda: time.sleep(1))
+    start = time.perf_counter()
+    asyncio.run(api_module.check_registry())
+
+    assert time.perf_counter() - start < 0.5
+    assert api_module.model_manager.registry_status == "unavailable"
+
+
+def test_admin_pin_and_rollback(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(api_module.model_manager, "history", type(api_module.model_manager.history)(maxlen=3))
+    monkeypatch.setattr(api_module.model_manager, "rolled_back", type(api_module.model_manager.history)(maxlen=3))
+    monkeypatch.setattr(api_module.model_manager, "pinned", None)
+    first = api_module.model_manager.current
+    api_module.model_manager.install(ModelBundle.build(first.model, first.scaler, "v2", "test", "local_joblib"))
+
+    assert client.post("/admin/model", json={"action": "rollback"}).status_code == 401
+    headers = {"X-Admin-Token": "secret"}
+    status = client.post("/admin/model", json={"action": "rollback"}, headers=headers).json()
+    assert status["current"]["version"] == "test+scaler-test" and status["pinned"] == "test+scaler-test"
+
+    status = client.post("/admin/model", json={"action": "pin", "version": "v2"}, headers=headers).json()
+    assert status["current"]["model_version"] == "v2"
+    assert client.post("/admin/model", json={"action": "pin", "version": "nope"}, headers=headers).status_code == 404
+    assert client.post("/admin/model", json={"action": "unpin"}, headers=headers).json()["pinned"] is None
+
+
+def test_admin_changes_refused_with_several_workers(local_artifacts, monkeypatch):
+    # Only the worker receiving the request would switch version
+    monkeypatch.setattr(api_module, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(api_module, "SERVING_WORKERS", 4)
+    headers = {"X-Admin-Token": "secret"}
+    served = api_module.model_manager.current
+    response = client.post("/admin/model", json={"action": "rollback"}, headers=headers)
+    assert response.status_code == 409
+    assert api_module.model_manager.current is served
+    assert client.get("/admin/model", headers=headers).status_code == 200
+
+
+def test_admin_endpoints_disabled_without_token(local_artifacts, monkeypatch):
+    monkeypatch.setattr(api_module, "ADMIN_TOKEN", None)
+    served = api_module.model_manager.current
+    assert client.post("/admin/model", json={"action": "rollback"}).status_code == 403
+    assert client.post("/admin/model", json={"action": "rollback"}, headers={"X-Admin-Token": ""}).status_code == 403
+    assert client.get("/admin/model").status_code == 403
+    assert api_module.model_manager.current is served
+
+
+def test_drift_endpoint_records_predictions(local_artifacts, monkeypatch):
+    monitor = DriftMonitor(FEATURE_COLUMNS, window_size=100, min_samples=2)
+    monitor.set_reference(build_reference(np.random.default_rng(3).normal(50, 10, (500, 10)),
+                                          FEATURE_COLUMNS))
+    monkeypatch.setattr(api_module, "drift_monitor", monitor)
+
+    assert client.get("/monitoring/drift").json()["status"] == "pending"
+    prediction = client.post("/predict", json=SAMPLE).json()["prediction"]
+    client.post("/predict/batch", json={"records": [SAMPLE, SAMPLE]})
+    assert monitor.buffer.total == 3
+    assert monitor.buffer.predictions[0] == pytest.approx(prediction)
+
+    monitor.run()
+    report = client.get("/monitoring/drift").json()
+    assert report["rows_seen"] == 3 and "psi" in report["features"]["age"]
+    assert 'api_drift_psi{feature="age"}' in client.get("/metrics").text
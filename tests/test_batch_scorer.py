@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_diabetes
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+
+from src.components.batch_scorer import BatchScorer
+from src.utils.common import save_object
+
+
+@pytest.fixture(scope="module")
+def scoring_setup(tmp_path_factory):
+    """Scaler + champion saved like the training pipeline, and 2000 patients with an id."""
+    root = tmp_path_factory.mktemp("scoring")
+    diabetes = load_diabetes(scaled=False, as_frame=True)
+    X = diabetes.frame.drop(columns="target")
+    scaler = StandardScaler().fit(X)
+    model = XGBRegressor(n_estimators=30, max_depth=3).fit(scaler.transform(X), diabetes.target)
+    save_object(str(root / "models" / "scaler.joblib"), scaler)
+    save_object(str(root / "models" / "model.joblib"), model)
+
+    patients = X.sample(2000, replace=True, random_state=0).reset_index(drop=True)
+    patients.insert(0, "patient_id", np.arange(len(patients)))
+    expected = model.predict(scaler.transform(patients[X.columns]))
+    return root, patients, expected
+
+
+@pytest.mark.parametrize("workers,input_ext,output_ext", [
+    (0, ".csv", ".csv"),
+    (2, ".parquet", ".parquet"),
+    (2, ".csv", ".parquet"),
+])
+def test_scores_in_input_order(scoring_setup, workers, input_ext, output_ext):
+    root, patients, expected = scoring_setup
+    input_path = root / f"patients{input_ext}"
+    if input_ext == ".csv":
+        patients.to_csv(input_path, index=False)
+    else:
+        patients.to_parquet(input_path, index=False)
+    output_path = root / f"predictions_{workers}{output_ext}"
+
+    # Small chunks, at most 3 in flight: results complete out of order, written in order
+    scorer = BatchScorer(root / "models", chunk_size=128, workers=workers, max_pending_chunks=3)
+    stats = scorer.score_file(input_path, output_path, keep_columns=["patient_id"])
+    assert stats["rows"] == len(patients) and stats["chunks"] == 16 and stats["rows_per_second"] > 0
+
+    scored = pd.read_csv(output_path) if output_ext == ".csv" else pd.read_parquet(output_path)
+    assert list(scored.columns) == ["patient_id", "prediction"]
+    np.testing.assert_array_equal(scored["patient_id"], patients["patient_id"])
+    np.testing.assert_allclose(scored["prediction"], expected, rtol=1e-6)
+
+
+def test_missing_columns_fail_without_output(scoring_setup):
+    root, patients, _ = scoring_setup
+    input_path = root / "incomplete.csv"
+    patients.drop(columns=["bmi"]).to_csv(input_path, index=False)
+    output_path = root / "never.csv"
+
+    with pytest.raises(ValueError, match="bmi"):
+        BatchScorer(root / "models", workers=0).score_file(input_path, output_path)
+    assert not output_path.exists()
+
+
+@pytest.mark.parametrize("input_ext,output_ext", [(".csv", ".csv"), (".parquet", ".parquet")])
+def test_empty_input_writes_empty_output(scoring_setup, input_ext, output_ext):
+    root, patients, _ = scoring_setup
+    input_path = root / f"empty{input_ext}"
+    empty = patients.iloc[:0]
+    if input_ext == ".csv":
+        empty.to_csv(input_path, index=False)
+    else:
+        empty.to_parquet(input_path, index=False)
+    output_path = root / f"empty_predictions{output_ext}"
+
+    stats = BatchScorer(root / "models", workers=0).score_file(input_path, output_path, keep_columns=["patient_id"])
+    assert stats["rows"] == 0 and stats["chunks"] == 0
+
+    scored = pd.read_csv(output_path) if output_ext == ".csv" else pd.read_parquet(output_path)
+    assert list(scored.columns) == ["patient_id", "prediction"] and scored.empty
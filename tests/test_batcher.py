@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.api.batcher import MicroBatcher
+
+
+def test_micro_batcher_groups_concurrent_rows():
+    calls = []
+
+    def predict_fn(matrix):
+        calls.append(len(matrix))
+        return matrix.sum(axis=1)
+
+    async def scenario():
+        batcher = MicroBatcher(predict_fn, max_wait_ms=20, max_batch_size=8)
+        batcher.start()
+        rows = [np.full(10, i, dtype=np.float64) for i in range(20)]
+        results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        stats = batcher.stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(scenario())
+
+    # Each caller gets its own row's prediction, in order
+    assert results == [10.0 * i for i in range(20)]
+    assert max(calls) <= 8
+    assert len(calls) < 20
+    assert stats["rows_total"] == 20
+    assert stats["queue_depth"] == 0
+
+
+def test_micro_batcher_propagates_errors():
+    def predict_fn(matrix):
+        raise ValueError("boom")
+
+    async def scenario():
+        batcher = MicroBatcher(predict_fn, max_wait_ms=1, max_batch_size=4)
+        batcher.start()
+        try:
+            await batcher.submit([0.0] * 10)
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+
+
+def test_micro_batcher_never_mixes_predict_functions():
+    calls = []
+
+    def old_version(matrix):
+        calls.append(("old", len(matrix)))
+        return matrix.sum(axis=1)
+
+    def new_version(matrix):
+        calls.append(("new", len(matrix)))
+        return -matrix.sum(axis=1)
+
+    async def scenario():
+        batcher = MicroBatcher(max_wait_ms=20, max_batch_size=8)
+        batcher.start()
+        # A swap while rows are queued: each row keeps the version its request started with
+        submits = [batcher.submit(np.full(10, i, dtype=np.float64), old_version if i < 3 else new_version)
+                   for i in range(6)]
+        results = await asyncio.gather(*submits)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results == [0.0, 10.0, 20.0, -30.0, -40.0, -50.0]
+    assert sorted(calls) == [("new", 3), ("old", 3)]
+
+
+def test_micro_batcher_stop_fails_in_flight_rows():
+    started, release = threading.Event(), threading.Event()
+
+    def predict_fn(matrix):
+        started.set()
+        release.wait(5)
+        return matrix.sum(axis=1)
+
+    async def scenario():
+        batcher = MicroBatcher(predict_fn, max_wait_ms=1, max_batch_size=4)
+        batcher.start()
+        in_flight = asyncio.ensure_future(batcher.submit([0.0] * 10))
+        # The row is dequeued and its prediction is running in the threadpool
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(in_flight, 1)
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        asyncio.run(scenario())
@@ -0,0 +1,33 @@
+import time
+
+from src.api.cache import PredictionCache
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = PredictionCache(max_size=2)
+    cache.put(("v1", 1.0), 10.0)
+    cache.put(("v1", 2.0), 20.0)
+    assert cache.get(("v1", 1.0)) == 10.0  # 1.0 becomes most recent
+    cache.put(("v1", 3.0), 30.0)           # evicts 2.0
+
+    assert cache.get(("v1", 2.0)) is None
+    assert cache.get(("v1", 1.0)) == 10.0
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_ttl_expiry():
+    cache = PredictionCache(max_size=10, ttl_seconds=0.05)
+    cache.put(("v1", 1.0), 10.0)
+    assert cache.get(("v1", 1.0)) == 10.0
+    time.sleep(0.06)
+    assert cache.get(("v1", 1.0)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_key_is_canonical_and_versioned():
+    features = (59.0, 2.0, 32.1, 101.0, 157.0, 93.2, 38.0, 4.0, 4.85, 87.0)
+    # Same floats given as ints / -0.0 map to the same key
+    assert PredictionCache.make_key("v1", features) == PredictionCache.make_key("v1", [59, 2, 32.1, 101, 157, 93.2, 38, 4, 4.85, 87])
+    assert hash(PredictionCache.make_key("v1", (0.0,))) == hash(PredictionCache.make_key("v1", (-0.0,)))
+    assert PredictionCache.make_key("v1", features) != PredictionCache.make_key("v2", features)
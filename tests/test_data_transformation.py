@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from sklearn.datasets import load_diabetes
+from sklearn.preprocessing import StandardScaler
+
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.utils.common import load_dataset_array, load_object
+
+
+def make_transformation(tmp_path, chunk_size):
+    diabetes = load_diabetes(scaled=False)
+    df = pd.DataFrame(diabetes.data, columns=diabetes.feature_names)
+    df["target"] = diabetes.target
+    df.to_csv(tmp_path / "raw.csv", index=False)
+
+    (tmp_path / "models").mkdir(exist_ok=True)
+    config = {
+        "data": {"raw_path": str(tmp_path / "raw.csv"), "test_size": 0.2},
+        "artifacts": {"model_dir": str(tmp_path / "models")},
+        "storage": {"format": "csv"},
+        "transformation": {"mode": "streaming", "chunk_size": chunk_size,
+                           "shard_dir": str(tmp_path / f"shards_{chunk_size}")},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return DataTransformation(config_path), df
+
+
+def test_streaming_split_and_scaler_match_in_memory(tmp_path):
+    transformation, df = make_transformation(tmp_path, chunk_size=50)
+    train_shards, test_shards = transformation.initiate_streaming_transformation()
+
+    # Same split as hashing the whole table at once
+    is_test = transformation.split_mask(df)
+    assert 0.1 < is_test.mean() < 0.3
+
+    # partial_fit over chunks == fit on all train rows
+    scaler = load_object(tmp_path / "models" / "scaler.joblib")
+    reference = StandardScaler().fit(df[~is_test].drop(columns="target"))
+    np.testing.assert_allclose(scaler.mean_, reference.mean_, rtol=1e-12)
+    np.testing.assert_allclose(scaler.scale_, reference.scale_, rtol=1e-12)
+    assert list(scaler.feature_names_in_) == list(reference.feature_names_in_)
+
+    n_test = sum(len(load_dataset_array(path, "npy")[0]) for path in test_shards)
+    assert n_test == is_test.sum()
+    index = json.loads((tmp_path / "shards_50" / "index.json").read_text())
+    assert index["train"] == train_shards
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_split_does_not_depend_on_chunking(tmp_path, chunk_size):
+    transformation, df = make_transformation(tmp_path, chunk_size=chunk_size)
+    _, test_shards = transformation.initiate_streaming_transformation()
+
+    targets = np.concatenate([load_dataset_array(path, "npy")[0][:, -1] for path in test_shards])
+    expected = df.loc[transformation.split_mask(df), "target"].to_numpy()
+    np.testing.assert_array_equal(np.sort(targets), np.sort(expected))
+
+
+def test_shard_index_changes_with_shard_content(tmp_path):
+    # Training's only streaming input is index.json: it must change with the shards
+    transformation, df = make_transformation(tmp_path, chunk_size=50)
+    transformation.initiate_streaming_transformation()
+    index_path = tmp_path / "shards_50" / "index.json"
+    before = json.loads(index_path.read_text())
+    assert set(before["hashes"]) == set(before["train"] + before["test"]) | {f"{tmp_path}/models/scaler.joblib"}
+
+    # Rows moved across chunks: same split counts, different shard content
+    df.iloc[[0, 300]] = df.iloc[[300, 0]].to_numpy()
+    df.to_csv(tmp_path / "raw.csv", index=False)
+    transformation.initiate_streaming_transformation()
+    after = json.loads(index_path.read_text())
+    assert after["rows"] == before["rows"]
+    assert after["hashes"] != before["hashes"]
+
+
+def test_rerun_only_replaces_its_own_shards(tmp_path):
+    transformation, _ = make_transformation(tmp_path, chunk_size=200)
+    shard_dir = tmp_path / "shards_200"
+    (shard_dir / "notes").mkdir(parents=True)
+    (shard_dir / "README.txt").write_text("keep me")
+    (shard_dir / "train_99999.npy").write_bytes(b"stale")
+
+    train_shards, test_shards = transformation.initiate_streaming_transformation()
+    assert (shard_dir / "notes").is_dir() and (shard_dir / "README.txt").exists()
+    assert not (shard_dir / "train_99999.npy").exists()
+    assert sorted(path.name for path in shard_dir.glob("*.npy")) == \
+        sorted(path.rsplit("/", 1)[-1] for path in train_shards + test_shards)
+
+
+def test_incremental_trainer_rejects_empty_test_set(tmp_path):
+    transformation, _ = make_transformation(tmp_path, chunk_size=200)
+    train_shards, _ = transformation.initiate_streaming_transformation()
+    config_path = tmp_path / "trainer.yaml"
+    config_path.write_text(yaml.safe_dump({"training": {"incremental": {"model": "SGDRegressor", "epochs": 1}}}))
+
+    with pytest.raises(ValueError, match="No test rows"):
+        ModelTrainer(config_path).initiate_incremental_trainer(train_shards, [])
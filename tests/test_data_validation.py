@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.components.data_validation import DataValidation
+
+COLUMNS = ["age", "sex", "bmi", "bp", "s1", "s2", "s3", "s4", "s5", "s6", "target"]
+
+
+def write_configs(tmp_path, chunk_size=1000):
+    config = {
+        "data": {"raw_path": str(tmp_path / "raw.csv")},
+        "storage": {"format": "csv"},
+        "validation": {
+            "chunk_size": chunk_size,
+            "report_path": str(tmp_path / "report.json"),
+            "status_path": str(tmp_path / "status.txt"),
+        },
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+
+def synthetic_data(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # Values inside the schema ranges (configs/schema.yaml -> RANGES)
+    data = rng.uniform([20, 1, 20, 70, 120, 60, 30, 2, 3.5, 60, 25],
+                       [79, 2, 42, 130, 300, 240, 99, 9, 6.1, 124, 346], size=(n_rows, len(COLUMNS)))
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def test_valid_data_passes_with_full_report(tmp_path):
+    df = synthetic_data(5000)
+    df.to_csv(tmp_path / "raw.csv", index=False)
+
+    validation = DataValidation(write_configs(tmp_path), "configs/schema.yaml")
+    assert validation.validate_all_columns() is True
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["rows"] == 5000 and report["chunks"] == 5
+    # Streaming statistics match the in-memory ones
+    assert report["columns"]["bmi"]["mean"] == pytest.approx(df["bmi"].mean())
+    assert report["columns"]["bmi"]["std"] == pytest.approx(df["bmi"].std(ddof=0))
+    assert report["columns"]["age"]["max"] == df["age"].max()
+
+
+def test_every_column_counts(tmp_path):
+    df = synthetic_data(3000)
+    # Problems in early columns must not be hidden by valid later columns
+    df.loc[10, "age"] = 500.0
+    df.loc[2500, "bmi"] = np.nan
+    df["extra"] = 1.0
+    df.to_csv(tmp_path / "raw.csv", index=False)
+
+    validation = DataValidation(write_configs(tmp_path), "configs/schema.yaml")
+    assert validation.validate_all_columns() is False
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["columns"]["age"]["out_of_range"] == 1
+    assert report["columns"]["bmi"]["nulls"] == 1
+    assert any("extra" in error for error in report["errors"])
+
+
+def test_file_is_read_in_chunks(tmp_path):
+    # Memory benchmark on large files: benchmarks/bench_data_validation.py
+    df = synthetic_data(2_500)
+    df.to_csv(tmp_path / "raw.csv", index=False)
+
+    validation = DataValidation(write_configs(tmp_path, chunk_size=1000), "configs/schema.yaml")
+    assert validation.validate_all_columns() is True
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    # Two full chunks and a partial one
+    assert report["rows"] == 2_500 and report["chunks"] == 3
+    assert report["columns"]["s5"]["min"] == df["s5"].min()
@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from frontend.batch_client import (
+    DEFAULT_FIELDS, api_base_url, fetch_input_fields, make_session, score_patients, validate_patients
+)
+from src.api.schemas.prediction import FEATURE_COLUMNS
+
+
+class FakeBatchAPI(BaseHTTPRequestHandler):
+    """/predict/batch stand-in: prediction = sum of the features; the first call answers 503."""
+    protocol_version = "HTTP/1.1"
+    calls = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            self.calls.append(self.client_address[1])
+            first = len(self.calls) == 1
+        if first:
+            self._reply(503, {"detail": "warming up"})
+            return
+        columns = payload["columns"]
+        predictions = np.sum([columns[name] for name in FEATURE_COLUMNS], axis=0).tolist()
+        self._reply(200, {"predictions": predictions, "count": len(predictions)})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_api():
+    FakeBatchAPI.calls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBatchAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def patients(n=1000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(1, 100, (n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    df.insert(0, "patient_id", np.arange(n))
+    return df
+
+
+def test_chunks_are_scored_in_order_over_pooled_connections(fake_api):
+    df = patients()
+    features, errors = validate_patients(df, FEATURE_COLUMNS)
+    assert errors == []
+    progress = []
+
+    session = make_session(max_connections=4, retries=2, backoff_factor=0)
+    predictions = score_patients(session, f"{fake_api}/predict/batch", features, chunk_size=64,
+                                 max_concurrency=4, timeout=5,
+                                 on_progress=lambda done, total, _: progress.append(done))
+
+    np.testing.assert_allclose(predictions, df[FEATURE_COLUMNS].sum(axis=1))
+    assert progress[-1] == len(df) and progress == sorted(progress)
+    # 16 chunks + one retried 503, on at most 4 keep-alive connections
+    assert len(FakeBatchAPI.calls) == 17
+    assert len(set(FakeBatchAPI.calls)) <= 4
+
+
+def test_validation_reports_missing_and_non_numeric_columns():
+    df = patients(5)
+    _, errors = validate_patients(df.drop(columns=["bmi", "s6"]), FEATURE_COLUMNS)
+    assert errors == ["Missing columns: bmi, s6"]
+
+    df["age"] = df["age"].astype(object)
+    df.loc[2, "age"] = "sixty"
+    df.loc[3, "s1"] = np.nan
+    features, errors = validate_patients(df, FEATURE_COLUMNS)
+    assert features is None
+    assert errors == ["Column 'age' has non-numeric values (rows [3])", "Column 's1' has empty values (rows [4])"]
+
+
+def test_input_fields_fall_back_when_api_is_down():
+    assert DEFAULT_FIELDS == FEATURE_COLUMNS
+    assert api_base_url("http://api:8000/predict/") == "http://api:8000"
+    session = make_session(retries=0)
+    assert fetch_input_fields(session, "http://127.0.0.1:9", timeout=0.5) == FEATURE_COLUMNS
@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+import yaml
+from sklearn.datasets import load_diabetes
+from sklearn.linear_model import ElasticNet
+from sklearn.model_selection import GridSearchCV
+from sklearn.preprocessing import StandardScaler
+
+from src.components.hyperparameter_search import HyperparameterSearch
+from src.components.model_trainer import ModelTrainer
+
+PARAM_SPACE = {"alpha": [0.1, 0.5, 1.0], "l1_ratio": [0.1, 0.5, 0.9]}
+
+
+@pytest.fixture(scope="module")
+def train_data():
+    diabetes = load_diabetes(scaled=False)
+    return StandardScaler().fit_transform(diabetes.data), diabetes.target
+
+
+def search_config(tmp_path, **overrides):
+    config = {"strategy": "grid", "cv_folds": 5, "n_jobs": 2, "cache_dir": str(tmp_path / "cache")}
+    config.update(overrides)
+    return config
+
+
+def test_grid_matches_gridsearchcv(train_data, tmp_path):
+    X, y = train_data
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        result = search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+
+    reference = GridSearchCV(ElasticNet(), PARAM_SPACE, cv=5, scoring="r2").fit(X, y)
+    assert result["best_params"] == reference.best_params_
+    assert result["best_score"] == pytest.approx(reference.best_score_, abs=1e-12)
+    assert len(result["cv_results"]) == 9
+
+
+def test_rerun_hits_cache(train_data, tmp_path):
+    X, y = train_data
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        first = search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+        # Overlapping grid: only the new alpha values need fitting
+        second = search.search("ElasticNet", ElasticNet(), dict(PARAM_SPACE, alpha=[0.1, 0.5, 1.0, 2.0]))
+
+    assert first["cache_hit_rate"] == 0.0
+    assert second["cache_hits"] == 45
+    assert second["cache_misses"] == 15
+
+
+def test_random_and_halving_strategies(train_data, tmp_path):
+    X, y = train_data
+    with HyperparameterSearch(search_config(tmp_path, strategy="random", n_iter=4), X, y) as search:
+        random_result = search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+    with HyperparameterSearch(search_config(tmp_path, strategy="halving", halving_factor=3), X, y) as search:
+        halving_result = search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+
+    assert len(random_result["cv_results"]) == 4
+    # 9 candidates -> 3 -> 1, the last round uses every training row
+    rounds = [row["iter"] for row in halving_result["cv_results"]]
+    assert rounds.count(0) == 9 and rounds.count(1) == 3 and rounds.count(2) == 1
+    assert halving_result["cv_results"][-1]["n_samples"] == len(X)
+    assert np.isfinite(halving_result["best_score"])
+
+
+def test_concurrent_families_match_sequential(train_data, tmp_path):
+    X, y = train_data
+    families = {"ElasticNet": (ElasticNet(), PARAM_SPACE), "Lasso": (ElasticNet(l1_ratio=1.0), {"alpha": [0.1, 1.0]})}
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        # No pruning: every candidate gets all its folds
+        results = search.search_families(families, abort_margin=10.0)
+    with HyperparameterSearch(search_config(tmp_path / "sequential"), X, y) as search:
+        sequential = search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+
+    assert results["ElasticNet"]["status"] == "completed" == results["Lasso"]["status"]
+    assert results["ElasticNet"]["best_params"] == sequential["best_params"]
+    assert results["ElasticNet"]["best_score"] == pytest.approx(sequential["best_score"])
+    assert results["ElasticNet"]["resources"]["fits"] == 45
+    assert results["Lasso"]["best_estimator"].get_params()["l1_ratio"] == 1.0
+
+
+def test_losing_family_is_aborted(train_data, tmp_path):
+    X, y = train_data
+    weak_space = {"alpha": [50.0, 100.0, 200.0]}
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        search.search("ElasticNet", ElasticNet(), PARAM_SPACE)
+        # Two (poor) folds of every weak candidate are already known: pruned before the rest run
+        for params in search._candidates(weak_space):
+            for fold in range(2):
+                search.cache.set(search._cache_key(ElasticNet(), params, fold, len(X)), -0.5)
+        results = search.search_families({"ElasticNet": (ElasticNet(), PARAM_SPACE), "Weak": (ElasticNet(), weak_space)})
+
+    assert results["ElasticNet"]["status"] == "completed"
+    assert results["Weak"]["status"] == "aborted" and results["Weak"]["best_estimator"] is None
+    assert results["Weak"]["resources"]["pruned_candidates"] == 3
+    assert all(row["pruned"] for row in results["Weak"]["cv_results"])
+
+
+def test_family_time_budget(train_data, tmp_path):
+    X, y = train_data
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        results = search.search_families({"ElasticNet": (ElasticNet(), PARAM_SPACE)}, time_budget=0.0)
+    assert results["ElasticNet"]["status"] == "timed_out"
+    assert results["ElasticNet"]["best_estimator"] is None
+
+
+def test_timed_out_family_refits_its_best_evaluated_candidate(train_data, tmp_path):
+    X, y = train_data
+    with HyperparameterSearch(search_config(tmp_path), X, y) as search:
+        complete = search.search_families({"ElasticNet": (ElasticNet(), PARAM_SPACE)})
+        # Every fold is cached now: the candidates are fully evaluated when the budget runs out
+        results = search.search_families({"ElasticNet": (ElasticNet(), PARAM_SPACE)}, time_budget=0.0)
+    result = results["ElasticNet"]
+    assert result["status"] == "timed_out"
+    assert result["best_params"] == complete["ElasticNet"]["best_params"]
+    assert result["best_estimator"] is not None
+
+
+def test_trainer_fails_clearly_without_a_champion(train_data, tmp_path, monkeypatch):
+    X, y = train_data
+    config = {
+        "artifacts": {"model_dir": "models"},
+        "mlflow": {"tracking_uri": (tmp_path / "mlruns").as_uri(), "experiment_name": "test_experiment",
+                   "model_name": "test_model"},
+        "tracking": {"offline_dir": str(tmp_path / "offline"), "sync_on_start": False},
+        "training": {"search": search_config(tmp_path),
+                     "scheduler": {"family_time_budget_seconds": 0.0},
+                     "models": {"ElasticNet": {"params": PARAM_SPACE}}},
+    }
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError, match="No model family produced a champion"):
+        ModelTrainer(tmp_path / "config.yaml").initiate_model_trainer(X[:300], X[300:], y[:300], y[300:])
+    assert not (tmp_path / "models" / "model.joblib").exists()
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_diabetes
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import ElasticNet
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+
+from src.api.inference import InferenceEngine, build_inference_engine
+from src.api.schemas.prediction import DiabetesInput, FEATURE_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def diabetes_data():
+    diabetes = load_diabetes(scaled=False)
+    X = pd.DataFrame(diabetes.data, columns=diabetes.feature_names)
+    scaler = StandardScaler().fit(X)
+    return X, diabetes.target, scaler
+
+
+@pytest.mark.parametrize("model", [
+    ElasticNet(alpha=0.1, l1_ratio=0.5),
+    RandomForestRegressor(n_estimators=20, max_depth=None, random_state=0),
+    GradientBoostingRegressor(n_estimators=30, random_state=0),
+    XGBRegressor(n_estimators=50, max_depth=3, learning_rate=0.1),
+], ids=["elasticnet", "random_forest", "gradient_boosting", "xgboost"])
+def test_engine_matches_sklearn_path(diabetes_data, model):
+    X, y, scaler = diabetes_data
+    model.fit(scaler.transform(X), y)
+    engine = build_inference_engine(model, scaler)
+    assert engine.kind != "generic"
+
+    # Reference: the original pandas + scaler.transform + model.predict path
+    expected = model.predict(scaler.transform(X))
+
+    np.testing.assert_allclose(engine.predict_matrix(X.to_numpy()), expected, rtol=0, atol=1e-9)
+    for i in range(0, len(X), 37):
+        record = DiabetesInput(**dict(zip(FEATURE_COLUMNS, X.iloc[i].tolist())))
+        assert engine.predict_one(record) == pytest.approx(expected[i], rel=0, abs=1e-9)
+
+
+@pytest.mark.parametrize("model", [
+    ElasticNet(alpha=0.1, l1_ratio=0.5),
+    RandomForestRegressor(n_estimators=20, max_depth=None, random_state=0),
+    XGBRegressor(n_estimators=50, max_depth=3, learning_rate=0.1),
+], ids=["elasticnet", "random_forest", "xgboost"])
+def test_shared_arrays_are_memory_mapped(tmp_path, diabetes_data, model):
+    X, y, scaler = diabetes_data
+    model.fit(scaler.transform(X), y)
+    engine = build_inference_engine(model, scaler)
+    engine.save_arrays(tmp_path)
+    mapped = InferenceEngine.from_arrays(tmp_path, mmap_mode="r")
+
+    # Flat layout only (XGBoost trees included): nothing to unpickle in the workers
+    assert mapped.model is None and isinstance(mapped.mean, np.memmap)
+    # XGBoost sums its leaves in float32
+    np.testing.assert_allclose(mapped.predict_matrix(X.to_numpy()), engine.predict_matrix(X.to_numpy()), rtol=1e-5)
+    record = DiabetesInput(**dict(zip(FEATURE_COLUMNS, X.iloc[0].tolist())))
+    assert mapped.predict_one(record) == pytest.approx(engine.predict_one(record), rel=1e-5)
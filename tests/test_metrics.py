@@ -0,0 +1,42 @@
+from src.api.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_and_text_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ["endpoint"], buckets=(0.1, 1.0))
+    requests = registry.counter("requests_total", "Requests", ["endpoint", "status"])
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.labels("/predict").observe(value)
+    requests.labels("/predict", "200").inc()
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{endpoint="/predict",le="0.1"} 2.0' in text
+    assert 'latency_seconds_bucket{endpoint="/predict",le="1.0"} 3.0' in text
+    assert 'latency_seconds_bucket{endpoint="/predict",le="+Inf"} 4.0' in text
+    assert 'latency_seconds_count{endpoint="/predict"} 4.0' in text
+    assert 'requests_total{endpoint="/predict",status="200"} 1.0' in text
+
+
+def test_hot_path_reuses_children_and_records_every_request():
+    # Overhead timing: benchmarks/bench_metrics_overhead.py
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["endpoint", "status"])
+    latency = registry.histogram("latency_seconds", "Latency", ["endpoint"])
+    in_flight = registry.gauge("in_flight", "In flight", ["endpoint"])
+
+    # Everything the middleware records for one /predict request
+    for _ in range(1_000):
+        gauge = in_flight.labels("/predict")
+        gauge.inc()
+        gauge.dec()
+        latency.labels("/predict").observe(0.001)
+        requests.labels("/predict", "200").inc()
+
+    # One child per label set, created on first use
+    assert requests.labels("/predict", "200") is requests.labels("/predict", "200")
+    text = registry.render()
+    assert 'requests_total{endpoint="/predict",status="200"} 1000.0' in text
+    assert 'latency_seconds_count{endpoint="/predict"} 1000.0' in text
+    assert 'in_flight{endpoint="/predict"} 0.0' in text
@@ -0,0 +1,182 @@
+import os
+import shutil
+import threading
+import numpy as np
+import pytest
+from src.api.artifacts import export_shared_engine
+from src.api.model_manager import ModelBundle, ModelManager
+from src.api.serve import prepare_shared_engine
+from src.utils.common import load_object, save_object
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    for name in ("model.joblib", "scaler.joblib"):
+        shutil.copy(os.path.join("models", name), tmp_path / name)
+    return tmp_path
+
+
+def make_manager(model_dir, **kwargs):
+    return ModelManager("http://127.0.0.1:9", "diabetes", model_dir=model_dir,
+                        snapshot_dir=model_dir / "snapshot", watch="files", **kwargs)
+
+
+def touch_model(model_dir):
+    # Newer mtime than the loaded files
+    path = model_dir / "model.joblib"
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+
+
+def test_bundle_is_immutable(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    with pytest.raises(AttributeError):
+        manager.current.scaler = None
+
+
+class NanModel:
+    def predict(self, X):
+        return np.full(len(X), np.nan)
+
+
+def test_probe_rejects_broken_model(model_dir):
+    scaler = load_object(model_dir / "scaler.joblib")
+    with pytest.raises(ValueError):
+        ModelBundle.build(NanModel(), scaler, "broken", "x", "local_joblib")
+    model = load_object(model_dir / "model.joblib")
+    assert ModelBundle.build(model, scaler, "ok", "x", "local_joblib").version == "ok+scaler-x"
+
+
+def test_files_watch_swaps_new_version(model_dir):
+    swapped = []
+    manager = make_manager(model_dir, on_swap=swapped.append)
+    assert manager.load_local()
+    old = manager.current
+    assert not manager.poll_once()
+
+    # Retrained model: new file content & mtime
+    model = load_object(model_dir / "model.joblib")
+    save_object(model_dir / "model.joblib", model)
+    touch_model(model_dir)
+    assert manager.poll_once()
+    assert manager.current is not old and len(swapped) == 2
+
+
+def test_new_scaler_alone_does_not_reload(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    served = manager.current
+
+    # Transformation rewrote the scaler, training has not written the model yet
+    scaler_path = model_dir / "scaler.joblib"
+    os.utime(scaler_path, ns=(0, scaler_path.stat().st_mtime_ns + 10**9))
+    assert not manager.poll_once() and manager.current is served
+
+    touch_model(model_dir)
+    assert manager.poll_once()
+
+
+def test_failed_file_load_is_retried(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    served = manager.current
+
+    # Half-written model.joblib: the load fails and the served bundle stays
+    model_path = model_dir / "model.joblib"
+    content = model_path.read_bytes()
+    model_path.write_bytes(content[:len(content) // 2])
+    touch_model(model_dir)
+    with pytest.raises(Exception):
+        manager.poll_once()
+    assert manager.current is served
+
+    # Same mtime once complete: the next poll still loads it
+    mtime = model_path.stat().st_mtime_ns
+    model_path.write_bytes(content)
+    os.utime(model_path, ns=(0, mtime))
+    assert manager.poll_once() and manager.current is not served
+
+
+def test_poll_skipped_while_loading_or_pinned(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    touch_model(model_dir)
+
+    with manager._lock:
+        # Another load holds the lock: a concurrent poll does not start a second one
+        result = []
+        poller = threading.Thread(target=lambda: result.append(manager.poll_once()))
+        poller.start()
+        poller.join()
+    assert result == [False]
+
+    manager.pin(manager.current.version)
+    assert not manager.poll_once()
+    manager.unpin()
+    assert manager.poll_once()
+
+
+def test_rollback_and_pin(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    first = manager.current
+    manager.install(ModelBundle.build(first.model, first.scaler, "v2", "x", "local_joblib"))
+
+    assert manager.rollback() is first
+    assert manager.pinned == first.version
+    assert manager.pin("v2").model_version == "v2"
+    with pytest.raises(LookupError):
+        manager.pin("unknown")
+
+
+def test_second_rollback_goes_further_back(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    first = manager.current
+    for version in ("v2", "v3"):
+        manager.install(ModelBundle.build(first.model, first.scaler, version, "x", "local_joblib"))
+
+    assert manager.rollback().model_version == "v2"
+    assert manager.rollback() is first
+    with pytest.raises(LookupError):
+        manager.rollback()
+    # Rolled-back versions stay pinnable
+    assert [bundle["model_version"] for bundle in manager.status()["rolled_back"]] == ["v2", "v3"]
+    assert manager.pin("v3").model_version == "v3"
+
+
+def test_workers_map_shared_engine(model_dir):
+    manager = make_manager(model_dir)
+    assert manager.load_local()
+    bundle = manager.current
+    engine_path = export_shared_engine(model_dir / "engine", bundle.engine, bundle.model_version,
+                                       bundle.scaler_version, bundle.source)
+
+    worker = make_manager(model_dir, engine_dir=engine_path)
+    assert worker.load_local()
+    assert worker.current.source == "shared_mmap" and worker.current.version == bundle.version
+    X = np.asarray(bundle.engine.mean)[np.newaxis, :] * 1.1
+    np.testing.assert_allclose(worker.current.engine.predict_matrix(X), bundle.engine.predict_matrix(X), rtol=1e-5)
+
+
+def test_parent_resolves_registry_version_for_workers(model_dir, tmp_path, monkeypatch):
+    # Registry answers with a new version: the parent swaps it in before exporting
+    def load_registry(manager):
+        current = manager.current
+        manager.install(ModelBundle.build(current.model, current.scaler, "registry-v7",
+                                          current.scaler_version, "mlflow_registry"))
+        return True
+
+    monkeypatch.setattr(ModelManager, "load_registry", load_registry)
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(model_dir, tmp_path / "models", ignore=shutil.ignore_patterns("snapshot"))
+    config = {"mlflow": {"tracking_uri": "http://127.0.0.1:9", "model_name": "diabetes"},
+              "api": {"reload": {"watch": "registry"}, "serving": {"engine_dir": "models/engine"}}}
+    engine_path = prepare_shared_engine(config)
+    assert engine_path.name.startswith("registry-v7+scaler-")
+
+    # Workers serve that version and never reload on their own
+    worker = ModelManager("http://127.0.0.1:9", "diabetes", model_dir="models", watch="none",
+                          engine_dir=engine_path)
+    assert worker.load_local() and worker.current.model_version == "registry-v7"
+    assert worker.registry_status == "disabled" and not worker.poll_once()
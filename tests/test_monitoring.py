@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from src.api.monitoring import DriftMonitor, RingBuffer, StreamingSummary
+from src.utils.drift import build_reference, ks_statistic, psi
+
+COLUMNS = ["a", "b"]
+
+
+def make_reference(rng, n=5000):
+    X = np.column_stack([rng.normal(50, 10, n), rng.integers(1, 3, n)])
+    return build_reference(X, COLUMNS, predictions=X[:, 0] * 2)
+
+
+def test_ring_buffer_wraps_in_place():
+    buffer = RingBuffer(capacity=4, n_features=2)
+    features = buffer.features
+    for i in range(6):
+        buffer.append((i, -i), float(i))
+    X, predictions, total = buffer.snapshot()
+    assert total == 6 and buffer.features is features
+    np.testing.assert_array_equal(predictions, [2, 3, 4, 5])
+    np.testing.assert_array_equal(X[:, 1], [-2, -3, -4, -5])
+
+    # Only rows recorded after `since`; a batch larger than the buffer keeps its last rows
+    assert buffer.snapshot(since=5)[1].tolist() == [5]
+    buffer.extend(np.arange(12.0).reshape(6, 2), np.arange(6.0))
+    X, predictions, total = buffer.snapshot()
+    assert total == 12 and predictions.tolist() == [2, 3, 4, 5]
+
+
+def test_streaming_summary_matches_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 15, 20000)
+    edges = np.unique(np.percentile(values, np.linspace(0, 100, 101))[1:-1])
+    summary = StreamingSummary(edges, value_range=(0, 120))
+    for chunk in np.array_split(np.append(values, np.nan), 7):
+        summary.update(chunk)
+
+    described = summary.describe()
+    assert described["count"] == len(values) and described["non_finite"] == 1
+    assert described["mean"] == pytest.approx(values.mean())
+    assert described["std"] == pytest.approx(values.std())
+    assert described["out_of_range"] == int((values > 120).sum())
+    assert described["quantiles"]["p50"] == pytest.approx(np.median(values), abs=0.5)
+    assert described["quantiles"]["p95"] == pytest.approx(np.percentile(values, 95), abs=0.5)
+
+
+def test_psi_and_ks_detect_shift():
+    rng = np.random.default_rng(1)
+    reference = make_reference(rng)["columns"]["a"]
+    same, shifted = rng.normal(50, 10, 2000), rng.normal(60, 10, 2000)
+
+    def binned(values):
+        counts = np.bincount(np.searchsorted(reference["bin_edges"], values, side="right"),
+                             minlength=len(reference["bin_edges"]) + 1)
+        return counts / len(values)
+
+    assert psi(reference["bin_proportions"], binned(same)) < 0.05
+    assert psi(reference["bin_proportions"], binned(shifted)) > 0.2
+    assert ks_statistic(reference["quantiles"], same) < 0.05
+    assert ks_statistic(reference["quantiles"], shifted) > 0.3
+
+
+def test_monitor_reports_drifted_feature():
+    rng = np.random.default_rng(2)
+    monitor = DriftMonitor(COLUMNS, window_size=1000, reference=make_reference(rng), min_samples=100)
+    assert monitor.run()["status"] == "insufficient_data"
+
+    X = np.column_stack([rng.normal(50, 10, 1000), rng.integers(1, 3, 1000)])
+    monitor.record_batch(X, X[:, 0] * 2)
+    assert monitor.run()["status"] == "ok"
+
+    # Feature "b" now always 2: drifted, "a" and the predictions are unchanged
+    X[:, 1] = 2
+    monitor.record_batch(X, X[:, 0] * 2)
+    report = monitor.run()
+    assert report["status"] == "drift" and report["drifted_features"] == ["b"]
+    assert not report["prediction"]["drift"]
+    assert report["features"]["a"]["lifetime"]["count"] == 2000
+
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_diabetes
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import ElasticNet
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBRegressor
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+
+from src.api.artifacts import export_shared_engine, load_shared_engine
+from src.api.inference import build_inference_engine
+from src.api.onnx_engine import OnnxInferenceEngine, load_onnx_engine
+from src.api.schemas.prediction import DiabetesInput, FEATURE_COLUMNS
+from src.utils.onnx_export import check_parity, convert_to_onnx, save_onnx
+
+MODELS = {
+    "elasticnet": lambda: ElasticNet(alpha=0.1, l1_ratio=0.5),
+    "random_forest": lambda: RandomForestRegressor(n_estimators=20, random_state=0),
+    "xgboost": lambda: XGBRegressor(n_estimators=100, max_depth=5, learning_rate=0.1),
+}
+
+
+@pytest.fixture(scope="module")
+def diabetes_data():
+    diabetes = load_diabetes(scaled=False)
+    X = pd.DataFrame(diabetes.data, columns=diabetes.feature_names)
+    scaler = StandardScaler().fit(X)
+    return X, diabetes.target, scaler
+
+
+def fitted(name, diabetes_data):
+    X, y, scaler = diabetes_data
+    return MODELS[name]().fit(scaler.transform(X), y)
+
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_onnx_engine_matches_joblib_path(diabetes_data, name):
+    X, _, scaler = diabetes_data
+    model = fitted(name, diabetes_data)
+    engine = OnnxInferenceEngine.from_model(model, scaler)
+    assert engine.kind == "onnx" and engine.model_type == type(model).__name__
+
+    expected = model.predict(scaler.transform(X))
+    # Linear models stay float64; trees score float32 features and sum float32 leaves
+    rtol = 1e-9 if name == "elasticnet" else 1e-5
+    np.testing.assert_allclose(engine.predict_matrix(X.to_numpy()), expected, rtol=rtol)
+    for i in range(0, len(X), 37):
+        record = DiabetesInput(**dict(zip(FEATURE_COLUMNS, X.iloc[i].tolist())))
+        assert engine.predict_one(record) == pytest.approx(expected[i], rel=rtol)
+    assert check_parity(convert_to_onnx(model, scaler), model, scaler) < 1e-2
+
+
+def test_exported_file_is_served_only_for_its_version(tmp_path, diabetes_data):
+    _, _, scaler = diabetes_data
+    model = fitted("xgboost", diabetes_data)
+    onnx_path = tmp_path / "model.onnx"
+    save_onnx(convert_to_onnx(model, scaler, metadata={"model_version": "local-a", "scaler_version": "s"}), onnx_path)
+
+    assert load_onnx_engine(model, scaler, onnx_path, "local-a", "s").source == str(onnx_path)
+    # Another model version: never the stale file
+    other = fitted("elasticnet", diabetes_data)
+    engine = load_onnx_engine(other, scaler, onnx_path, "local-b", "s")
+    assert engine.source == "in-memory conversion" and engine.model_type == "ElasticNet"
+
+    # Backend setting, with the joblib engine as fallback for models onnx cannot take
+    options = {"path": onnx_path}
+    assert build_inference_engine(model, scaler, "onnx", options, "local-a", "s").kind == "onnx"
+    assert build_inference_engine(object(), scaler, "onnx", options).kind == "generic"
+
+
+def test_shared_onnx_engine_roundtrip(tmp_path, diabetes_data):
+    X, _, scaler = diabetes_data
+    engine = OnnxInferenceEngine.from_model(fitted("random_forest", diabetes_data), scaler)
+    path = export_shared_engine(tmp_path, engine, "local-a", "s", "local_joblib")
+    assert path.name.endswith("-onnx")
+
+    loaded, model_version, _, _ = load_shared_engine(path)
+    assert isinstance(loaded, OnnxInferenceEngine) and model_version == "local-a"
+    np.testing.assert_array_equal(loaded.predict_matrix(X.to_numpy()), engine.predict_matrix(X.to_numpy()))
+
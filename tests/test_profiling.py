@@ -0,0 +1,75 @@
+import pstats
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.pipeline.stage_runner import Stage, StageRunner
+from src.utils.profiling import Profiler, log_profile
+
+
+class RecordingRun:
+    """TrackedRun stand-in."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.artifacts = []
+
+    def log_metrics(self, metrics, step=0):
+        self.metrics.update(metrics)
+
+    def log_artifact(self, local_path, artifact_path=None):
+        self.artifacts.append((local_path, artifact_path))
+
+
+def busy(n):
+    return float(np.ones(n).sum())
+
+
+def test_disabled_profiler_is_a_no_op(tmp_path):
+    profiler = Profiler(enabled=False, output_dir=tmp_path / "profiles")
+    with profiler.profile("training") as report:
+        pass
+    assert report is None and profiler.reports == []
+    assert not (tmp_path / "profiles").exists()
+
+    run = RecordingRun()
+    log_profile(run, report)
+    assert run.metrics == {} and run.artifacts == []
+
+
+def test_stage_and_nested_section_reports(tmp_path):
+    profiler = Profiler(enabled=True, output_dir=tmp_path / "profiles", cprofile=True, trace_python=True)
+    data_path = tmp_path / "data.bin"
+
+    def train():
+        data_path.write_bytes(b"x" * 4_000_000)
+        with profiler.profile("search") as search_report:
+            # Pool shut down inside the section: its worker's CPU is counted
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                pool.submit(busy, 5_000_000).result()
+            np.ones(10_000_000).sum()
+        return search_report
+
+    search_report = StageRunner(tmp_path / "manifest.json", profiler=profiler).run_stage(Stage("training", train))
+    training_report = profiler.reports[-1]
+    assert [r["name"] for r in profiler.reports] == ["search", "training"]
+
+    search, training = search_report["metrics"], training_report["metrics"]
+    assert search["children_cpu_seconds"] > 0
+    # 80 MB array: numpy allocations are traced, the stage sees its section's peak
+    assert search["python_peak_mb"] >= 75 and training["python_peak_mb"] >= search["python_peak_mb"]
+    assert training["peak_rss_mb"] >= search["peak_rss_mb"] >= 75
+    assert training["write_chars"] >= 4_000_000 > search["write_chars"]
+    assert training["cpu_seconds"] >= search["cpu_seconds"] > 0
+
+    # cProfile dump of the stage only (one profiler at a time)
+    assert [f.rsplit("/", 1)[-1] for f in training_report["files"]] == \
+        ["training.json", "training.prof", "training_top.txt"]
+    assert [f.rsplit("/", 1)[-1] for f in search_report["files"]] == ["search.json"]
+    stats = pstats.Stats(training_report["files"][1])
+    assert any(function == "train" for _, _, function in stats.stats)
+
+    run = RecordingRun()
+    profiler.log_reports(run)
+    assert run.metrics["training_wall_seconds"] >= run.metrics["search_wall_seconds"]
+    assert (str(profiler.run_dir / "summary.json"), "profiles") in run.artifacts
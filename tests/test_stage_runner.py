@@ -0,0 +1,45 @@
+import pytest
+
+from src.pipeline.stage_runner import Stage, StageRunner
+
+
+def make_stage(tmp_path, calls, config=None):
+    source = tmp_path / "input.csv"
+    output = tmp_path / "output.csv"
+
+    def run():
+        calls.append("run")
+        output.write_text(source.read_text().upper())
+
+    return Stage("transform", run, config=config or {"test_size": 0.2}, inputs=[source], outputs=[output])
+
+
+def test_unchanged_stage_is_skipped(tmp_path):
+    (tmp_path / "input.csv").write_text("a,b\n1,2\n")
+    manifest = tmp_path / "manifest.json"
+    calls = []
+
+    StageRunner(manifest).run_stage(make_stage(tmp_path, calls))
+    StageRunner(manifest).run_stage(make_stage(tmp_path, calls))
+    assert calls == ["run"]
+
+    # Forced, changed config, changed input and deleted output all re-run the stage
+    StageRunner(manifest, force=["transform"]).run_stage(make_stage(tmp_path, calls))
+    StageRunner(manifest).run_stage(make_stage(tmp_path, calls, config={"test_size": 0.3}))
+    (tmp_path / "input.csv").write_text("a,b\n3,4\n")
+    StageRunner(manifest).run_stage(make_stage(tmp_path, calls, config={"test_size": 0.3}))
+    (tmp_path / "output.csv").unlink()
+    StageRunner(manifest).run_stage(make_stage(tmp_path, calls, config={"test_size": 0.3}))
+    assert len(calls) == 5
+
+
+def test_failed_stage_is_not_recorded(tmp_path):
+    manifest = tmp_path / "manifest.json"
+
+    def fail():
+        raise ValueError("Data validation failed!")
+
+    runner = StageRunner(manifest)
+    with pytest.raises(ValueError):
+        runner.run_stage(Stage("validation", fail))
+    assert "validation" not in runner.manifest
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.common import dataset_files, load_dataset, load_dataset_array, load_object, save_dataset, save_object
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(50, 4)), columns=["age", "bmi", "bp", "target"])
+    # Values that lose precision when printed with few digits
+    df.loc[0, "age"] = 0.1 + 0.2
+    return df
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather", "npy"])
+def test_round_trip_is_exact(tmp_path, frame, fmt):
+    path = save_dataset(frame, tmp_path / "train.csv", fmt)
+    assert all(p.exists() for p in dataset_files(tmp_path / "train.csv", fmt))
+
+    loaded = load_dataset(path, fmt)
+    pd.testing.assert_frame_equal(loaded, frame, check_exact=True)
+
+    array, columns = load_dataset_array(path, fmt, columns=["age", "bmi"])
+    assert columns == ["age", "bmi"]
+    np.testing.assert_array_equal(array, frame[["age", "bmi"]].to_numpy())
+
+
+def test_npy_loads_memory_mapped(tmp_path, frame):
+    path = save_dataset(frame, tmp_path / "train.csv", "npy")
+    assert path.suffix == ".npy"
+
+    array, columns = load_dataset_array(path, "npy")
+    assert isinstance(array, np.memmap)
+    assert columns == list(frame.columns)
+    # Contiguous column selection stays a view of the mapped file
+    features, _ = load_dataset_array(path, "npy", columns=["age", "bmi", "bp"])
+    assert isinstance(features, np.memmap)
+
+
+def test_save_object_is_mmap_friendly(tmp_path):
+    weights = np.arange(1000, dtype=np.float64)
+    save_object(tmp_path / "model.joblib", {"weights": weights})
+    assert not list(tmp_path.glob("*.tmp-*"))
+
+    loaded = load_object(tmp_path / "model.joblib", mmap_mode="r")
+    assert isinstance(loaded["weights"], np.memmap)
+    np.testing.assert_array_equal(loaded["weights"], weights)
+    np.testing.assert_array_equal(load_object(tmp_path / "model.joblib")["weights"], weights)
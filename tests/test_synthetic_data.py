@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_diabetes
+
+from src.pipeline.stage_runner import Stage, StageRunner
+from src.utils.common import load_dataset
+from src.utils.synthetic_data import fit_synthetic_model, generate_rows, write_synthetic_dataset
+
+
+@pytest.fixture(scope="module")
+def real_data():
+    return load_diabetes(scaled=False, as_frame=True).frame
+
+
+@pytest.fixture(scope="module")
+def synthetic_model(real_data):
+    return fit_synthetic_model(real_data)
+
+
+def test_marginals_and_correlations_follow_the_real_data(real_data, synthetic_model):
+    synthetic = generate_rows(synthetic_model, 50_000, seed=0)
+
+    assert list(synthetic.columns) == list(real_data.columns)
+    # Discrete columns keep their levels, continuous ones their range and decimals
+    assert set(synthetic["sex"]) == set(real_data["sex"])
+    for column in real_data.columns:
+        assert real_data[column].min() <= synthetic[column].min()
+        assert synthetic[column].max() <= real_data[column].max()
+        assert synthetic[column].median() == pytest.approx(real_data[column].median(), rel=0.05, abs=0.05)
+    np.testing.assert_allclose(synthetic["s5"], synthetic["s5"].round(4))
+
+    real_corr = real_data.corr(method="spearman").to_numpy()
+    synthetic_corr = synthetic.corr(method="spearman").to_numpy()
+    assert np.abs(real_corr - synthetic_corr).max() < 0.1
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather", "npy"])
+def test_dataset_is_reproducible_whatever_the_workers(tmp_path, synthetic_model, fmt):
+    one_worker = write_synthetic_dataset(synthetic_model, tmp_path / "a" / "raw.csv", fmt=fmt, n_rows=2_500,
+                                         seed=7, chunk_size=1_000, workers=1)
+    two_workers = write_synthetic_dataset(synthetic_model, tmp_path / "b" / "raw.csv", fmt=fmt, n_rows=2_500,
+                                          seed=7, chunk_size=1_000, workers=2)
+
+    df = load_dataset(one_worker, fmt)
+    assert df.shape == (2_500, 11)
+    pd.testing.assert_frame_equal(df, load_dataset(two_workers, fmt), check_dtype=False)
+    # Chunk i is the (seed, i) stream: the dataset is the chunks in order
+    expected = pd.concat([generate_rows(synthetic_model, 1_000, 7, 0), generate_rows(synthetic_model, 1_000, 7, 1),
+                          generate_rows(synthetic_model, 500, 7, 2)], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+    assert not list(one_worker.parent.glob("*.part*"))
+
+
+def test_stage_summary_reports_peak_memory(tmp_path):
+    runner = StageRunner(tmp_path / "manifest.json")
+    runner.run_stage(Stage("allocate", lambda: np.ones(20_000_000).sum()))
+    runner.run_stage(Stage("allocate", lambda: None))
+
+    ran, skipped = runner.summary()
+    assert ran["stage"] == "allocate" and ran["status"] == "ran"
+    # 160 MB array allocated during the stage
+    assert ran["peak_rss_mb"] >= 150
+    assert skipped["status"] == "skipped" and skipped["peak_rss_mb"] is None
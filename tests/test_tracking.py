@@ -0,0 +1,64 @@
+import numpy as np
+from mlflow.tracking import MlflowClient
+from sklearn.linear_model import ElasticNet
+from src.components.tracking import ExperimentTracker, sync_offline_runs
+
+
+def make_config(tracking_uri, offline_dir):
+    return {
+        "mlflow": {"tracking_uri": tracking_uri, "experiment_name": "test_experiment"},
+        "tracking": {"offline_dir": str(offline_dir), "flush_interval_seconds": 0.1, "request_timeout_seconds": 1},
+    }
+
+
+def log_training_run(tracker, model):
+    with tracker.start_run("Tuning_ElasticNet") as run:
+        run.log_params({"alpha": 0.1, "l1_ratio": 0.5})
+        for step in range(1500):
+            run.log_metrics({"cv_fold0_r2": step / 1500, "cv_mean_r2": 0.5}, step=step)
+        run.log_dict({"cv_results": [{"alpha": 0.1}]}, "cv_results.json")
+        run.log_model(model, "model", registered_model_name="TestModel")
+
+
+def logged_runs(tracking_uri):
+    client = MlflowClient(tracking_uri=tracking_uri, registry_uri=tracking_uri)
+    experiment = client.get_experiment_by_name("test_experiment")
+    return client, client.search_runs([experiment.experiment_id])
+
+
+def fitted_model():
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    return ElasticNet().fit(X, X.sum(axis=1))
+
+
+def test_buffered_logging_to_file_store(tmp_path):
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    with ExperimentTracker(make_config(tracking_uri, tmp_path / "offline")) as tracker:
+        log_training_run(tracker, fitted_model())
+    assert not tracker.offline
+
+    client, runs = logged_runs(tracking_uri)
+    run = runs[0]
+    assert run.info.status == "FINISHED" and run.data.params == {"alpha": "0.1", "l1_ratio": "0.5"}
+    # Split into several log_batch calls (1000 metrics max per call)
+    assert len(client.get_metric_history(run.info.run_id, "cv_fold0_r2")) == 1500
+    assert {a.path for a in client.list_artifacts(run.info.run_id)} == {"cv_results.json", "model"}
+    assert client.search_model_versions("name='TestModel'")[0].run_id == run.info.run_id
+
+
+def test_unreachable_server_falls_back_to_offline_store_and_syncs(tmp_path):
+    offline_dir = tmp_path / "offline"
+    with ExperimentTracker(make_config("http://127.0.0.1:9", offline_dir)) as tracker:
+        log_training_run(tracker, fitted_model())
+    assert tracker.offline
+    _, offline_runs = logged_runs(offline_dir.as_uri())
+    assert len(offline_runs) == 1
+
+    # Server back: the offline run is replayed once (params, metric history, artifacts, registration)
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    assert sync_offline_runs(tracking_uri, offline_dir, "test_experiment") == 1
+    assert sync_offline_runs(tracking_uri, offline_dir, "test_experiment") == 0
+    client, runs = logged_runs(tracking_uri)
+    assert len(runs) == 1 and runs[0].info.run_name == "Tuning_ElasticNet"
+    assert len(client.get_metric_history(runs[0].info.run_id, "cv_fold0_r2")) == 1500
+    assert client.search_model_versions("name='TestModel'")[0].run_id == runs[0].info.run_id